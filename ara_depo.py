@@ -0,0 +1,41 @@
+import os, sys, json, pandas as pd
+import olcum, cikti
+
+# Aşamalar arası ara depo: her sayfa DIZIN/<ad>/<sayfa>.parquet olarak yazılır, sonraki aşama
+# Excel'i tekrar ayrıştırmadan memory-map ile okur. Excel çıktısı isteğe bağlı son adımdır (ARA_EXCEL=0 kapatır).
+DIZIN=os.environ.get("ARA_DIZIN",".ara")
+EXCEL=os.environ.get("ARA_EXCEL","1").strip().lower() not in ("0","false","no","hayir")
+
+def _klasor(ad): return os.path.join(DIZIN,ad)
+def yol(ad,sayfa): return os.path.join(_klasor(ad),f"{sayfa}.parquet")
+
+def yaz(ad,sayfalar):
+    # sayfalar: {sayfa_adi: DataFrame}; sayfa sırası Excel'e aktarım için saklanır
+    d=_klasor(ad); os.makedirs(d,exist_ok=True)
+    for s,df in sayfalar.items():
+        tmp=yol(ad,s)+f".{os.getpid()}.tmp"; df.to_parquet(tmp,engine="pyarrow"); os.replace(tmp,yol(ad,s))
+    with open(os.path.join(d,"sayfalar.json"),"w",encoding="utf-8") as f: json.dump(list(sayfalar),f,ensure_ascii=False)
+
+def sayfalar(ad):
+    with open(os.path.join(_klasor(ad),"sayfalar.json"),encoding="utf-8") as f: return json.load(f)
+
+def var(ad,sayfa): return os.path.exists(yol(ad,sayfa))
+
+def oku(ad,sayfa):
+    if not var(ad,sayfa): raise FileNotFoundError(f"ara depoda yok: {ad}/{sayfa}")
+    return pd.read_parquet(yol(ad,sayfa),engine="pyarrow",memory_map=True)
+
+def excele(ad,xlsx,tarih_fmt="%d.%m.%Y"):
+    # depodaki sayfaları eskiden yazılan çalışma kitabıyla aynı biçimde CIKTI biçim(ler)ine aktarır
+    tablolar={s:oku(ad,s) for s in sayfalar(ad)}; indeksli=set()
+    for s,df in tablolar.items():
+        if isinstance(df.index,pd.DatetimeIndex): df.index=df.index.strftime(tarih_fmt); indeksli.add(s)
+    cikti.yaz(xlsx,tablolar,index=indeksli)
+
+def kaydet(ad,sayfalar,xlsx=None):
+    with olcum.asama(f"{ad}/parquet",sayfa=len(sayfalar)): yaz(ad,sayfalar)
+    if xlsx and EXCEL: excele(ad,xlsx)
+
+if __name__=="__main__":
+    # sonradan Excel üretmek için: python ara_depo.py fiyat fiyat.xlsx
+    excele(sys.argv[1],sys.argv[2]); print(f"✅ {', '.join(cikti.yollar(sys.argv[2]))} oluşturuldu")
@@ -0,0 +1,120 @@
+import os, ast, json, time, shutil, hashlib, argparse, importlib, threading
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from tarih_ayar import takvim
+import ara_depo, indikator_motor, olcum, cikti
+
+# Hisse ve endeks evrenleri aynı aşama zincirinden geçer: fiyat -> indikator, fiyat -> getiri.
+# Tablolar aşamalar arasında bellekte taşınır, iki evren aynı anda çalışır. Her aşamanın anahtarı
+# girdisinin (bir önceki aşamanın anahtarı ya da ham günlük satırlar) ve kodu/ayarının özetidir;
+# anahtar son başarılı çalışmadakiyle aynıysa ve çıktısı duruyorsa aşama atlanır.
+EVRENLER={
+    "hisse":{"modul":"main","kolon":1,"ara":"fiyat","fiyat_xlsx":"fiyat.xlsx","sayfalar":("Kapanış","Yüksek","Düşük"),
+             "indikator_xlsx":"indicators.xlsx","getiri_xlsx":"profit.xlsx","eksik_hata":False},
+    "endeks":{"modul":"main_indis","kolon":2,"ara":"indis_fiyat","fiyat_xlsx":"main_indis_fiyat.xlsx","sayfalar":("Kapanis","Yuksek","Dusuk"),
+              "indikator_xlsx":"indis_indicators.xlsx","getiri_xlsx":"indis_profit.xlsx","eksik_hata":True},
+}
+IZ_YOLU=os.environ.get("CALISTIR_IZ",".depo/asamalar.json")
+KOK=os.path.dirname(os.path.abspath(__file__))
+_kilit=threading.Lock()
+
+def ozet(*parcalar):
+    h=hashlib.sha1()
+    for p in parcalar: h.update(p if isinstance(p,bytes) else json.dumps(p,ensure_ascii=False,default=str).encode()); h.update(b"\0")
+    return h.hexdigest()
+
+def yerel_moduller(*yollar):
+    # .py dosyaları ve (fonksiyon içindekiler dahil) içe aktardıkları repo modülleri, geçişli
+    bulunan,bekleyen=[],list(yollar)
+    while bekleyen:
+        y=bekleyen.pop(0)
+        if y in bulunan: continue
+        bulunan.append(y)
+        with open(os.path.join(KOK,y),"rb") as f: agac=ast.parse(f.read())
+        for d in ast.walk(agac):
+            adlar=[a.name for a in d.names] if isinstance(d,ast.Import) else [d.module] if isinstance(d,ast.ImportFrom) and d.module and not d.level else []
+            bekleyen+=[f"{a.split('.')[0]}.py" for a in adlar if os.path.exists(os.path.join(KOK,f"{a.split('.')[0]}.py"))]
+    return sorted(bulunan)
+
+def kod(*yollar):
+    # .py dosyaları repo kökünden, yerel bağımlılıklarıyla birlikte; ayar dosyaları çalışma dizininden
+    py=yerel_moduller(*[y for y in yollar if y.endswith(".py")])
+    return ozet(py,*[open(os.path.join(KOK,y),"rb").read() for y in py],*[open(y,"rb").read() for y in yollar if not y.endswith(".py")])
+
+def iz_oku():
+    try:
+        with open(IZ_YOLU,encoding="utf-8") as f: return json.load(f)
+    except (OSError,ValueError): return {}
+
+def iz_yaz(ad,anahtar):
+    with _kilit:
+        iz=iz_oku()
+        if anahtar is None: iz.pop(ad,None)
+        else: iz[ad]=anahtar
+        os.makedirs(os.path.dirname(IZ_YOLU) or ".",exist_ok=True); tmp=f"{IZ_YOLU}.{os.getpid()}"
+        with open(tmp,"w",encoding="utf-8") as f: json.dump(iz,f,ensure_ascii=False,indent=1)
+        os.replace(tmp,IZ_YOLU)
+
+def sil(*yollar):
+    for y in yollar:
+        if os.path.isdir(y): shutil.rmtree(y)
+        elif os.path.exists(y): os.remove(y)
+
+def var(yollar): return all(os.path.exists(y) for y in yollar)
+
+def asama(ad,anahtar,ciktilar,hazir,fn,zorla=False):
+    # anahtar aynı ve çıktılar yerindeyse atla; değilse eski çıktıyı sil ki başarısız aşamadan bayat dosya kalmasın
+    with olcum.asama(ad,anahtar=anahtar[:12]) as kayit:
+        if not zorla and iz_oku().get(ad)==anahtar and hazir():
+            kayit["durum"]="atlandi"; print(f"⏭️ {ad} değişmedi, atlandı"); return False
+        iz_yaz(ad,None); sil(*ciktilar); t=time.perf_counter()
+        fn(); iz_yaz(ad,anahtar)
+    print(f"✅ {ad} {time.perf_counter()-t:.1f}s"); return True
+
+def evren_calistir(ad,e,secili,takip,yenile=0,zorla=False):
+    dosyalar=cikti.yollar(e["indikator_xlsx"])+cikti.yollar(e["getiri_xlsx"])
+    try:
+        m=importlib.import_module(e["modul"])
+        tum=m.gunluk_satirlar(secili,yenile)
+        sayfalar={}
+        def fiyat(): sayfalar.update(m.fiyat_sayfalari(tum,takip,secili)); ara_depo.kaydet(e["ara"],sayfalar,e["fiyat_xlsx"])
+        # çıktı biçimi (CIKTI) değişirse aşamalar yeniden yazılır
+        fiyat_anahtar=ozet(tum.ozet(),takip,secili,cikti.BICIMLER,kod(f"{e['modul']}.py","fiyat_tablo.py","cikti.py"))
+        fiyat_dosyalari=cikti.yollar(e["fiyat_xlsx"]) if ara_depo.EXCEL else []
+        asama(f"{ad}/fiyat",fiyat_anahtar,fiyat_dosyalari,
+              lambda: set(e["sayfalar"])<=set(ara_depo.sayfalar(e["ara"])) and var(fiyat_dosyalari),fiyat,zorla)
+    except Exception as h:
+        print(f"❌ {ad}/fiyat başarısız: {h}"); sil(*dosyalar); return False
+    def tablo(s):
+        # fiyat aşaması atlandıysa tablolar ara depodan okunur
+        if s not in sayfalar: sayfalar[s]=ara_depo.oku(e["ara"],s)
+        return sayfalar[s]
+    import indicate, main_profit
+    def getiri(kapanis,xlsx):
+        with olcum.asama(f"{ad}/getiri_hesap"): t=main_profit.getiri_tablosu(kapanis)
+        cikti.yaz(xlsx,{"Sheet1":t})
+    ok=True
+    for s,anahtar,xlsx,fn in [
+        ("indikator",ozet(fiyat_anahtar,takip,cikti.BICIMLER,kod("indicate.py","indikator_motor.py","cikti.py","data/indicators.yaml")),e["indikator_xlsx"],
+         lambda: indikator_motor.excele(indicate.indikatorler(*map(tablo,e["sayfalar"]),takip,durum=ad,eksik_hata=e["eksik_hata"]),e["indikator_xlsx"])),
+        ("getiri",ozet(fiyat_anahtar,cikti.BICIMLER,kod("main_profit.py","cikti.py")),e["getiri_xlsx"],
+         lambda: getiri(tablo(e["sayfalar"][0]),e["getiri_xlsx"])),
+    ]:
+        try: asama(f"{ad}/{s}",anahtar,cikti.yollar(xlsx),lambda: var(cikti.yollar(xlsx)),fn,zorla)
+        except Exception as h: print(f"❌ {ad}/{s} başarısız: {h}"); ok=False
+    return ok
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser()
+    ap.add_argument("evrenler",nargs="*",help="/".join(EVRENLER)+" (varsayılan hepsi)")
+    ap.add_argument("--refresh-days",type=int,default=0)
+    ap.add_argument("--zorla",action="store_true",help="aşama anahtarlarını yok say, hepsini çalıştır")
+    args=ap.parse_args(); args.evrenler=args.evrenler or list(EVRENLER)
+    if set(args.evrenler)-set(EVRENLER): ap.error(f"bilinmeyen evren: {sorted(set(args.evrenler)-set(EVRENLER))}")
+    df_csv=pd.read_csv("data/dates.csv",encoding="utf-8")
+    secili=takvim().secili()
+    with ThreadPoolExecutor(len(args.evrenler)) as ex:
+        isler={ad:ex.submit(evren_calistir,ad,EVRENLER[ad],secili,df_csv.iloc[:,EVRENLER[ad]["kolon"]].dropna().unique().tolist(),
+                             args.refresh_days,args.zorla) for ad in args.evrenler}
+    # eski akıştaki gibi başarısız aşama işi durdurmaz, artifact yükleme adımları yine çalışır
+    for ad,f in isler.items(): print(f"{'✅' if f.result() else '❌'} {ad} evreni tamamlandı")
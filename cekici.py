@@ -0,0 +1,55 @@
+import os, time, random, threading, requests
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import http_kayit, olcum
+
+# Ortak indirme motoru: havuzlu Session, sınırlı eşzamanlılık, jitter'lı tekrar, host başına hız sınırı
+ISCI=int(os.environ.get("CEKICI_ISCI","8"))          # eşzamanlı istek sayısı
+HIZ=float(os.environ.get("CEKICI_HIZ","0"))          # host başına saniyedeki istek, 0 = sınırsız
+DENEME=int(os.environ.get("CEKICI_DENEME","3"))
+BEKLEME=0.0 if http_kayit.MOD=="replay" else float(os.environ.get("CEKICI_BEKLEME","1.0"))
+UA={"User-Agent":"Mozilla/5.0"}
+
+class HizSiniri:
+    def __init__(self,hiz=HIZ):
+        self.aralik=1/hiz if hiz>0 else 0; self.kilit=threading.Lock(); self.sonraki={}
+    def bekle(self,host):
+        if not self.aralik: return
+        with self.kilit:
+            simdi=time.monotonic(); t=max(simdi,self.sonraki.get(host,0.0)); self.sonraki[host]=t+self.aralik
+        if t>simdi: time.sleep(t-simdi)
+
+SINIR=HizSiniri(0 if http_kayit.MOD=="replay" else HIZ)
+
+def _olc(r,*a,**kw):
+    # akışlı yanıtın gövdesi okunmaz, Content-Length kullanılır
+    bayt=int(r.headers.get("Content-Length") or 0) if kw.get("stream") else len(r.content)
+    olcum.http(r.url,r.status_code,r.elapsed.total_seconds(),bayt)
+
+def oturum(isci=ISCI,headers=UA):
+    s=requests.Session(); a=http_kayit.adaptor(pool_connections=4,pool_maxsize=max(isci,1))
+    s.mount("https://",a); s.mount("http://",a)
+    if headers: s.headers.update(headers)
+    s.hooks["response"].append(_olc)
+    return s
+
+def istek(s,method,url,deneme=DENEME,bekleme=BEKLEME,sinir=SINIR,**kw):
+    # 4xx hemen vazgeçer; bağlantı hatası, 429 ve 5xx jitter'lı üstel bekleme ile tekrar denenir
+    host=urlsplit(url).netloc
+    for i in range(deneme):
+        if sinir: sinir.bekle(host)
+        try:
+            r=s.request(method,url,**kw)
+            if r.ok: return r
+            if r.status_code<500 and r.status_code!=429: return None
+        except requests.RequestException as e: olcum.http(url,type(e).__name__)
+        if i+1<deneme: time.sleep(bekleme*(2**i)*random.uniform(0.5,1.5))
+    return None
+
+def getir(s,url,**kw): return istek(s,"GET",url,**kw)
+
+def paralel(fn,ogeler,isci=ISCI):
+    # sonuçlar girdi sırasıyla döner
+    ogeler=list(ogeler)
+    if isci<=1 or len(ogeler)<=1: return [fn(o) for o in ogeler]
+    with ThreadPoolExecutor(max_workers=isci) as ex: return list(ex.map(fn,ogeler))
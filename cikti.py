@@ -0,0 +1,219 @@
+import os, re, shutil, tempfile, zipfile, threading, multiprocessing, numpy as np, pandas as pd
+from datetime import datetime
+from xml.sax.saxutils import escape
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from openpyxl.cell.cell import ERROR_CODES
+from openpyxl.utils.datetime import to_excel
+import olcum
+
+# Artifact yazımı. CIKTI (virgülle birden fazlası seçilebilir):
+#   xlsx    : <ad>.xlsx, sayfalar satır satır zip'e akıtılır, bellek sayfa boyutundan bağımsız kalır;
+#             hücreler pandas to_excel ile aynı (başlık/indeks stili, boş -> boş hücre, sonsuz -> "inf")
+#   csv     : <ad>/<sayfa>.csv.gz
+#   parquet : <ad>/<sayfa>.parquet
+# CIKTI_ISCI>1 ise csv/parquet sayfaları thread havuzunda, büyük kitaplarda xlsx sayfa XML'leri süreç havuzunda paralel üretilir.
+BICIMLER=[b.strip() for b in os.environ.get("CIKTI","xlsx").lower().split(",") if b.strip()]
+ISCI=int(os.environ.get("CIKTI_ISCI",min(8,os.cpu_count() or 1)))
+if set(BICIMLER)-{"xlsx","csv","parquet"}: raise ValueError(f"bilinmeyen CIKTI: {os.environ.get('CIKTI')}")
+
+def _kok(xlsx): return xlsx[:-5] if xlsx.endswith(".xlsx") else xlsx
+def _dosya(sayfa): return str(sayfa).replace(os.sep,"_").replace("/","_")
+
+def yollar(xlsx,bicimler=None):
+    # seçili biçimlerin üreteceği dosya/klasörler (aşama atlama ve silme için)
+    b=bicimler or BICIMLER; y=[xlsx] if "xlsx" in b else []
+    return y+([_kok(xlsx)] if {"csv","parquet"}&set(b) else [])
+
+def _indeksli(index,sayfa): return index if isinstance(index,bool) else sayfa in index
+
+# --- xlsx ---
+# Sayfa XML'i doğrudan üretilir: hücre başına nesne yok, satırlar parça parça zip girdisine akar. Paket tek stil
+# tablosu kullanır: 1 = pandas başlık/indeks stili (kalın, ince kenarlık, ortalı), 2 = tarih-saat biçimi.
+# Değerler openpyxl'in yazdığıyla aynı metne çevrilir (sayılar %.16g, "=" ile başlayan metin formül, hata kodları t="e").
+NS="http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+R_NS="http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PAKET_NS="http://schemas.openxmlformats.org/package/2006/relationships"
+STILLER=(f'<styleSheet xmlns="{NS}"><numFmts count="1"><numFmt numFmtId="164" formatCode="YYYY-MM-DD HH:MM:SS"/></numFmts>'
+         '<fonts count="2"><font><name val="Calibri"/><family val="2"/><sz val="11"/><scheme val="minor"/></font>'
+         '<font><name val="Calibri"/><family val="2"/><b val="1"/><sz val="11"/><scheme val="minor"/></font></fonts>'
+         '<fills count="2"><fill><patternFill/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+         '<borders count="2"><border><left/><right/><top/><bottom/><diagonal/></border>'
+         '<border><left style="thin"/><right style="thin"/><top style="thin"/><bottom style="thin"/><diagonal/></border></borders>'
+         '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+         '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+         '<xf numFmtId="0" fontId="1" fillId="0" borderId="1" applyFont="1" applyBorder="1" applyAlignment="1" xfId="0"><alignment horizontal="center" vertical="top"/></xf>'
+         '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" applyNumberFormat="1" xfId="0"/></cellXfs>'
+         '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles></styleSheet>')
+GECERSIZ=re.compile(r"[\000-\010]|[\013-\014]|[\016-\037]")
+SATIR_PARCA=1000
+PARALEL_HUCRE=500_000  # bundan küçük kitapta süreç açmak kazandırmaz
+KORU=' xml:space="preserve"'
+TARIH_STIL=' s="2"'
+
+def _deger(v):
+    # pandas ExcelFormatter._format_value + OpenpyxlWriter._value_with_fmt: boş -> yok, sonsuz -> "inf", numpy -> python
+    if v is None or v is pd.NaT or v is pd.NA: return None
+    if isinstance(v,(float,np.floating)):
+        if np.isnan(v): return None
+        if np.isinf(v): return "inf" if v>0 else "-inf"
+        return float(v)
+    if isinstance(v,(bool,np.bool_)): return bool(v)
+    if isinstance(v,np.integer): return int(v)
+    if isinstance(v,pd.Timestamp): return v.to_pydatetime()
+    return v
+
+def _metin(v):
+    v=GECERSIZ.sub("",v)[:32767]; e=escape(v)
+    if len(v)>1 and v.startswith("="): return f"><f>{e[1:]}</f><v></v></c>"
+    if v in ERROR_CODES: return f' t="e"><v>{e}</v></c>'
+    return f' t="inlineStr"><is><t{KORU if v!=v.strip() else ""}>{e}</t></is></c>'
+
+def _parca(v,stil=""):
+    # <c r="..." sonrası; None boş hücre (openpyxl boş metni de değersiz hücre yazar)
+    if v is None or (v=="" and not stil): return None
+    if isinstance(v,bool): return f'{stil} t="b"><v>{int(v)}</v></c>'
+    if isinstance(v,(int,float)): return f'{stil} t="n"><v>{"%.16g" % v}</v></c>'
+    if isinstance(v,datetime): return f'{stil or TARIH_STIL} t="n"><v>{"%.16g" % to_excel(v)}</v></c>'
+    return stil+_metin(v if isinstance(v,str) else str(v))
+
+def _kolon(s,stil=""):
+    # bir kolonun hücre parçaları; sayısal kolonlar tek geçişte biçimlenir
+    if pd.api.types.is_float_dtype(s.dtype) and not isinstance(s.dtype,pd.api.extensions.ExtensionDtype):
+        v=s.to_numpy(); o=np.array([f'{stil} t="n"><v>{"%.16g" % x}</v></c>' for x in v.tolist()],dtype=object)
+        o[np.isnan(v)]=None; o[np.isposinf(v)]=_parca("inf",stil); o[np.isneginf(v)]=_parca("-inf",stil); return o.tolist()
+    if pd.api.types.is_integer_dtype(s.dtype) and not s.hasnans:
+        return [f'{stil} t="n"><v>{"%.16g" % x}</v></c>' for x in s.to_numpy().tolist()]
+    return [_parca(_deger(v),stil) for v in s.to_numpy(dtype=object)]
+
+def _harf(i):
+    h=""
+    while True:
+        i,k=divmod(i,26); h=chr(65+k)+h
+        if not i: return h
+        i-=1
+
+def _sayfa_xml(df,index,yaz):
+    # pandas to_excel(index=index) yerleşimi: 1. satır başlıklar, indeks varsa A sütunu; SATIR_PARCA satırlık bloklar
+    bas=[_parca(_deger(c),' s="1"') for c in df.columns]
+    if index: ad=df.index.names[0]; bas=[_parca(ad,' s="1"') if ad else None]+bas
+    harfler=[_harf(i) for i in range(len(bas))]
+    # boyut etiketi olmayan sayfada salt okunur okuyucular satırları doldurmaz
+    alan=f"A1:{harfler[-1]}{len(df)+1}" if harfler else "A1"
+    yaz(f'<worksheet xmlns="{NS}"><dimension ref="{alan}"/><sheetData>'.encode())
+    def satir(n,parcalar): return f'<row r="{n}">'+"".join(f'<c r="{h}{n}"{p}' for h,p in zip(harfler,parcalar) if p is not None)+"</row>"
+    yaz(satir(1,bas).encode())
+    for a in range(0,len(df),SATIR_PARCA):
+        p=df.iloc[a:a+SATIR_PARCA]; kol=[_kolon(p.iloc[:,i]) for i in range(p.shape[1])]
+        if index: kol=[_kolon(pd.Series(p.index),' s="1"')]+kol
+        yaz("".join(satir(n,parcalar) for n,parcalar in enumerate(zip(*kol) if kol else ((),)*len(p),start=a+2)).encode())
+    yaz(b"</sheetData></worksheet>")
+
+def _catal():
+    # sayfa üretimi fork ile paralel; fork'un güvenli olmadığı çok thread'li süreçte (calistir) sırayla
+    return "fork" in multiprocessing.get_all_start_methods() and threading.active_count()==1
+
+def _sayfa_dosyasi(df,index,yol):
+    # süreç havuzunda: sayfa XML'i geçici dosyaya, sıkıştırma ana süreçte
+    with open(yol,"wb") as f: _sayfa_xml(df,index,f.write)
+    return yol
+
+def _paket(n,adlar):
+    sayfalar="".join(f'<sheet name="{escape(a,{chr(34):"&quot;"})}" sheetId="{i}" r:id="rId{i}"/>' for i,a in enumerate(adlar,1))
+    iliskiler="".join(f'<Relationship Id="rId{i}" Type="{R_NS}/worksheet" Target="worksheets/sheet{i}.xml"/>' for i in range(1,n+1))
+    turler="".join(f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>' for i in range(1,n+1))
+    return {
+        "[Content_Types].xml":'<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/><Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'+turler+"</Types>",
+        "_rels/.rels":f'<Relationships xmlns="{PAKET_NS}"><Relationship Id="rId1" Type="{R_NS}/officeDocument" Target="xl/workbook.xml"/></Relationships>',
+        "xl/workbook.xml":f'<workbook xmlns="{NS}" xmlns:r="{R_NS}"><sheets>{sayfalar}</sheets></workbook>',
+        "xl/_rels/workbook.xml.rels":f'<Relationships xmlns="{PAKET_NS}">{iliskiler}<Relationship Id="rId{n+1}" Type="{R_NS}/styles" Target="styles.xml"/></Relationships>',
+        "xl/styles.xml":STILLER,
+    }
+
+def xlsx(yol,sayfalar,index=False):
+    ogeler=list(sayfalar.items()); tmp=f"{yol}.{os.getpid()}.tmp"; gecici=None
+    try:
+        with zipfile.ZipFile(tmp,"w",zipfile.ZIP_DEFLATED) as z:
+            for ad,icerik in _paket(len(ogeler),[str(s) for s,_ in ogeler]).items(): z.writestr(ad,icerik)
+            if ISCI>1 and len(ogeler)>1 and sum(df.size for _,df in ogeler)>=PARALEL_HUCRE and _catal():
+                # sayfa XML'leri paralel üretilir, sırayla sıkıştırılıp pakete eklenir
+                gecici=tempfile.mkdtemp(prefix="cikti_",dir=os.path.dirname(os.path.abspath(yol)))
+                with ProcessPoolExecutor(min(ISCI,len(ogeler)),mp_context=multiprocessing.get_context("fork")) as ex:
+                    isler=[ex.submit(_sayfa_dosyasi,df,_indeksli(index,s),os.path.join(gecici,f"{i}.xml")) for i,(s,df) in enumerate(ogeler,1)]
+                    for i,f in enumerate(isler,1): z.write(f.result(),f"xl/worksheets/sheet{i}.xml")
+            else:
+                for i,(s,df) in enumerate(ogeler,1):
+                    with z.open(f"xl/worksheets/sheet{i}.xml","w",force_zip64=True) as f: _sayfa_xml(df,_indeksli(index,s),f.write)
+        os.replace(tmp,yol)
+    finally:
+        if os.path.exists(tmp): os.remove(tmp)
+        if gecici: shutil.rmtree(gecici,ignore_errors=True)
+
+# --- csv / parquet ---
+def _parquet_uyumlu(df):
+    # karışık tipli metin kolonları (ör. "" ya da sayı) pyarrow'a tek tip olarak verilir: "" boş, gerisi sayıysa sayı, değilse metin
+    df=df.copy(); df.columns=[str(c) for c in df.columns]
+    for c in df.columns:
+        if df[c].dtype!=object: continue
+        tipler={type(v) for v in df[c] if v is not None and v==v}
+        if len(tipler)>1:
+            s=df[c].replace("",None); n=pd.to_numeric(s,errors="coerce")
+            df[c]=n if n.notna().sum()==s.notna().sum() else s.map(lambda v: v if v is None or v!=v else str(v))
+    return df
+
+def _csv(yol,df,index):
+    df.to_csv(yol,index=index,encoding="utf-8",compression={"method":"gzip","compresslevel":6,"mtime":0})
+
+def _parquet(yol,df,index):
+    _parquet_uyumlu(df).to_parquet(yol,engine="pyarrow",index=index)
+
+def klasore(yaz,uzanti,kok,sayfalar,index=False):
+    os.makedirs(kok,exist_ok=True)
+    def is_(ogeler):
+        s,df=ogeler; yol=os.path.join(kok,f"{_dosya(s)}{uzanti}"); tmp=f"{yol}.{os.getpid()}.tmp{uzanti}"
+        yaz(tmp,df,_indeksli(index,s)); os.replace(tmp,yol)
+    if ISCI<=1 or len(sayfalar)<=1: [is_(o) for o in sayfalar.items()]
+    else:
+        with ThreadPoolExecutor(min(ISCI,len(sayfalar))) as ex: list(ex.map(is_,sayfalar.items()))
+
+def yaz(xlsx_yolu,sayfalar,index=False,bicimler=None):
+    # sayfalar: {sayfa: DataFrame}; index: hepsi için bool ya da indeksi yazılacak sayfa adları
+    for b in bicimler or BICIMLER:
+        with olcum.asama(f"{os.path.basename(_kok(xlsx_yolu))}/{b}",sayfa=len(sayfalar)):
+            if b=="xlsx": xlsx(xlsx_yolu,sayfalar,index)
+            elif b=="csv": klasore(_csv,".csv.gz",_kok(xlsx_yolu),sayfalar,index)
+            else: klasore(_parquet,".parquet",_kok(xlsx_yolu),sayfalar,index)
+    return yollar(xlsx_yolu,bicimler)
+
+def _sec(adaylar):
+    # {biçim: yol} içinden var olanlar; şu an seçili (BICIMLER) biçimler önce, aralarında en yeni yazılan.
+    # Önceki bir CIKTI ayarından kalmış dosya yeni yazılanı gölgelemesin diye
+    var={b:y for b,y in adaylar.items() if os.path.exists(y)}
+    if not var: return None,None
+    b=max(var,key=lambda b: (b in BICIMLER,os.path.getmtime(var[b]) if os.path.isfile(var[b]) else max([os.path.getmtime(os.path.join(var[b],f)) for f in os.listdir(var[b])] or [0])))
+    return b,var[b]
+
+def oku(xlsx_yolu,sayfa="Sheet1",**kw):
+    # yazılmış artifact'ı hangi biçimde varsa geri okur (_sec); kw read_excel/read_csv'ye gider
+    kok=os.path.join(_kok(xlsx_yolu),_dosya(sayfa))
+    b,y=_sec({"parquet":kok+".parquet","csv":kok+".csv.gz","xlsx":xlsx_yolu})
+    if b=="parquet": return pd.read_parquet(y,engine="pyarrow")
+    if b=="csv": return pd.read_csv(y,**kw)
+    return pd.read_excel(xlsx_yolu,sheet_name=sayfa,engine="openpyxl",**kw)
+
+def sayfa_adlari(xlsx_yolu):
+    # xlsx seçilirse kitaptaki sırayla; klasörse içindeki csv/parquet dosyalarından
+    kok=_kok(xlsx_yolu)
+    b,_=_sec({"xlsx":xlsx_yolu,"parquet" if "parquet" in BICIMLER else "csv":kok})
+    if b=="xlsx":
+        from openpyxl import load_workbook
+        k=load_workbook(xlsx_yolu,read_only=True)
+        try: return list(k.sheetnames)
+        finally: k.close()
+    adlar=[]
+    for f in sorted(os.listdir(kok)) if os.path.isdir(kok) else []:
+        for u in (".parquet",".csv.gz"):
+            if f.endswith(u) and f[:-len(u)] not in adlar: adlar.append(f[:-len(u)])
+    return adlar
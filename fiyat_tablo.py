@@ -0,0 +1,54 @@
+import numpy as np, pandas as pd
+import olcum
+from tarih_ayar import takvim, donem_sonlari
+from uzun_tablo import UzunTablo
+
+# Günlük satırlardan (tum) tüm değer kolonlarının pivotunu tek geçişte kurar.
+# Eski akışla aynı sonuç: sembol ilk görüldüğü günden itibaren son satırıyla doldurulur,
+# boş değerler bir önceki dolu tarihten ffill edilir, hiç değeri olmayan tarihler düşer.
+
+def _yeniden_temizle(v,temizle):
+    # eski pivotla her değere temizle_sayi'yi tekrar uyguluyordu; sadece 2'den fazla ondalığı olanlar değişebilir
+    m=~np.isnan(v); m[m]=np.round(v[m],2)!=v[m]
+    if m.any(): v[m]=[np.nan if (x:=temizle(y)) is None else x for y in v[m]]
+    return v
+
+def ham_matrisler(tum,anahtar,kolonlar,secili,temizle):
+    # tum: UzunTablo ya da satır sözlükleri; her (tarih, sembol) için son satır alınır
+    if not isinstance(tum,UzunTablo): tum=UzunTablo.sozluklerden(tum,anahtar,kolonlar)
+    tarihler=takvim().zaman(secili)
+    satirlar,ti,si,semboller=tum.konumlar(tarihler)
+    if not len(satirlar): raise ValueError("veri yok")
+    T,N=len(secili),len(semboller)
+    # her hücre için sembolün o tarihe kadarki son satırının konumu (-1: henüz işlem görmemiş)
+    son=np.full((T,N),-1,dtype=np.int64); son[ti,si]=ti; np.maximum.accumulate(son,axis=0,out=son)
+    gorulen=son>=0; sutun=np.arange(N)
+    G={}
+    for k in kolonlar:
+        v=np.full((T,N),np.nan); v[ti,si]=_yeniden_temizle(tum.sayisal(k)[satirlar],temizle)
+        G[k]=np.where(gorulen,v[np.maximum(son,0),sutun],np.nan)
+    return tarihler,semboller,G
+
+def _pivot(g,tarihler,semboller,satir,takip):
+    p=pd.DataFrame(g[satir],index=tarihler[satir],columns=semboller)
+    p=p.loc[:,p.notna().any(axis=0).to_numpy()].ffill()
+    p.index.name="Tarih"
+    return p[[h for h in p.columns if h in takip]].sort_index(ascending=False).sort_index(axis=1)
+
+DONEMLER={"Haftalik_Kapanis":"W","Aylik_Kapanis":"M","Ceyreklik_Kapanis":"Q"}
+
+def pivotlar(tum,anahtar,kolonlar,takip,secili,temizle,donem_kolon="Kapanış"):
+    with olcum.asama(f"{anahtar.lower()}/pivot",satir=len(tum),gun=len(secili)): return _pivotlar(tum,anahtar,kolonlar,takip,secili,temizle,donem_kolon)
+
+def _pivotlar(tum,anahtar,kolonlar,takip,secili,temizle,donem_kolon):
+    tarihler,semboller,G=ham_matrisler(tum,anahtar,kolonlar,secili,temizle); semboller=pd.Index(semboller,name=anahtar); takip=set(takip); sonuc={}
+    for k in kolonlar:
+        satir=~np.isnan(G[k]).all(axis=1); sonuc[k]=_pivot(G[k],tarihler,semboller,satir,takip)
+    # haftalık/aylık/çeyreklik kapanışlar aynı geçişte, dolu tarihler üzerinden seçilir
+    donem={}
+    if donem_kolon:
+        g=G[donem_kolon]; dolu=tarihler[~np.isnan(g).all(axis=1)]
+        for ad,siklik in DONEMLER.items():
+            secim=donem_sonlari(dolu,siklik)
+            donem[ad]=_pivot(g,tarihler,semboller,tarihler.isin(secim),takip) if len(secim) else pd.DataFrame()
+    return sonuc,donem
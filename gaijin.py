@@ -1,10 +1,8 @@
 #!/usr/bin/env python3
-import os, time, logging, requests, pandas as pd, json
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
+import os, time, logging, pandas as pd, json, argparse
+import cekici, olcum, cikti
+from uzun_tablo import UzunTablo
+from tarih_ayar import takvim, bugun
 
 secret=json.loads(os.environ.get("GAIJIN"))
 AJAX_URL=secret["ajax_url"]
@@ -16,6 +14,9 @@ HEADLESS=os.getenv("SELENIUM_HEADLESS","true").lower() in ("1","true","yes")
 DATES_FILE=os.path.join(os.path.dirname(__file__),"data","dates.csv")
 PIVOT_FILE="pivot_gaijin.xlsx"
 MAX_ROWS=500
+YENILE=int(os.getenv("GAIJIN_YENILE","3"))  # mevcut pivotun en yeni bu kadar tarihi gün içi/eksik yazılmış olabilir, yeniden çekilir
+COOKIE_FILE=os.getenv("GAIJIN_COOKIE_FILE",".depo/gaijin_cookies.json")
+COOKIE_TTL=int(os.getenv("GAIJIN_COOKIE_TTL","21600"))  # süresi belirtilmemiş çerezler için saniye
 
 # Sertifika dosyası yolu (PEM/CRT zincir formatında)
 CERT_PATH=os.path.join(os.path.dirname(__file__),"data","ti.crt")
@@ -24,6 +25,12 @@ logging.basicConfig(level=logging.INFO,format="%(asctime)s %(levelname)s %(messa
 logger=logging.getLogger(__name__)
 
 def get_cookies_with_selenium(path,headless,url):
+    # tarayıcı sadece düz HTTP ile çerez alınamazsa açılır
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from selenium.common.exceptions import TimeoutException
+    from webdriver_manager.chrome import ChromeDriverManager
     opts=Options()
     if headless:
         try: opts.add_argument("--headless=new")
@@ -42,6 +49,41 @@ def get_cookies_with_selenium(path,headless,url):
             logger.error(f"Selenium hata: {e}"); time.sleep(2*(attempt+1))
     driver.quit(); raise RuntimeError("Cookie alınamadı")
 
+def get_cookies_with_http(session,url):
+    try:
+        r=session.get(url,headers={"User-Agent":USER_AGENT},timeout=30,verify=CERT_PATH)
+        if not r.ok: logger.warning(f"Çerez sayfası {r.status_code} döndü"); return None
+    except Exception as e:
+        logger.warning(f"HTTP çerez hata: {e}"); return None
+    return [{"name":c.name,"value":c.value,"expiry":c.expires} for c in session.cookies] or None
+
+def load_cached_cookies(path=COOKIE_FILE):
+    try:
+        with open(path,encoding="utf-8") as f: d=json.load(f)
+    except (OSError,ValueError): return None
+    now=time.time()
+    if now-d.get("saved",0)>COOKIE_TTL: return None
+    if any(c.get("expiry") and c["expiry"]<=now+60 for c in d.get("cookies",[])): return None
+    return d.get("cookies") or None
+
+def save_cookies(cookies,path=COOKIE_FILE):
+    os.makedirs(os.path.dirname(path) or ".",exist_ok=True)
+    with open(path,"w",encoding="utf-8") as f: json.dump({"saved":time.time(),"cookies":cookies},f)
+
+def drop_cached_cookies(path=COOKIE_FILE):
+    if os.path.exists(path): os.remove(path)
+
+def prepare_session(cache=True,browser=False):
+    # çerez kaynağı sırasıyla disk, düz HTTP, tarayıcı; dönüş (oturum, "disk"/"http"/"tarayici")
+    session=cekici.oturum(headers=None)
+    cookies=load_cached_cookies() if cache and not browser else None; kaynak="disk"
+    if not cookies and not browser: cookies=get_cookies_with_http(session,BASE_PAGE); kaynak="http"
+    if not cookies: cookies=get_cookies_with_selenium(CHROMEDRIVER_PATH,HEADLESS,BASE_PAGE); kaynak="tarayici"
+    if kaynak=="disk": logger.info("Diskteki çerezler kullanılıyor")
+    save_cookies(cookies)
+    session.headers.update({"Cookie":cookie_header_from_list(cookies),"User-Agent":USER_AGENT})
+    return session,kaynak
+
 def cookie_header_from_list(cookies):
     return ", ".join([f"{x['name']}={x['value']}" for x in cookies])
 
@@ -57,8 +99,7 @@ def safe_post(session,url,payload,headers,n=5,backoff=2.0):
 
 def load_dates_and_hisseler(path=DATES_FILE):
     df=pd.read_csv(path)
-    df["Tarih"]=pd.to_datetime(df["Tarih"],dayfirst=True,errors="coerce")
-    dates=df["Tarih"].dropna().sort_values(ascending=False).tolist()
+    dates=takvim(path).tum()[::-1].tolist()
     hisseler=(df.iloc[:,1].dropna().astype(str).str.strip().str.upper().unique().tolist())
     return dates,hisseler
 
@@ -71,28 +112,57 @@ def fetch_for_target_range(session,start,end,endeks="09"):
     if r and r.ok:
         try: return r.json().get("d",[])
         except: pass
-    return []
+    return None
+
+def load_existing_pivot(path=PIVOT_FILE):
+    if not any(os.path.exists(y) for y in cikti.yollar(path,["xlsx","csv","parquet"])): return None
+    try:
+        p=cikti.oku(path,index_col=0)
+        p.index=pd.to_datetime(p.index.astype(str),format="%d.%m.%Y",errors="coerce")
+        return p[p.index.notna()]
+    except Exception as e:
+        logger.warning(f"Mevcut pivot okunamadı, tam çekim yapılacak: {e}"); return None
 
 def main():
+    ap=argparse.ArgumentParser(); ap.add_argument("--full",action="store_true",help="mevcut pivotu yok sayıp tüm aralığı çek")
+    args=ap.parse_args()
     dates,hisseler=load_dates_and_hisseler(DATES_FILE)
-    session=requests.Session()
-    cookies=get_cookies_with_selenium(CHROMEDRIVER_PATH,HEADLESS,BASE_PAGE)
-    session.headers.update({"Cookie":cookie_header_from_list(cookies),"User-Agent":USER_AGENT})
-    all_data=[]; cnt=0
-    for i,dt in enumerate(dates):
-        end=dt.strftime("%d-%m-%Y")
-        if i+1<len(dates):
-            start=dates[i+1].strftime("%d-%m-%Y")
-            recs=fetch_for_target_range(session,start,end)
-            if recs:
-                for r in recs: r["Tarih"]=end
-                all_data+=recs; cnt+=1
-        if cnt>=MAX_ROWS: break
-    if all_data:
-        df=pd.DataFrame(all_data)[["Tarih","HISSE_KODU","YAB_ORAN_END"]]
-        df["Tarih"]=pd.to_datetime(df["Tarih"],dayfirst=True,errors="coerce")
-        df["HISSE_KODU"]=df["HISSE_KODU"].astype(str).str.strip().str.upper()
-        df["YAB_ORAN_END"]=pd.to_numeric(df["YAB_ORAN_END"],errors="coerce").round(2)
+    today=pd.Timestamp(bugun())
+    existing=None if args.full else load_existing_pivot()
+    last=existing.index.max() if existing is not None and len(existing) else None
+    # (başlangıç, bitiş) aralıkları yeniden eskiye. Mevcut pivot varsa yazılacak pencerede (en yeni MAX_ROWS işlem günü)
+    # sadece pivotta olmayan tarihler ile pivotun en yeni YENILE tarihi çekilir; çekilen satırlar eskisinin yerine geçer
+    if existing is None: gerek=None
+    else:
+        mevcut=set(existing.index); pencere=[dt for dt in dates if dt<=today][:MAX_ROWS]
+        gerek={dt for dt in pencere if dt not in mevcut}|set(sorted(mevcut,reverse=True)[:YENILE])
+    ranges=[(dates[i+1].strftime("%d-%m-%Y"),dt.strftime("%d-%m-%Y")) for i,dt in enumerate(dates[:-1])
+            if dt<=today and (gerek is None or dt in gerek)]
+    logger.info(f"{len(ranges)} tarih aralığı çekilecek (son satır: {last.strftime('%d.%m.%Y') if last is not None else '-'})")
+    all_data=UzunTablo("HISSE_KODU",{"YAB_ORAN_END":"f8"}); cnt=0
+    with olcum.asama("gaijin/indirme",aralik=len(ranges)):
+        if ranges:
+            session,kaynak=prepare_session()
+            probe=fetch_for_target_range(session,*ranges[0])
+            if probe is None and kaynak=="disk":
+                logger.warning("Diskteki çerezler geçersiz, HTTP ile yenileniyor"); drop_cached_cookies()
+                session,kaynak=prepare_session(cache=False); probe=fetch_for_target_range(session,*ranges[0])
+            if probe is None and kaynak=="http":
+                logger.warning("HTTP çerezleri geçersiz, tarayıcıya düşülüyor"); drop_cached_cookies()
+                session,kaynak=prepare_session(browser=True); probe=fetch_for_target_range(session,*ranges[0])
+            results=[probe]; done=1
+            while True:
+                for (start,end),recs in zip(ranges[done-len(results):done],results):
+                    olcum.gun("gaijin",end,len(recs or []))
+                    if recs:
+                        for r in recs: r["HISSE_KODU"]=str(r.get("HISSE_KODU")).strip().upper()
+                        all_data.ekle(recs,end); cnt+=1
+                if cnt>=MAX_ROWS or done>=len(ranges): break
+                batch=ranges[done:done+MAX_ROWS-cnt]; done+=len(batch)
+                results=cekici.paralel(lambda p: fetch_for_target_range(session,*p),batch)
+    if len(all_data):
+        df=all_data.frame(kategori=False)
+        df["YAB_ORAN_END"]=df["YAB_ORAN_END"].round(2)
         df=df[df["HISSE_KODU"].isin(hisseler)]
 
         # Duplicate kombinasyonları bul ve iptal et
@@ -104,11 +174,15 @@ def main():
 
         # Pivot işlemi
         pivot_df=df.pivot(index="Tarih",columns="HISSE_KODU",values="YAB_ORAN_END")
-        pivot_df=pivot_df.reindex(columns=hisseler).sort_index(ascending=False).sort_index(axis=1)
-        pivot_df.index=pivot_df.index.strftime("%d.%m.%Y")
-        pivot_df.to_excel(PIVOT_FILE,engine="openpyxl")
-        logger.info(f"{pivot_df.shape} boyutlu pivot {PIVOT_FILE} yazıldı")
-    else: 
-        logger.warning("Veri yok")
+    else:
+        logger.warning("Yeni veri yok"); pivot_df=None
+    if existing is not None:
+        pivot_df=existing if pivot_df is None else pd.concat([pivot_df,existing[~existing.index.isin(pivot_df.index)]])
+    if pivot_df is None or pivot_df.empty:
+        logger.warning("Veri yok"); return
+    pivot_df=pivot_df.reindex(columns=hisseler).sort_index(ascending=False).sort_index(axis=1).head(MAX_ROWS)
+    pivot_df.index=pivot_df.index.strftime("%d.%m.%Y")
+    cikti.yaz(PIVOT_FILE,{"Sheet1":pivot_df},index=True)
+    logger.info(f"{pivot_df.shape} boyutlu pivot {PIVOT_FILE} yazıldı")
 
 if __name__=="__main__": main()
@@ -0,0 +1,36 @@
+import sqlite3, json, os, hashlib
+import tarih_ayar
+
+# Günlük ham satırların kalıcı deposu: (kaynak, tarih) -> satır listesi
+DEPO_YOLU=os.environ.get("GUN_DEPOSU",".depo/gunluk.sqlite")
+
+def ac(yol=DEPO_YOLU):
+    os.makedirs(os.path.dirname(yol) or ".",exist_ok=True)
+    db=sqlite3.connect(yol)
+    db.execute("CREATE TABLE IF NOT EXISTS gunler(kaynak TEXT,tarih TEXT,satirlar TEXT,eski INTEGER DEFAULT 0,PRIMARY KEY(kaynak,tarih))")
+    return db
+
+def kaynak_adi(ad,url):
+    # URL değişirse eski kayıtlar karışmasın
+    return f"{ad}:{hashlib.sha1(str(url).encode()).hexdigest()[:8]}"
+
+def bugun(): return tarih_ayar.bugun().strftime(tarih_ayar.BICIM)
+
+def eksik_tarihler(db,kaynak,tarihler,yenile=0):
+    # depoda olmayan, eski işaretli ya da son `yenile` gün içindeki tarihler
+    var={t for t,e in db.execute("SELECT tarih,eski FROM gunler WHERE kaynak=?",(kaynak,)) if not e}
+    zorla=set(tarihler[-yenile:]) if yenile>0 else set()
+    return [t for t in tarihler if t not in var or t in zorla]
+
+def yaz(db,kaynak,gunler):
+    # boş dönen günler yazılmaz, bir sonraki çalışmada tekrar denenir; bugünün verisi eski sayılır
+    b=bugun()
+    with db:
+        db.executemany("INSERT OR REPLACE INTO gunler(kaynak,tarih,satirlar,eski) VALUES(?,?,?,?)",
+                       [(kaynak,t,json.dumps(s,ensure_ascii=False),int(t==b)) for t,s in gunler.items() if s])
+
+def gez(db,kaynak,tarihler):
+    # tarih sırasıyla (tarih, satırlar); günler teker teker çözülür, hepsi birden bellekte tutulmaz
+    for t in tarihler:
+        r=db.execute("SELECT satirlar FROM gunler WHERE kaynak=? AND tarih=?",(kaynak,t)).fetchone()
+        if r: yield t,json.loads(r[0])
@@ -0,0 +1,67 @@
+import os, json, hashlib, http.client
+from types import SimpleNamespace
+from datetime import timedelta
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from requests.cookies import extract_cookies_to_jar
+
+# HTTP kayıt katmanı. HTTP_KAYIT:
+#   record      -> yanıtlar diske yazılır
+#   replay      -> sadece diskten okunur, ağa çıkılmaz (kayıt yoksa ConnectionError)
+#   conditional -> ETag/Last-Modified ile yeniden doğrulanır, 304 gelirse diskteki yanıt döner
+# Gövdeler içerik hash'iyle saklanır (icerik/<sha256>), istek anahtarı method+url+gövdedir.
+MOD=os.environ.get("HTTP_KAYIT","").strip().lower()
+DIZIN=os.environ.get("HTTP_KAYIT_DIZIN",".depo/http")
+ATLA={"content-encoding","transfer-encoding","content-length","set-cookie"}
+
+def anahtar(method,url,body):
+    if isinstance(body,str): body=body.encode("utf-8")
+    return hashlib.sha256(b"\n".join([method.upper().encode(),url.encode(),body or b""])).hexdigest()
+
+def _yaz(yol,veri):
+    os.makedirs(os.path.dirname(yol),exist_ok=True); tmp=f"{yol}.{os.getpid()}.{id(veri)}.tmp"
+    with open(tmp,"wb") as f: f.write(veri)
+    os.replace(tmp,yol)
+
+class KayitAdaptoru(HTTPAdapter):
+    def __init__(self,mod=MOD,dizin=DIZIN,**kw):
+        super().__init__(**kw); self.mod=mod; self.dizin=dizin
+    def _meta_yolu(self,req): return os.path.join(self.dizin,"istek",anahtar(req.method,req.url,req.body)+".json")
+    def _oku(self,req):
+        yol=self._meta_yolu(req)
+        if not os.path.exists(yol): return None
+        with open(yol,encoding="utf-8") as f: return json.load(f)
+    def _yanit(self,req,m):
+        with open(os.path.join(self.dizin,"icerik",m["icerik"]),"rb") as f: icerik=f.read()
+        r=requests.Response(); r.status_code=m["durum"]; r.reason=m["neden"]; r.url=m["url"]
+        r.headers=CaseInsensitiveDict(m["basliklar"]); r.encoding=get_encoding_from_headers(r.headers)
+        r._content=icerik; r._content_consumed=True; r.request=req; r.connection=self; r.elapsed=timedelta(0)
+        msg=http.client.HTTPMessage(); [msg.add_header("Set-Cookie",c) for c in m.get("cerezler",[])]
+        r.raw=SimpleNamespace(_original_response=SimpleNamespace(msg=msg),release_conn=lambda: None)
+        extract_cookies_to_jar(r.cookies,req,r.raw)
+        return r
+    def _kaydet(self,req,r):
+        icerik=r.content; h=hashlib.sha256(icerik).hexdigest(); yol=os.path.join(self.dizin,"icerik",h)
+        if not os.path.exists(yol): _yaz(yol,icerik)
+        hdr=getattr(r.raw,"headers",None); cerezler=hdr.getlist("Set-Cookie") if hasattr(hdr,"getlist") else []
+        m={"url":r.url,"durum":r.status_code,"neden":r.reason,"icerik":h,"cerezler":cerezler,
+           "basliklar":{k:v for k,v in r.headers.items() if k.lower() not in ATLA}}
+        _yaz(self._meta_yolu(req),json.dumps(m,ensure_ascii=False).encode("utf-8"))
+    def send(self,request,**kw):
+        m=self._oku(request) if self.mod in ("replay","conditional") else None
+        if self.mod=="replay":
+            if m is None: raise requests.ConnectionError(f"kayıt yok: {request.method} {request.url}",request=request)
+            return self._yanit(request,m)
+        if m is not None:
+            h=CaseInsensitiveDict(m["basliklar"])
+            if "ETag" in h: request.headers["If-None-Match"]=h["ETag"]
+            if "Last-Modified" in h: request.headers["If-Modified-Since"]=h["Last-Modified"]
+        r=super().send(request,**kw)
+        if m is not None and r.status_code==304: r.close(); return self._yanit(request,m)
+        self._kaydet(request,r)
+        return r
+
+def adaptor(**kw):
+    return KayitAdaptoru(**kw) if MOD in ("record","replay","conditional") else HTTPAdapter(**kw)
@@ -1,22 +1,11 @@
 import pandas as pd, numpy as np, yaml
+import ara_depo, indikator_motor
 
 def clean_numeric_series(s):
     s = s.astype(str).str.replace(r"[^\d,.-]", "", regex=True).str.replace(",", ".", regex=False)
     s = s.replace("", pd.NA).replace("nan", pd.NA).replace("<NA>", pd.NA)
     return pd.to_numeric(s, errors="coerce")
 
-def align_to_master(df, master_dates, tarih_kolon="Tarih"):
-    if tarih_kolon in df.columns:
-        df[tarih_kolon] = pd.to_datetime(df[tarih_kolon], dayfirst=True, errors="coerce")
-        df = df.dropna(subset=[tarih_kolon]).set_index(tarih_kolon)
-    master_sorted = pd.to_datetime(master_dates, dayfirst=True, errors="coerce").sort_values(ascending=True)
-    df.index = pd.to_datetime(df.index, dayfirst=True, errors="coerce")
-    df = df.reindex(master_sorted)
-    for col in df.columns:
-        ser = df[col]; first_valid = ser.first_valid_index()
-        if first_valid is not None: ser.loc[ser.index < first_valid] = pd.NA; df[col] = ser
-    return df
-
 def normalize(x): 
     if pd.isna(x): return None
     try: return round(float(x),2)
@@ -85,29 +74,19 @@ def hesapla_indikatorler(df,tanimlar):
 def yukle_ayarlar(path="data/indicators.yaml"):
     with open(path,"r",encoding="utf-8") as f: return yaml.safe_load(f)["indikatorler"]
 
+def indikatorler(dfc,dfh,dfl,semboller,durum=None,eksik_hata=False):
+    # eski hisse akışında üç tablodan birinde olmayan sembol atlanıyordu, endeks akışında hata sayılıyordu
+    eksik=[s for s in semboller if s not in dfc.columns or s not in dfh.columns or s not in dfl.columns]
+    if eksik and eksik_hata: raise KeyError(eksik)
+    semboller=[s for s in semboller if s not in eksik]
+    if not semboller: raise ValueError("sembol yok")
+    return indikator_motor.sayfalar(dfc,dfh,dfl,semboller,yukle_ayarlar(),clean_numeric_series,durum=durum)
+
 def main():
     try:
-        xls=pd.ExcelFile("fiyat.xlsx")
-        dfc=pd.read_excel(xls,"Kapanış",index_col=0); dfh=pd.read_excel(xls,"Yüksek",index_col=0); dfl=pd.read_excel(xls,"Düşük",index_col=0)
-        dfc.index=pd.to_datetime(dfc.index,dayfirst=True,errors="raise"); dfh.index=pd.to_datetime(dfh.index,dayfirst=True,errors="raise"); dfl.index=pd.to_datetime(dfl.index,dayfirst=True,errors="raise")
-        master=dfc.index.sort_values(ascending=True)
+        dfc=ara_depo.oku("fiyat","Kapanış"); dfh=ara_depo.oku("fiyat","Yüksek"); dfl=ara_depo.oku("fiyat","Düşük")
         semboller=pd.read_csv("data/dates.csv",encoding="utf-8").iloc[:,1].dropna().unique().tolist()
-        sayfa_df={}
-        for s in semboller:
-            try:
-                dfs=pd.DataFrame({"close":clean_numeric_series(dfc.get(s)),"high":clean_numeric_series(dfh.get(s)),"low":clean_numeric_series(dfl.get(s))},index=master).sort_index(ascending=True)
-                sonuc=hesapla_indikatorler(dfs,yukle_ayarlar())
-                for sa,ser in sonuc.items():
-                    al=align_to_master(ser.to_frame(s),master)
-                    if sa not in sayfa_df: sayfa_df[sa]={}
-                    sayfa_df[sa][s]=al[s]
-            except: pass
-        with pd.ExcelWriter("indicators.xlsx",engine="openpyxl",mode="w") as w:
-            for sa,sd in sayfa_df.items():
-                df_out=pd.concat(sd.values(),axis=1); df_out.columns=list(sd.keys()); df_out.index.name="Tarih"; df_out=df_out.sort_index(ascending=False)
-                # Excel'e yazmadan önce tarih formatını gün.ay.yıl yap
-                df_out.index=pd.to_datetime(df_out.index,dayfirst=True,errors="coerce").strftime("%d.%m.%Y")
-                df_out.to_excel(w,sheet_name=sa)
+        indikator_motor.excele(indikatorler(dfc,dfh,dfl,semboller,durum="hisse"),"indicators.xlsx")
         print("✅ indicators.xlsx oluşturuldu")
     except Exception:
         print("❌ indicators.xlsx oluşturulamadı")
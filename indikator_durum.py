@@ -0,0 +1,61 @@
+import os, json, hashlib, numpy as np, pandas as pd
+import indikator_motor
+
+# Gösterge kontrol noktası: her evren için son tarihteki EMA/ewm/RMA durumları, pencere kuyrukları ve yuvarlanmış
+# sonuç sayfaları DIZIN/<ad>/ altında saklanır; sonraki çalıştırmada sadece yeni tarihler hesaplanıp eklenir.
+# Sonuç tam hesapla birebir aynıdır. Şu durumlarda tam hesaba düşülür:
+#   derlenen plan değişti ya da eski tarihler yeni pencerenin başı değil (500 günlük pencere kaydıysa tüm semboller),
+#   sembolün eski tarihlerdeki fiyatı değişti, sembol yeni ya da EMA'sı henüz başlamamış (sadece o semboller).
+# Kayan pencerede (GUN_SAYISI dolu, her gün en eski tarih düşüyor) her çalıştırma tam hesaptır; bu yüzden
+# isteğe bağlıdır (INDIKATOR_DURUM=1), pencere sadece büyürken (tam geçmiş, geriye dönük doldurma) kazandırır.
+DIZIN=os.environ.get("INDIKATOR_DURUM_DIZIN",".depo/indikator")
+
+def _ozet(c,h,l,T):
+    # sembol başına ilk T satırın (kapanış, yüksek, düşük) özeti; NaN bit desenleri tek tipe indirilir
+    v=np.stack([c[:T],h[:T],l[:T]]); v=np.where(np.isnan(v),np.nan,v)
+    v=np.ascontiguousarray(v.transpose(2,0,1))
+    return np.array([hashlib.blake2b(v[j].tobytes(),digest_size=16).hexdigest() for j in range(v.shape[0])])
+
+def yukle(ad):
+    d=os.path.join(DIZIN,ad)
+    try:
+        with open(os.path.join(d,"meta.json"),encoding="utf-8") as f: meta=json.load(f)
+        with np.load(os.path.join(d,"durum.npz"),allow_pickle=False) as z: durum={k:z[k] for k in z.files}
+        sayfalar={s:np.load(os.path.join(d,f"sayfa{i}.npy"),mmap_mode="r") for i,s in enumerate(meta["sayfalar"])}
+    except (OSError,ValueError,KeyError): return None
+    return meta,durum,sayfalar
+
+def kaydet(ad,meta,durum,sayfalar):
+    d=os.path.join(DIZIN,ad); os.makedirs(d,exist_ok=True); meta=dict(meta,sayfalar=list(sayfalar))
+    def yaz(ad,fn):
+        tmp=os.path.join(d,f".{ad}.{os.getpid()}")
+        with open(tmp,"wb") as f: fn(f)
+        os.replace(tmp,os.path.join(d,ad))
+    for i,v in enumerate(sayfalar.values()): yaz(f"sayfa{i}.npy",lambda f: np.save(f,np.ascontiguousarray(v)))
+    yaz("durum.npz",lambda f: np.savez(f,**durum))
+    yaz("meta.json",lambda f: f.write(json.dumps(meta,ensure_ascii=False).encode("utf-8")))
+
+def hesapla(c,h,l,plan,ad):
+    # c,h,l: indikator_motor.sayfalar'daki hizalı temiz tablolar; dönüş indikator_motor.hesapla ile aynı
+    T,N=c.shape; tarihler=c.index.asi8.tolist(); cv,hv,lv=(x.to_numpy() for x in (c,h,l))
+    tanim=plan.imza(); k=yukle(ad); uzat=np.zeros(N,bool); T0=0
+    if k:
+        meta,eski_durum,eski=k; T0=len(meta["tarihler"])
+        if meta["tanim"]==tanim and T0<=T and tarihler[:T0]==meta["tarihler"]:
+            yer={s:i for i,s in enumerate(meta["semboller"])}; j=np.array([yer.get(s,-1) for s in c.columns],dtype=int)
+            uzat=(j>=0)&(_ozet(cv,hv,lv,T0)==eski_durum["ozet"][j])&eski_durum["hazir"][j]
+    E,F=np.flatnonzero(uzat),np.flatnonzero(~uzat)
+    sonuc={}; durum={}; hazir=np.zeros(N,bool)
+    for kol,onceki,bas in [(F,None,0)]+([(E,{a:v[:,j[E]] for a,v in eski_durum.items() if v.ndim==2},T0)] if len(E) else []):
+        if not len(kol): continue
+        r,akis=indikator_motor.parcali_hesapla(c.iloc[:,kol],h.iloc[:,kol],l.iloc[:,kol],plan,onceki,bas)
+        for s,df in r.items():
+            v=df.to_numpy()
+            if bas: v=np.vstack([eski[s][:,j[kol]],v])
+            sonuc.setdefault(s,np.full((T,N),np.nan))[:,kol]=v
+        for a,v in akis.durum.items(): durum.setdefault(a,np.full((len(v),N),np.nan))[:,kol]=v
+        hazir[kol]=True if akis.hazir is None else akis.hazir
+    durum["ozet"]=_ozet(cv,hv,lv,T); durum["hazir"]=hazir
+    kaydet(ad,{"tanim":tanim,"tarihler":tarihler,"semboller":list(c.columns)},durum,sonuc)
+    print(f"ℹ️ {ad}: {len(E)} sembol kontrol noktasından devam etti ({T-T0} yeni satır), {len(F)} sembol baştan hesaplandı")
+    return {s:pd.DataFrame(v,index=c.index,columns=c.columns) for s,v in sonuc.items()}
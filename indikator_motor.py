@@ -0,0 +1,382 @@
+import os, sys, time, json, hashlib, numpy as np, pandas as pd
+import olcum, cikti, parcali
+
+# indicators.yaml'daki tüm göstergeleri tarih × sembol matrisi üzerinde tek seferde hesaplar.
+# Sonuç indicate.hesapla_indikatorler'in sembol sembol verdiğiyle birebir aynıdır (baştaki NaN'lar dahil):
+# EMA özyinelemesi satır satır bütün sembollerde birlikte yürür, ewm/rolling ise pandas'ın aynı çekirdekleriyle tüm tabloya uygulanır.
+DURUM=os.environ.get("INDIKATOR_DURUM","0").strip().lower() not in ("0","false","no","hayir","")  # kontrol noktası (indikator_durum), varsayılan kapalı
+
+def metin_gibi(v,cevir):
+    # eski akışlar float'ı metne çevirip pandas'la geri okuyordu; kısa yazılan sayılar aynen döner, üslü yazılanlar (1e-05),
+    # çok büyükler ve 6'dan fazla ondalıklılar değişebileceği için sadece onlar cevir(Series)'den geçirilir. v yerinde değişir.
+    with np.errstate(invalid="ignore"): a=np.abs(v); m=np.isfinite(v)&((a>=1e9)|((a<1e-4)&(v!=0))|(np.round(v,6)!=v))
+    if m.any(): v[m]=cevir(pd.Series(v[m])).to_numpy(dtype=float,na_value=np.nan)
+    return v
+
+def temiz(df,temizle):
+    # clean_numeric_series'in tablo hali; sonsuzlar boş olur
+    v=df.to_numpy(dtype=float,copy=True); v[np.isinf(v)]=np.nan
+    return pd.DataFrame(metin_gibi(v,temizle),index=df.index,columns=df.columns)
+
+def yuvarla(v):
+    # normalize() ile aynı (Python round(x,2)); rint(x*100)/100 sadece x*100 bir .5'e çok yakınsa yanılabilir, onlar Python'a bırakılır
+    v=np.asarray(v,dtype=float)
+    with np.errstate(invalid="ignore",over="ignore"):
+        y=v*100; r=np.rint(y)/100
+        m=np.isfinite(v)&((np.abs(y-np.floor(y)-0.5)<1e-6)|(np.abs(y)>=1e9))
+    if m.any(): r[m]=[round(float(x),2) for x in v[m]]
+    return r
+
+def ema_sma(X,n):
+    # ema_with_sma_start: her sembolde ilk n geçerli değerin ortalamasıyla başlar, boşluklarda durum korunur
+    X=np.asarray(X,dtype=float); T,N=X.shape; out=np.full((T,N),np.nan)
+    ok=~np.isnan(X); sira=np.cumsum(ok,axis=0)
+    k=np.flatnonzero(sira[-1]>=n) if T else np.array([],dtype=int)
+    if not len(k): return out
+    ilk=(ok[:,k]&(sira[:,k]<=n)).T
+    # ortalama pandas'ın Series.mean toplama sırasıyla alınır (her sembolün n değeri bitişik satırda)
+    sma=pd.DataFrame(X[:,k].T[ilk].reshape(len(k),n).T).mean().to_numpy()
+    out[np.argmax(sira[:,k]==n,axis=0),k]=sma
+    a=2/(n+1); b=1-a; onceki=np.full(N,np.nan); onceki[k]=sma
+    for t in range(T):
+        m=ok[t]&(sira[t]>n)
+        if m.any(): onceki=np.where(m,a*X[t]+b*onceki,onceki); out[t]=np.where(m,onceki,out[t])
+    return out
+
+class Akis:
+    # Göstergelerin özyinelemeli/pencereli temel işlemleri. onceki yoksa satırlar baştan hesaplanır; verilirse girdi
+    # sadece yeni satırlardır ve her işlem önceki çalıştırmanın son durumundan devam eder. Son durumlar self.durum'a
+    # (ad -> k×N dizi) yazılır; EMA'sı başlamamış semboller hazir=False olur (indikator_durum bunları tam hesaba bırakır).
+    def __init__(self,onceki=None): self.onceki=onceki; self.durum={}; self.hazir=None
+
+    def _hazir(self,m): self.hazir=m if self.hazir is None else self.hazir&m
+
+    def gecikme(self,ad,x):
+        # x.shift(1); ilk satırdan önceki değer önceki çalıştırmanın son satırıdır
+        v=x.to_numpy(dtype=float); once=self.onceki[ad] if self.onceki else np.full((1,v.shape[1]),np.nan)
+        tum=np.vstack([once,v]); self.durum[ad]=tum[-1:]
+        return pd.DataFrame(tum[:-1],index=x.index,columns=x.columns)
+
+    def pencere(self,ad,x,n,fn):
+        # rolling(n,min_periods=n).max()/min(); son n-1 satır devredilir
+        v=x.to_numpy(dtype=float); once=self.onceki[ad] if self.onceki else v[:0]
+        tum=np.vstack([once,v]); self.durum[ad]=tum[max(0,len(tum)-n+1):] if n>1 else tum[:0]
+        r=getattr(pd.DataFrame(tum).rolling(window=n,min_periods=n),fn)().to_numpy()[len(once):]
+        return pd.DataFrame(r,index=x.index,columns=x.columns)
+
+    def ewm(self,ad,x,n,**kw):
+        # x.ewm(adjust=False,min_periods=n,alpha=|span=).mean(); durum: ağırlıklı ortalama, eski ağırlık, gözlem sayısı
+        com=(kw["span"]-1)/2 if "span" in kw else (1-kw["alpha"])/kw["alpha"]; a=1/(1+com); f=1-a
+        v=x.to_numpy(dtype=float); T,N=v.shape; out=np.empty((T,N))
+        if self.onceki is None:
+            w=x.ewm(adjust=False,min_periods=1,**kw).mean().to_numpy(); sayi=np.cumsum(~np.isnan(v),axis=0)
+            out[:]=np.where(sayi>=n,w,np.nan)
+            son_w=w[-1] if T else np.full(N,np.nan); nobs=sayi[-1] if T else np.zeros(N)
+            # son gözlemden sonraki her boş satırda eski ağırlık 1-a ile çarpılır
+            bos=np.argmax(~np.isnan(v[::-1]),axis=0) if T else np.zeros(N,dtype=int); ow=np.ones(N)
+            for r in range(int(bos.max()) if T else 0): ow=np.where(r<bos,ow*f,ow)
+        else:
+            son_w,ow,nobs=self.onceki[ad]
+            for t in range(T):
+                xv=v[t]; obs=~np.isnan(xv); nobs=nobs+obs; var=~np.isnan(son_w)
+                ow=np.where(var,ow*f,ow)
+                with np.errstate(invalid="ignore"): yeni=(ow*son_w+a*xv)/(ow+a)
+                son_w=np.where(var&obs&(son_w!=xv),yeni,np.where(~var&obs,xv,son_w))
+                ow=np.where(var&obs,1.,ow); out[t]=np.where(nobs>=n,son_w,np.nan)
+        self.durum[ad]=np.vstack([son_w,ow,nobs])
+        return pd.DataFrame(out,index=x.index,columns=x.columns)
+
+    def ema(self,ad,x,n):
+        # ema_with_sma_start; devam ederken sembolün ilk n değeri zaten görülmüş olmalı
+        v=x.to_numpy(dtype=float)
+        if self.onceki is None:
+            out=ema_sma(v,n); sayi=np.sum(~np.isnan(v),axis=0)
+            son=pd.DataFrame(out).ffill().to_numpy()[-1] if len(v) else np.full(v.shape[1],np.nan)
+        else:
+            son,sayi=self.onceki[ad]; out=np.full(v.shape,np.nan); a=2/(n+1); b=1-a
+            for t in range(len(v)):
+                m=~np.isnan(v[t]); sayi=sayi+m
+                if m.any(): son=np.where(m,a*v[t]+b*son,son); out[t]=np.where(m,son,np.nan)
+        self.durum[ad]=np.vstack([son,sayi]); self._hazir(sayi>=n)
+        return out
+
+class Plan:
+    # indicators.yaml'dan derlenen işlem grafiği. Düğüm adı işlem+parametre+girdi adlarından kurulur, böylece aynı alt
+    # ifade (ör. MACD ile EMA kaydının ortak EMA'sı, RSI ile DIOSC'un ortak gecikmesi) tek düğüm olur ve bir kez hesaplanır.
+    # Düğümler ekleme sırasıyla tutulur (topolojik); ciktilar: (sayfa, düğüm) yaml sırasıyla.
+    # taramalar: tarama çıktısı -> [(uzunluk, iç sayfa adı)]; iç sayfalar sonda tek yığın sayfada birleşir (yigin)
+    def __init__(self): self.dugumler={}; self.ciktilar=[]; self.taramalar={}
+    def ekle(self,islem,*girdiler,**p):
+        ad=islem+("["+",".join(f"{k}={v}" for k,v in sorted(p.items()))+"]" if p else "")+"("+",".join(girdiler)+")"
+        self.dugumler.setdefault(ad,(islem,p,girdiler)); return ad
+    def fark(self,x): return self.ekle("fark",x,self.ekle("gecikme",x))
+    def cikti(self,sayfa,dugum): self.ciktilar.append((sayfa,dugum))
+    def tarama(self,sayfa,dugum,uzunluklar):
+        # tek düğüm bütün uzunlukları bir geçişte hesaplar; her uzunluk ayrı iç sayfa olarak seçilir
+        for n in uzunluklar:
+            ic=f"{sayfa}[{n}]"; self.cikti(ic,self.ekle("sec",dugum,n=n)); self.taramalar.setdefault(sayfa,[]).append((n,ic))
+    def imza(self): return hashlib.sha1(json.dumps([list(self.dugumler),self.ciktilar],ensure_ascii=False).encode()).hexdigest()
+
+def uzunluklar(q):
+    # length: {from, to, step} tarama sözdizimi; to dahil
+    u=q.get("length")
+    if not isinstance(u,dict): return None
+    ns=tuple(range(int(u["from"]),int(u["to"])+1,int(u.get("step",1))))
+    if not ns or ns[0]<1: raise ValueError(f"geçersiz tarama: {u}")
+    return ns
+
+TARAMALAR={"ema":("ema_t","c"),"rsi":("rsi_t","c"),"bbp_manual":("bbp_t","c"),"williamsr":("wr_t","h","l","c"),"diosc":("diosc_t","h","l","c")}
+
+def derle(tanimlar):
+    p=Plan(); c,h,l="c","h","l"
+    for t in tanimlar:
+        k,q,o=t["kind"],t.get("params",{}),t["output"]
+        if (ns:=uzunluklar(q)) is not None:
+            if k not in TARAMALAR: raise ValueError(f"{k} için uzunluk taraması yok")
+            islem,*girdi=TARAMALAR[k]; p.tarama(o,p.ekle(islem,*girdi,n=ns),ns)
+        elif k=="ema": p.cikti(o,p.ekle("ema",c,n=q.get("length",20)))
+        elif k=="rsi":
+            n=q.get("length",14); d=p.fark(c)
+            p.cikti(o,p.ekle("rsi",p.ekle("rma",p.ekle("artis",d),n=n),p.ekle("rma",p.ekle("azalis",d),n=n)))
+        elif k=="macd":
+            m=p.ekle("fark2",p.ekle("ema",c,n=q.get("fast",12)),p.ekle("ema",c,n=q.get("slow",26)))
+            sig=p.ekle("ewm_span",m,n=q.get("signal",9)); d={"MACD":m,"SIGNAL":sig,"HIST":p.ekle("fark2",m,sig)}
+            if isinstance(o,dict):
+                for src,dst in o.items(): p.cikti(dst,d[src])
+        elif k=="bbp_manual":
+            n=q.get("length",20); p.cikti(o,p.ekle("bbp",c,p.ekle("ort",c,n=n),p.ekle("std",c,n=n),mult=2))
+        elif k=="williamsr":
+            n=q.get("length",14); p.cikti(o,p.ekle("wr",p.ekle("max",h,n=n),p.ekle("min",l,n=n),c))
+        elif k=="diosc":
+            n=q.get("length",14); up,down=p.fark(h),p.ekle("neg",p.fark(l))
+            trr=p.ekle("rma",p.ekle("tr",h,l,p.ekle("gecikme",c)),n=n)
+            arti=p.ekle("oran",p.ekle("rma",p.ekle("yon",up,down),n=n),trr); eksi=p.ekle("oran",p.ekle("rma",p.ekle("yon",down,up),n=n),trr)
+            p.cikti(o,p.ekle("fark2",arti,eksi))
+    return p
+
+def _df(v,x): return pd.DataFrame(v,index=x.index,columns=x.columns)
+
+def _bbp(c,ma,std,mult):
+    up,lo=ma+mult*std,ma-mult*std; return (c-lo)/(up-lo)
+
+# Tarama çekirdekleri: X (T,N), ns L uzunluk; sonuç (L,T,N). Özyinelemeler (L,N) durumla tek zaman döngüsünde,
+# pencere uçları tek seyrek tablodan, pencere ortalama/std kümülatif toplamlardan. EMA/RMA/max/min tek uzunluklu
+# düğümlerle birebir aynıdır; ortalama/std kümülatif toplamdan geldiği için pandas rolling'den son bitlerde ayrılabilir.
+def ema_tarama(X,ns):
+    X=np.asarray(X,dtype=float); T,N=X.shape; L=len(ns); out=np.full((L,T,N),np.nan)
+    ok=~np.isnan(X); sira=np.cumsum(ok,axis=0); n=np.array(ns)[:,None]; onceki=np.full((L,N),np.nan)
+    for i,m in enumerate(ns):
+        # başlangıç ortalaması ema_sma ile aynı yoldan
+        k=np.flatnonzero(sira[-1]>=m) if T else np.array([],dtype=int)
+        if not len(k): continue
+        ilk=(ok[:,k]&(sira[:,k]<=m)).T
+        sma=pd.DataFrame(X[:,k].T[ilk].reshape(len(k),m).T).mean().to_numpy()
+        out[i,np.argmax(sira[:,k]==m,axis=0),k]=sma; onceki[i,k]=sma
+    a=2/(n+1); b=1-a
+    for t in range(T):
+        m=ok[t]&(sira[t]>n)
+        if m.any(): onceki=np.where(m,a*X[t]+b*onceki,onceki); out[:,t]=np.where(m,onceki,out[:,t])
+    return out
+
+def ewm_tarama(X,alfalar,ns):
+    # x.ewm(alpha=a,adjust=False,min_periods=n).mean() her (a, n) için; Akis.ewm devam döngüsünün toplu hali
+    X=np.asarray(X,dtype=float); T,N=X.shape; L=len(ns); out=np.empty((L,T,N))
+    com=(1-np.asarray(alfalar,dtype=float))/np.asarray(alfalar,dtype=float); a=(1/(1+com))[:,None]; f=1-a
+    w=np.full((L,N),np.nan); ow=np.ones((L,N)); nobs=np.zeros(N); n=np.array(ns)[:,None]
+    for t in range(T):
+        xv=X[t]; obs=~np.isnan(xv); nobs=nobs+obs; var=~np.isnan(w)
+        ow=np.where(var,ow*f,ow)
+        with np.errstate(invalid="ignore"): yeni=(ow*w+a*xv)/(ow+a)
+        w=np.where(var&obs&(w!=xv),yeni,np.where(~var&obs,xv,w))
+        ow=np.where(var&obs,1.,ow); out[:,t]=np.where(nobs>=n,w,np.nan)
+    return out
+
+def rma_tarama(X,ns): return ewm_tarama(X,[1/n for n in ns],ns)
+
+def uc_tarama(X,ns,buyuk):
+    # rolling(n,min_periods=n).max()/min(): 2^j uzunluklu blokların uçları bir kez, her pencere örtüşen iki blok
+    X=np.asarray(X,dtype=float); T,N=X.shape; out=np.full((len(ns),T,N),np.nan)
+    fn=np.fmax if buyuk else np.fmin; w=np.where(np.isnan(X),-np.inf if buyuk else np.inf,X)
+    sayi=np.vstack([np.zeros((1,N)),np.cumsum(~np.isnan(X),axis=0)])
+    tablo=[w]
+    while 2**len(tablo)<=min(max(ns),T): d=tablo[-1]; k=2**(len(tablo)-1); tablo.append(fn(d[:-k],d[k:]))
+    for i,n in enumerate(ns):
+        if n>T: continue
+        j=n.bit_length()-1; d=tablo[j]; r=fn(d[:T-n+1],d[n-2**j:T-2**j+1])
+        out[i,n-1:]=np.where(sayi[n:]-sayi[:-n]==n,r,np.nan)
+    return out
+
+def ort_std_tarama(X,ns):
+    # rolling(n,min_periods=n).mean() ve .std(ddof=0); sütunun ilk değeri çıkarılıp toplanır (sayısal kayıp azalsın),
+    # pandas gibi n değerin hepsi aynıysa std tam 0
+    X=np.asarray(X,dtype=float); T,N=X.shape; L=len(ns); ok=~np.isnan(X)
+    x0=X[np.argmax(ok,axis=0),np.arange(N)] if T else np.zeros(N); x0=np.where(np.isnan(x0),0,x0)
+    Y=np.where(ok,X-x0,0.); z=np.zeros((1,N))
+    S,Q,C=(np.vstack([z,np.cumsum(v,axis=0)]) for v in (Y,Y*Y,ok.astype(float)))
+    # aynı değerin art arda kaçıncı kez geldiği
+    esit=np.vstack([np.zeros((1,N),bool),X[1:]==X[:-1]]); sira=np.arange(T)[:,None]
+    ayni=sira-np.maximum.accumulate(np.where(esit,0,sira),axis=0)+1
+    ort,std=np.full((L,T,N),np.nan),np.full((L,T,N),np.nan)
+    for i,n in enumerate(ns):
+        if n>T: continue
+        tam=C[n:]-C[:-n]==n; m=(S[n:]-S[:-n])/n
+        v=np.maximum((Q[n:]-Q[:-n])/n-m*m,0); v[ayni[n-1:]>=n]=0
+        ort[i,n-1:]=np.where(tam,x0+m,np.nan); std[i,n-1:]=np.where(tam,np.sqrt(v),np.nan)
+    return ort,std
+
+def _tarama(ns,v,x):
+    return {n:pd.DataFrame(v[i],index=x.index,columns=x.columns) for i,n in enumerate(ns)}
+
+def _rsi_t(c,ns):
+    d=c-c.shift(1); ag,al=rma_tarama(d.clip(lower=0),ns),rma_tarama(-d.clip(upper=0),ns)
+    with np.errstate(divide="ignore",invalid="ignore"): return _tarama(ns,100-(100/(1+ag/al)),c)
+
+def _bbp_t(c,ns,mult=2):
+    ma,std=ort_std_tarama(c,ns)
+    with np.errstate(divide="ignore",invalid="ignore"): return _tarama(ns,_bbp(c.to_numpy(),ma,std,mult),c)
+
+def _wr_t(h,l,c,ns):
+    hh,ll=uc_tarama(h,ns,True),uc_tarama(l,ns,False)
+    with np.errstate(divide="ignore",invalid="ignore"): return _tarama(ns,(hh-c.to_numpy())/(hh-ll)*-100,c)
+
+def _diosc_t(h,l,c,ns):
+    up,down=h-h.shift(1),-(l-l.shift(1)); oc=c.shift(1)
+    yon=lambda x,y: np.where((x>y)&(x>0),x,0.0)
+    tr=np.fmax(np.fmax((h-l).to_numpy(),(h-oc).abs().to_numpy()),(l-oc).abs().to_numpy())
+    trr,arti,eksi=(rma_tarama(x,ns) for x in (tr,yon(up,down),yon(down,up)))
+    with np.errstate(divide="ignore",invalid="ignore"): return _tarama(ns,100*arti/trr-100*eksi/trr,c)
+
+# her işlem (akis, düğüm adı, parametreler, *girdiler) alır; TAM işlemleri ham girdinin tüm satırlarında çalışır
+# (pencereli toplamların kayan hatası devredilemediği için), sonuçları yeni satırlara kırpılır
+ISLEMLER={
+    "gecikme":lambda a,ad,p,x: a.gecikme(ad,x),
+    "fark":lambda a,ad,p,x,g: x-g,
+    "fark2":lambda a,ad,p,x,y: x-y,
+    "neg":lambda a,ad,p,x: -x,
+    "artis":lambda a,ad,p,x: x.clip(lower=0),
+    "azalis":lambda a,ad,p,x: -x.clip(upper=0),
+    "ema":lambda a,ad,p,x: _df(a.ema(ad,x,p["n"]),x),
+    "rma":lambda a,ad,p,x: a.ewm(ad,x,p["n"],alpha=1/p["n"]),
+    "ewm_span":lambda a,ad,p,x: a.ewm(ad,x,p["n"],span=p["n"]),
+    "max":lambda a,ad,p,x: a.pencere(ad,x,p["n"],"max"),
+    "min":lambda a,ad,p,x: a.pencere(ad,x,p["n"],"min"),
+    "ort":lambda a,ad,p,x: x.rolling(window=p["n"],min_periods=p["n"]).mean(),
+    "std":lambda a,ad,p,x: x.rolling(window=p["n"],min_periods=p["n"]).std(ddof=0),
+    "rsi":lambda a,ad,p,ag,al: 100-(100/(1+ag/al)),
+    "bbp":lambda a,ad,p,c,ma,std: _bbp(c,ma,std,p["mult"]),
+    "wr":lambda a,ad,p,hh,ll,c: (hh-c)/(hh-ll)*-100,
+    "yon":lambda a,ad,p,x,y: _df(np.where((x>y)&(x>0),x,0.0),x),
+    "tr":lambda a,ad,p,h,l,oc: _df(np.fmax(np.fmax((h-l).to_numpy(),(h-oc).abs().to_numpy()),(l-oc).abs().to_numpy()),h),
+    "oran":lambda a,ad,p,x,y: 100*x/y,
+    "ema_t":lambda a,ad,p,x: _tarama(p["n"],ema_tarama(x.to_numpy(),p["n"]),x),
+    "rsi_t":lambda a,ad,p,x: _rsi_t(x,p["n"]),
+    "bbp_t":lambda a,ad,p,x: _bbp_t(x,p["n"]),
+    "wr_t":lambda a,ad,p,h,l,c: _wr_t(h,l,c,p["n"]),
+    "diosc_t":lambda a,ad,p,h,l,c: _diosc_t(h,l,c,p["n"]),
+    "sec":lambda a,ad,p,x: x[p["n"]],
+}
+# taramalar durum devretmez, her çalıştırmada tüm geçmişten hesaplanır
+TAM={"ort","std","ema_t","rsi_t","bbp_t","wr_t","diosc_t"}
+
+def hesapla(kapanis,yuksek,dusuk,tanimlar,akis=None,bas=0):
+    # girdiler aynı (artan) tarih indeksli ve aynı sembol kolonlu temiz tablolar; dönüş {sayfa: tablo}
+    # tanimlar yaml listesi ya da derlenmiş Plan; akis önceki durumla verilirse sadece bas'tan sonraki satırlar döner
+    plan=tanimlar if isinstance(tanimlar,Plan) else derle(tanimlar); a=akis or Akis()
+    tam={"c":kapanis,"h":yuksek,"l":dusuk}; deger={k:v.iloc[bas:] for k,v in tam.items()}
+    def hesap(ad):
+        if ad not in deger:
+            islem,p,g=plan.dugumler[ad]
+            if islem in TAM:
+                r=ISLEMLER[islem](a,ad,p,*[tam[x] for x in g])
+                deger[ad]={n:v.iloc[bas:] for n,v in r.items()} if isinstance(r,dict) else r.iloc[bas:]
+            else: deger[ad]=ISLEMLER[islem](a,ad,p,*[hesap(x) for x in g])
+        return deger[ad]
+    c=deger["c"]; sonuc={}
+    for o,ad in plan.ciktilar:
+        try: sonuc[o]=pd.DataFrame(yuvarla(hesap(ad)),index=c.index,columns=c.columns)
+        except: sonuc[o]=pd.DataFrame(np.nan,index=c.index,columns=c.columns)
+    return sonuc
+
+def _hesap_parcasi(c,h,l,tarihler,plan,bas,semboller,onceki=None):
+    # parcali işçisi: bir sembol bloğunun sayfaları, akış durumları ve hazır maskesi (son eksen sembol)
+    kol=pd.Index(semboller); akis=Akis(onceki)
+    r=hesapla(*(pd.DataFrame(v,index=tarihler,columns=kol) for v in (c,h,l)),plan,akis,bas)
+    sonuc={("sayfa",s):df.to_numpy() for s,df in r.items()}
+    sonuc.update({("durum",a):v for a,v in akis.durum.items()})
+    sonuc["hazir"]=np.ones(len(kol),bool) if akis.hazir is None else akis.hazir
+    return sonuc
+
+def parcali_hesapla(c,h,l,plan,onceki=None,bas=0):
+    # hesapla'nın sembol bloklarına bölünmüş hali (PARCA_ISCI süreç); (sayfalar, sembollerin son durumunu taşıyan Akis)
+    r=parcali.sutunlar(_hesap_parcasi,[c.to_numpy(),h.to_numpy(),l.to_numpy()],c.index,plan,bas,
+                       semboller=np.array(c.columns,dtype=object),onceki=onceki)
+    akis=Akis(onceki); akis.durum={a:v for k,v in r.items() if k[0]=="durum" for a in [k[1]]}; akis.hazir=r["hazir"]
+    return {k[1]:pd.DataFrame(v,index=c.index[bas:],columns=c.columns) for k,v in r.items() if k[0]=="sayfa"},akis
+
+def sayfalar(dfc,dfh,dfl,semboller,tanimlar,temizle,durum=None):
+    # fiyat tablolarını artan tarihe ve istenen sembol sırasına hizalayıp tüm gösterge sayfalarını üretir;
+    # durum adı verilirse kontrol noktasından devam edilir (indikator_durum)
+    master=dfc.index.sort_values(ascending=True); kol=pd.Index(semboller)
+    c,h,l=(temiz(pd.DataFrame(d.reindex(index=master,columns=kol).to_numpy(),index=master,columns=kol),temizle) for d in (dfc,dfh,dfl))
+    plan=derle(tanimlar)
+    with olcum.asama(f"{durum or 'indikator'}/indikator_hesap",sembol=len(kol),gun=len(master),sayfa=len(plan.ciktilar)):
+        if durum and DURUM:
+            import indikator_durum  # indikator_durum bu modülü kullanır; döngü olmasın diye burada
+            sonuc=indikator_durum.hesapla(c,h,l,plan,durum)
+        else: sonuc=parcali_hesapla(c,h,l,plan)[0]
+    return yigin(sonuc,plan)
+
+def yigin(sonuc,plan):
+    # tarama iç sayfaları (uzunluk başına tarih x sembol) tek sayfada (Tarih, Uzunluk) satırlarıyla birleşir; yaml sırası korunur
+    ic={ad:o for o,u in plan.taramalar.items() for _,ad in u}; out={}
+    for s,df in sonuc.items():
+        if s not in ic: out[s]=df; continue
+        o=ic[s]
+        if o in out: continue
+        u=plan.taramalar[o]; v=np.stack([sonuc[ad].to_numpy() for _,ad in u],axis=1)
+        idx=pd.MultiIndex.from_product([df.index,[n for n,_ in u]],names=["Tarih","Uzunluk"])
+        out[o]=pd.DataFrame(v.reshape(-1,v.shape[2]),index=idx,columns=df.columns)
+    return out
+
+def excele(sonuc,xlsx):
+    sayfalar={}
+    for sa,df in sonuc.items():
+        # tarama sayfası: tarih azalan, her tarihte uzunluk artan; uzunluk ilk sütun
+        if isinstance(df.index,pd.MultiIndex): df=df.sort_index(level=[0,1],ascending=[False,True]).reset_index(level=1)
+        else: df=df.sort_index(ascending=False)
+        df.index=df.index.strftime("%d.%m.%Y"); df.index.name="Tarih"; sayfalar[sa]=df
+    cikti.yaz(xlsx,sayfalar,index=True)
+
+def sentetik(N,T,tohum=0):
+    # rastgele yürüyüş fiyatlar; semboller farklı günlerde işleme başlar, bazıları en uzun pencereden kısa
+    rng=np.random.default_rng(tohum); idx=pd.bdate_range("2020-01-01",periods=T)
+    c=100*np.exp(np.cumsum(rng.normal(0,0.02,(T,N)),axis=0)); h=c*(1+rng.uniform(0,0.03,(T,N))); l=c*(1-rng.uniform(0,0.03,(T,N)))
+    bas=rng.integers(0,T,N); bas[:N//2]=0; yok=np.arange(T)[:,None]<bas
+    kol=[f"S{i:04d}" for i in range(N)]
+    return [pd.DataFrame(np.where(yok,np.nan,np.round(x,2)),index=idx,columns=kol) for x in (c,h,l)]
+
+if __name__=="__main__":
+    # eşlik ve ölçek testi: python indikator_motor.py [sembol sayısı] [gün sayısı] [yaml]
+    import indicate
+    N=int(sys.argv[1]) if len(sys.argv)>1 else 3000; T=int(sys.argv[2]) if len(sys.argv)>2 else 500
+    tanimlar=indicate.yukle_ayarlar(*sys.argv[3:4]); c,h,l=sentetik(N,T); plan=derle(tanimlar)
+    tekil=[t for t in tanimlar if uzunluklar(t.get("params",{})) is None]
+    print(f"plan: {len(tanimlar)} tanım, {len(plan.ciktilar)} sayfa, {len(plan.dugumler)} düğüm")
+    t0=time.perf_counter(); sonuc=hesapla(c,h,l,plan); t1=time.perf_counter()
+    orn=list(c.columns[::max(1,N//100)]); hata=0
+    for s in orn:
+        ref=indicate.hesapla_indikatorler(pd.DataFrame({"close":c[s],"high":h[s],"low":l[s]}),tekil)
+        for sa,ser in ref.items():
+            hata+=not np.array_equal(pd.to_numeric(ser).to_numpy(dtype=float),sonuc[sa][s].to_numpy(),equal_nan=True)
+    t2=time.perf_counter()
+    print(f"matris: {N} sembol × {T} gün {t1-t0:.2f}s | sembol sembol: {(t2-t1)/len(orn)*N:.1f}s (tahmini, {len(orn)} örnekten)")
+    # taramanın her uzunluğu tek uzunluklu tanımla aynı olmalı
+    for t in tanimlar:
+        if t in tekil: continue
+        ns=[n for n,_ in plan.taramalar[t["output"]]]; t3=time.perf_counter()
+        tek=hesapla(c,h,l,[{**t,"params":{**t["params"],"length":n},"output":n} for n in ns]); t4=time.perf_counter()
+        fark=sum(not np.array_equal(tek[n].to_numpy(),sonuc[ic].to_numpy(),equal_nan=True) for n,ic in plan.taramalar[t["output"]])
+        print(f"tarama {t['output']}: {len(ns)} uzunluk, tek tek {t4-t3:.2f}s, {fark} farklı")
+        hata+=fark
+    print(("✅" if not hata else "❌"),f"{len(orn)} sembolde {hata} farklı seri")
+    sys.exit(1 if hata else 0)
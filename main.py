@@ -1,7 +1,8 @@
-import requests,pandas as pd,json,os
-from bs4 import BeautifulSoup
-from collections import defaultdict
-from tarih_ayar import secili_tarihleri_bul
+import pandas as pd,json,os,argparse
+from tarih_ayar import takvim
+import cekici,gun_deposu,fiyat_tablo,ara_depo,olcum
+from uzun_tablo import UzunTablo
+from tablo_ayikla import ilk_tablo
 
 def temizle_sayi(s):
     s=str(s).strip()
@@ -20,56 +21,40 @@ def temizle_hacim(s):
     except: return None
 
 BASE_URL=json.loads(os.environ["MAIN"])["DATA_SOURCE_URL"]
+OTURUM=cekici.oturum()
+KAYNAK=gun_deposu.kaynak_adi("hisse",BASE_URL)
 
 def fiyat_hacim_tek_gun(g,a,y):
-    try:
-        r=requests.get(f"{BASE_URL}?gun={g}&ay={a}&yil={y}&tip=Hisse",headers={'User-Agent':'Mozilla/5.0'},timeout=10)
-        r.raise_for_status()
-    except: return []
-    soup=BeautifulSoup(r.text,'html.parser'); t=soup.find('table')
-    if not t: return []
-    ts=f"{g:02d}.{a:02d}.{y}"
-    return [{"Tarih":ts,"Hisse":c[0],"Kapanış":temizle_sayi(c[1]),"Yüksek":temizle_sayi(c[4]),"Düşük":temizle_sayi(c[5]),"Hacim(Lot)":temizle_hacim(c[7])}
-            for c in ([td.get_text(strip=True) for td in tr.find_all('td')] for tr in t.find_all('tr')[1:])
-            if len(c)>=9 and temizle_sayi(c[1])]
+    r=cekici.getir(OTURUM,f"{BASE_URL}?gun={g}&ay={a}&yil={y}&tip=Hisse",timeout=10)
+    if r is None: return []
+    with olcum.sure("hisse/ayristirma"):
+        t=ilk_tablo(r.text)
+        if t is None: return []
+        ts=f"{g:02d}.{a:02d}.{y}"
+        return [{"Tarih":ts,"Hisse":c[0],"Kapanış":k,"Yüksek":temizle_sayi(c[4]),"Düşük":temizle_sayi(c[5]),"Hacim(Lot)":temizle_hacim(c[7])}
+                for c in t[1] if len(c)>=9 and (k:=temizle_sayi(c[1]))]
+
+def gunluk_satirlar(secili,yenile=0):
+    db=gun_deposu.ac(); eksik=gun_deposu.eksik_tarihler(db,KAYNAK,secili,yenile)
+    with olcum.asama("hisse/indirme",gun=len(eksik)):
+        gun_deposu.yaz(db,KAYNAK,dict(zip(eksik,cekici.paralel(lambda t: fiyat_hacim_tek_gun(*map(int,t.split("."))),eksik))))
+    tum=UzunTablo("Hisse",{"Kapanış":"f8","Yüksek":"f8","Düşük":"f8","Hacim(Lot)":"i8"}); sayi={}
+    for t,s in gun_deposu.gez(db,KAYNAK,secili): tum.ekle(s,t); sayi[t]=len(s)
+    db.close()
+    for t in secili: olcum.gun("hisse",t,sayi.get(t,0))
+    return tum
 
-try:
-    df_csv=pd.read_csv("data/dates.csv",encoding="utf-8")
-    secili=secili_tarihleri_bul(df_csv["Tarih"].dropna().tolist())
-    takip=df_csv.iloc[:,1].dropna().unique().tolist()
-    tum=[v for t in secili for v in fiyat_hacim_tek_gun(*map(int,t.split(".")))]
-    vg=defaultdict(list); [vg[v["Tarih"]].append(v) for v in tum]
-    ilk={}; [ilk.setdefault(v["Hisse"],pd.to_datetime(v["Tarih"],dayfirst=True)) for v in tum]
-    hisseler=sorted({v["Hisse"] for v in tum}); onceki={}; final=[]
-    for t in secili:
-        td=pd.to_datetime(t,dayfirst=True); gv={v["Hisse"]:v for v in vg.get(t,[])}; sat=[]
-        for h in hisseler:
-            if h in gv: sat.append(gv[h])
-            elif h in onceki and td>=ilk[h]: k=onceki[h].copy(); k["Tarih"]=t; sat.append(k)
-        onceki.update(gv); final.extend(sat)
-    df=pd.DataFrame(final)
-    def pivotla(df,kolon,takip,tarih,haftalik=False):
-        df["Tarih"]=pd.to_datetime(df["Tarih"],dayfirst=True,errors="coerce")
-        df=df[df["Tarih"].isin(pd.to_datetime(tarih,dayfirst=True))].dropna(subset=["Tarih","Hisse",kolon])
-        df[kolon]=df[kolon].apply(temizle_sayi)
-        if haftalik:
-            df["Hafta"]=df["Tarih"].dt.to_period("W"); df["Gun"]=df["Tarih"].dt.dayofweek; tercih=[4,3,2,1,0]; haftalik=[]
-            for h,g in df.groupby("Hafta"):
-                for gun in tercih:
-                    s=g[g["Gun"]==gun]
-                    if not s.empty: haftalik.append(s); break
-            if not haftalik: return pd.DataFrame()
-            df=pd.concat(haftalik)
-        p=df.pivot_table(index="Tarih",columns="Hisse",values=kolon,aggfunc="first").ffill()
-        p=p[[h for h in p.columns if h in takip]]
-        return p.sort_index(ascending=False).sort_index(axis=1)
-    tablolar={c:pivotla(df,c,takip,secili) for c in ["Kapanış","Yüksek","Düşük","Hacim(Lot)"]}
-    haftalik=pivotla(df,"Kapanış",takip,secili,haftalik=True)
-    with pd.ExcelWriter("fiyat.xlsx",engine="openpyxl") as w:
-        for c,p in tablolar.items():
-            p.index=p.index.strftime("%d.%m.%Y"); p.to_excel(w,sheet_name=c)
-        if not haftalik.empty:
-            haftalik.index=haftalik.index.strftime("%d.%m.%Y"); haftalik.to_excel(w,sheet_name="Haftalik_Kapanis")
-    print("✅ fiyat.xlsx oluşturuldu")
-except Exception:
-    print("❌ fiyat.xlsx oluşturulamadı")
+def fiyat_sayfalari(tum,takip,secili):
+    tablolar,donemler=fiyat_tablo.pivotlar(tum,"Hisse",["Kapanış","Yüksek","Düşük","Hacim(Lot)"],takip,secili,temizle_sayi)
+    return {**tablolar,**{ad:p for ad,p in donemler.items() if not p.empty}}
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser(); ap.add_argument("--refresh-days",type=int,default=0); args=ap.parse_args()
+    try:
+        df_csv=pd.read_csv("data/dates.csv",encoding="utf-8")
+        secili=takvim().secili()
+        takip=df_csv.iloc[:,1].dropna().unique().tolist()
+        ara_depo.kaydet("fiyat",fiyat_sayfalari(gunluk_satirlar(secili,args.refresh_days),takip,secili),"fiyat.xlsx")
+        print("✅ fiyat.xlsx oluşturuldu" if ara_depo.EXCEL else "✅ fiyat ara deposu yazıldı (ARA_EXCEL=0, fiyat.xlsx yazılmadı)")
+    except Exception:
+        print("❌ fiyat.xlsx oluşturulamadı")
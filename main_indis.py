@@ -1,7 +1,8 @@
-import requests,pandas as pd,json,os
-from bs4 import BeautifulSoup
-from collections import defaultdict
-from tarih_ayar import secili_tarihleri_bul
+import pandas as pd,json,os,argparse
+from tarih_ayar import takvim
+import cekici,gun_deposu,fiyat_tablo,ara_depo,olcum
+from uzun_tablo import UzunTablo
+from tablo_ayikla import ilk_tablo
 
 def temizle_sayi(s):
     s=str(s).strip()
@@ -13,16 +14,20 @@ def temizle_sayi(s):
     except:return None
 
 BASE_URL=json.loads(os.environ["MAININDIS"])["DATA_SOURCE_URL"]
+OTURUM=cekici.oturum()
+KAYNAK=gun_deposu.kaynak_adi("endeks",BASE_URL)
 
 def kapanis_tek_gun(g,a,y):
-    try:r=requests.get(f"{BASE_URL}&gun={g}&ay={a}&yil={y}",headers={"User-Agent":"Mozilla/5.0"},timeout=10);r.raise_for_status()
-    except:return []
-    t=BeautifulSoup(r.text,"html.parser").find("table")
-    if not t:return []
-    headers=[h.get_text(strip=True) for h in t.find_all("tr")[0].find_all(["th","td"])]
+    r=cekici.getir(OTURUM,f"{BASE_URL}&gun={g}&ay={a}&yil={y}",timeout=10)
+    if r is None:return []
+    with olcum.sure("endeks/ayristirma"):return satirlar(r.text,g,a,y)
+
+def satirlar(html,g,a,y):
+    t=ilk_tablo(html)
+    if t is None:return []
+    headers,govde=t
     ts=f"{g:02d}.{a:02d}.{y}";rows=[]
-    for tr in t.find_all("tr")[1:]:
-        c=[td.get_text(strip=True) for td in tr.find_all("td")]
+    for c in govde:
         if len(c)!=len(headers):continue
         r=dict(zip(headers,c))
         rows.append({"Tarih":ts,"Endeks":r.get("Menkul Adı") or r.get("Endeks"),
@@ -31,37 +36,27 @@ def kapanis_tek_gun(g,a,y):
                      "Düşük":temizle_sayi(r.get("Düşük"))})
     return rows
 
-try:
-    df_csv=pd.read_csv("data/dates.csv",encoding="utf-8")
-    secili=secili_tarihleri_bul(df_csv["Tarih"].dropna().tolist())
-    takip=df_csv.iloc[:,2].dropna().unique().tolist()
-    tum=[v for t in secili for v in kapanis_tek_gun(*map(int,t.split(".")))]
-    vg=defaultdict(list);[vg[v["Tarih"]].append(v) for v in tum]
-    ilk={};[ilk.setdefault(v["Endeks"],pd.to_datetime(v["Tarih"],dayfirst=True)) for v in tum]
-    endeksler=sorted({v["Endeks"] for v in tum});onceki={};final=[]
-    for t in secili:
-        td=pd.to_datetime(t,dayfirst=True);gv={v["Endeks"]:v for v in vg.get(t,[])};sat=[]
-        for e in endeksler:
-            if e in gv:sat.append(gv[e])
-            elif e in onceki and td>=ilk[e]:k=onceki[e].copy();k["Tarih"]=t;sat.append(k)
-        onceki.update(gv);final.extend(sat)
-    df=pd.DataFrame(final)
-    def pivotla(df,kolon,takip,tarih,haftalik=False):
-        df["Tarih"]=pd.to_datetime(df["Tarih"],dayfirst=True,errors="coerce")
-        df=df[df["Tarih"].isin(pd.to_datetime(tarih,dayfirst=True))].dropna(subset=["Tarih","Endeks",kolon]);df[kolon]=df[kolon].apply(temizle_sayi)
-        if haftalik:
-            df["Hafta"]=df["Tarih"].dt.to_period("W");df["Gun"]=df["Tarih"].dt.dayofweek;tercih=[4,3,2,1,0];haftalik=[]
-            for h,g in df.groupby("Hafta"):
-                for gun in tercih:
-                    s=g[g["Gun"]==gun]
-                    if not s.empty:haftalik.append(s);break
-            if not haftalik:return pd.DataFrame()
-            df=pd.concat(haftalik)
-        p=df.pivot_table(index="Tarih",columns="Endeks",values=kolon,aggfunc="first").ffill()
-        return p[[e for e in p.columns if e in takip]].sort_index(ascending=False).sort_index(axis=1)
-    kapanis,yuksek,dusuk,haftalik=(pivotla(df,"Kapanış",takip,secili),pivotla(df,"Yüksek",takip,secili),pivotla(df,"Düşük",takip,secili),pivotla(df,"Kapanış",takip,secili,haftalik=True))
-    with pd.ExcelWriter("main_indis_fiyat.xlsx",engine="openpyxl") as w:
-        for n,t in {"Kapanis":kapanis,"Yuksek":yuksek,"Dusuk":dusuk}.items():t.index=t.index.strftime("%d.%m.%Y");t.to_excel(w,sheet_name=n)
-        if not haftalik.empty:haftalik.index=haftalik.index.strftime("%d.%m.%Y");haftalik.to_excel(w,sheet_name="Haftalik_Kapanis")
-    print("✅ main_indis_fiyat.xlsx oluşturuldu")
-except Exception as e:print("❌ main_indis_fiyat.xlsx oluşturulamadı:",e)
+def gunluk_satirlar(secili,yenile=0):
+    db=gun_deposu.ac();eksik=gun_deposu.eksik_tarihler(db,KAYNAK,secili,yenile)
+    with olcum.asama("endeks/indirme",gun=len(eksik)):gun_deposu.yaz(db,KAYNAK,dict(zip(eksik,cekici.paralel(lambda t:kapanis_tek_gun(*map(int,t.split("."))),eksik))))
+    tum=UzunTablo("Endeks",{"Kapanış":"f8","Yüksek":"f8","Düşük":"f8"});sayi={}
+    for t,s in gun_deposu.gez(db,KAYNAK,secili):tum.ekle(s,t);sayi[t]=len(s)
+    db.close()
+    for t in secili:olcum.gun("endeks",t,sayi.get(t,0))
+    return tum
+
+def fiyat_sayfalari(tum,takip,secili):
+    p,donemler=fiyat_tablo.pivotlar(tum,"Endeks",["Kapanış","Yüksek","Düşük"],takip,secili,temizle_sayi)
+    sayfalar={"Kapanis":p["Kapanış"],"Yuksek":p["Yüksek"],"Dusuk":p["Düşük"]}
+    sayfalar.update({ad:t for ad,t in donemler.items() if not t.empty})
+    return sayfalar
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser();ap.add_argument("--refresh-days",type=int,default=0);args=ap.parse_args()
+    try:
+        df_csv=pd.read_csv("data/dates.csv",encoding="utf-8")
+        secili=takvim().secili()
+        takip=df_csv.iloc[:,2].dropna().unique().tolist()
+        ara_depo.kaydet("indis_fiyat",fiyat_sayfalari(gunluk_satirlar(secili,args.refresh_days),takip,secili),"main_indis_fiyat.xlsx")
+        print("✅ main_indis_fiyat.xlsx oluşturuldu" if ara_depo.EXCEL else "✅ indis_fiyat ara deposu yazıldı (ARA_EXCEL=0, main_indis_fiyat.xlsx yazılmadı)")
+    except Exception as e:print("❌ main_indis_fiyat.xlsx oluşturulamadı:",e)
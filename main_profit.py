@@ -1,49 +1,129 @@
-import pandas as pd, numpy as np
-
-try:
-    df=pd.read_excel("fiyat.xlsx")
-    for col in df.columns:
-        if col!="Tarih":
-            df[col]=df[col].astype(str).str.replace(",",".",regex=False).replace("",None)
-            df[col]=pd.to_numeric(df[col],errors="coerce")
-    df["Tarih"]=pd.to_datetime(df["Tarih"],dayfirst=True,errors="coerce")
-    df=df.sort_values("Tarih")
-    today=df["Tarih"].max(); today_str=today.strftime("%d.%m.%Y")
-
-    def find_nearest_open(series,target_date):
-        valid=series.index[series.index<=target_date]
-        return valid.max() if len(valid)>0 else None
-    def safe_div(a,b):
-        return np.nan if b is None or pd.isna(b) or b==0 else (a/b-1)*100
-    def compute_returns(df,col,today,today_str):
-        s=df.set_index("Tarih")[col].astype(float)
-        if today not in s.index or pd.isna(s.loc[today]):
-            return [today_str,col,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan,np.nan]
-        fiyat_today=s.loc[today]
-        d=find_nearest_open(s,today-pd.DateOffset(days=1)); daily=safe_div(fiyat_today,s.loc[d]) if d is not None else np.nan
-        w=find_nearest_open(s,today-pd.DateOffset(weeks=1)); weekly=safe_div(fiyat_today,s.loc[w]) if w is not None else np.nan
-        m=find_nearest_open(s,today-pd.DateOffset(months=1)); monthly=safe_div(fiyat_today,s.loc[m]) if m is not None else np.nan
-        sm=find_nearest_open(s,today-pd.DateOffset(months=6)); semi=safe_div(fiyat_today,s.loc[sm]) if sm is not None else np.nan
-        y=find_nearest_open(s,today-pd.DateOffset(years=1)); yearly=safe_div(fiyat_today,s.loc[y]) if y is not None else np.nan
-        year_start=today-pd.DateOffset(years=1); mask=(s.index>=year_start)&(s.index<=today)
-        if mask.sum()==0: year_low,year_high,max_gain_loss,tl_konum=np.nan,np.nan,np.nan,np.nan
-        else:
-            year_low,year_high=s.loc[mask].min(),s.loc[mask].max()
-            low_date,high_date=s.loc[mask].idxmin(),s.loc[mask].idxmax()
-            max_gain_loss=np.nan if pd.isna(year_low) or pd.isna(year_high) or year_low==0 else \
-                (year_high/year_low-1)*100 if low_date<high_date else (year_low/year_high-1)*100
-            tl_konum=np.nan if pd.isna(year_low) or pd.isna(year_high) or year_high==year_low else \
-                (fiyat_today-year_low)/(year_high-year_low)*100
-        return [today_str,col,fiyat_today,daily,weekly,monthly,semi,yearly,year_low,year_high,max_gain_loss,tl_konum]
-
-    results={col:compute_returns(df,col,today,today_str) for col in df.columns if col!="Tarih"}
-    returns_table=pd.DataFrame.from_dict(results,orient="index",
-        columns=["Tarih","Hisse Kodu","Fiyat","Günlük%","Haftalık%","Aylık%","6 Aylık%","Yıllık%",
-                 "Yıl Düşük","Yıl Yüksek","Max Kar/Zarar","TL Konum"])
-    for c in returns_table.columns[2:]:
-        returns_table[c]=pd.to_numeric(returns_table[c],errors="coerce").round(2)
-    returns_table.reset_index(drop=True,inplace=True)
-    returns_table.to_excel("profit.xlsx",index=False,engine="openpyxl")
-    print("✅ profit.xlsx yazıldı")
-except:
-    print("❌ profit.xlsx yazılamadı")
+import argparse, pandas as pd, numpy as np
+import ara_depo, indikator_motor, olcum, cikti, parcali
+
+KOLONLAR=["Tarih","Hisse Kodu","Fiyat","Günlük%","Haftalık%","Aylık%","6 Aylık%","Yıllık%",
+          "Yıl Düşük","Yıl Yüksek","Max Kar/Zarar","TL Konum"]
+UFUKLAR=[("Günlük%",pd.DateOffset(days=1)),("Haftalık%",pd.DateOffset(weeks=1)),("Aylık%",pd.DateOffset(months=1)),
+         ("6 Aylık%",pd.DateOffset(months=6)),("Yıllık%",pd.DateOffset(years=1))]
+
+def sayisal(df):
+    # eski akış her sütunu metne çevirip pd.to_numeric ile geri okuyordu (indikator_motor.metin_gibi)
+    def metinden(s): return pd.to_numeric(s.astype(str).str.replace(",",".",regex=False).replace("",None),errors="coerce")
+    if not all(pd.api.types.is_float_dtype(t) for t in df.dtypes):
+        return np.column_stack([metinden(df[c]).to_numpy(dtype=float,na_value=np.nan) for c in df.columns]) if len(df.columns) else np.empty((len(df),0))
+    return indikator_motor.metin_gibi(df.to_numpy(dtype=float,copy=True),metinden)
+
+def matris(kapanis):
+    # (semboller, artan tarih ekseni, tarih x sembol fiyat matrisi); tarihi okunamayan satırlar atılır
+    df=kapanis.reset_index(); semboller=[c for c in df.columns if c!="Tarih"]
+    tarih=pd.to_datetime(df["Tarih"],dayfirst=True,errors="coerce"); v=sayisal(df[semboller])
+    gecerli=tarih.notna().to_numpy(); sira=np.argsort(tarih.to_numpy()[gecerli],kind="stable")
+    return semboller,pd.DatetimeIndex(tarih.to_numpy()[gecerli][sira]),v[gecerli][sira]
+
+def getiri_tablosu(kapanis):
+    # büyük evrende sembol blokları PARCA_ISCI süreçte hesaplanır (parcali)
+    semboller,tarihler,v=matris(kapanis)
+    return pd.DataFrame(parcali.sutunlar(_getiri_parcasi,[v],tarihler,semboller=np.array(semboller,dtype=object)),columns=KOLONLAR)
+
+def _getiri_parcasi(v,tarihler,semboller):
+    t=_getiri(list(semboller),tarihler,v); return {c:t[c].to_numpy() for c in KOLONLAR}
+
+def _getiri(semboller,tarihler,v):
+    # tüm semboller tek matriste: her ufuk için ortak tarih ekseninde bir searchsorted, 1 yıllık uçlar sütun sütun
+    today=tarihler[-1]; fiyat=v[-1]; N=len(semboller); bos=np.full(N,np.nan)
+    sonuc={"Tarih":today.strftime("%d.%m.%Y"),"Hisse Kodu":semboller,"Fiyat":fiyat}
+    with np.errstate(divide="ignore",invalid="ignore"):
+        for ad,ofs in UFUKLAR:
+            # hedef tarihten önceki son işlem günü; o günün fiyatı boşsa getiri de boş
+            i=tarihler.searchsorted(today-ofs,side="right")-1; b=v[i] if i>=0 else bos
+            sonuc[ad]=np.where(np.isnan(b)|(b==0),np.nan,(fiyat/b-1)*100)
+        yil=v[tarihler.searchsorted(today-pd.DateOffset(years=1),side="left"):]
+        dusuk,yuksek,kar=bos.copy(),bos.copy(),bos.copy(); k=~np.isnan(fiyat)
+        if k.any():
+            y=yil[:,k]; dusuk[k]=np.nanmin(y,0); yuksek[k]=np.nanmax(y,0)
+            once=np.nanargmin(y,0)<np.nanargmax(y,0)
+            kar[k]=np.where(dusuk[k]==0,np.nan,np.where(once,(yuksek[k]/dusuk[k]-1)*100,(dusuk[k]/yuksek[k]-1)*100))
+        sonuc.update({"Yıl Düşük":dusuk,"Yıl Yüksek":yuksek,"Max Kar/Zarar":kar,
+                      "TL Konum":np.where(yuksek==dusuk,np.nan,(fiyat-dusuk)/(yuksek-dusuk)*100)})
+    returns_table=pd.DataFrame(sonuc,columns=KOLONLAR)
+    # bugünün fiyatı olmayan sembolün bütün satırı boş
+    returns_table.loc[np.isnan(fiyat),KOLONLAR[2:]]=np.nan
+    for c in KOLONLAR[2:]: returns_table[c]=returns_table[c].round(2)
+    return returns_table
+
+GECMIS_SAYFALAR={"Gunluk":"Günlük%","Haftalik":"Haftalık%","Aylik":"Aylık%","6Aylik":"6 Aylık%","Yillik":"Yıllık%",
+                 "TL_Konum":"TL Konum","Max_Kar_Zarar":"Max Kar/Zarar","Yil_Dusuk":"Yıl Düşük","Yil_Yuksek":"Yıl Yüksek"}
+
+UC_BELLEK=64<<20  # pencere_ucu'nun seyrek tablosu için sütun bloğu başına bayt üst sınırı
+
+def pencere_ucu(v,bas,buyuk=False):
+    # her i satırı için [bas[i], i] aralığında NaN atlanarak en küçük (buyuk=True ise en büyük) değer ve ilk konumu.
+    # Seyrek tablo ~log2(T) kat yer tuttuğu için sütunlar bellek sınırına göre bloklara bölünür (sütunlar bağımsız)
+    T,N=v.shape; blok=max(1,UC_BELLEK//(max(T,1)*max(T,1).bit_length()*12))
+    u=np.empty(v.shape); i=np.empty(v.shape,dtype=np.int64)
+    for a in range(0,N,blok): u[:,a:a+blok],i[:,a:a+blok]=_pencere_ucu(v[:,a:a+blok],bas,buyuk)
+    return u,i
+
+def _pencere_ucu(v,bas,buyuk):
+    # seyrek tablo: 2^k uzunluklu blokların uçları bir kez hesaplanır, her aralık örtüşen iki bloğun birleşimidir
+    T=len(v); w=np.where(np.isnan(v),np.inf,-v if buyuk else v)
+    deger=[w]; konum=[np.broadcast_to(np.arange(T,dtype=np.int32)[:,None],v.shape)]; k=1
+    while 2*k<=T:
+        d,p=deger[-1],konum[-1]; sag=d[k:]<d[:-k]
+        deger.append(np.where(sag,d[k:],d[:-k])); konum.append(np.where(sag,p[k:],p[:-k])); k*=2
+    son=np.arange(T); L=np.array([int(n).bit_length()-1 for n in son-bas+1])
+    u=np.empty_like(w); i=np.empty(v.shape,dtype=np.int64)
+    for l in np.unique(L):
+        r=np.flatnonzero(L==l); a,b=bas[r],son[r]-(1<<l)+1
+        sag=deger[l][b]<deger[l][a]
+        u[r]=np.where(sag,deger[l][b],deger[l][a]); i[r]=np.where(sag,konum[l][b],konum[l][a])
+    u[np.isinf(u)]=np.nan
+    return (-u if buyuk else u),i
+
+def getiri_gecmisi(kapanis):
+    semboller,tarihler,v=matris(kapanis)
+    r=parcali.sutunlar(_gecmis_parcasi,[v],tarihler,semboller=np.array(semboller,dtype=object))
+    return {sa:pd.DataFrame(r[sa],index=pd.Index(tarihler,name="Tarih"),columns=semboller) for sa in GECMIS_SAYFALAR}
+
+def _gecmis_parcasi(v,tarihler,semboller):
+    return {sa:df.to_numpy() for sa,df in _gecmis(list(semboller),tarihler,v).items()}
+
+def _gecmis(semboller,tarihler,v):
+    # getiri_tablosu'nun her tarih için sonucu (o tarihe kadar kesilmiş tabloyla çalıştırılmış gibi), tek seferde:
+    # ufuk başına kaydırılmış searchsorted, 1 yıllık uçlar değişken pencereli seyrek tabloyla
+    sonuc={}
+    with np.errstate(divide="ignore",invalid="ignore"):
+        for ad,ofs in UFUKLAR:
+            j=tarihler.searchsorted(tarihler-ofs,side="right")-1
+            b=np.where((j>=0)[:,None],v[np.maximum(j,0)],np.nan)
+            sonuc[ad]=np.where(np.isnan(b)|(b==0),np.nan,(v/b-1)*100)
+        bas=tarihler.searchsorted(tarihler-pd.DateOffset(years=1),side="left")
+        (dusuk,i_dusuk),(yuksek,i_yuksek)=pencere_ucu(v,bas),pencere_ucu(v,bas,buyuk=True)
+        sonuc["Max Kar/Zarar"]=np.where(dusuk==0,np.nan,np.where(i_dusuk<i_yuksek,(yuksek/dusuk-1)*100,(dusuk/yuksek-1)*100))
+        sonuc["TL Konum"]=np.where(yuksek==dusuk,np.nan,(v-dusuk)/(yuksek-dusuk)*100)
+        sonuc["Yıl Düşük"],sonuc["Yıl Yüksek"]=dusuk,yuksek
+    idx=pd.Index(tarihler,name="Tarih")
+    # o günün fiyatı olmayan sembolün o günkü bütün ölçütleri boş
+    return {sa:pd.DataFrame(np.where(np.isnan(v),np.nan,sonuc[k]),index=idx,columns=semboller).round(2) for sa,k in GECMIS_SAYFALAR.items()}
+
+def main(ara="fiyat",sayfa="Kapanış",xlsx="profit.xlsx"):
+    ap=argparse.ArgumentParser(); ap.add_argument("--gecmis",action="store_true",help="her tarih için ölçütleri ölçüt başına bir sayfa olarak yaz")
+    args=ap.parse_args()
+    if args.gecmis:
+        xlsx=xlsx.replace(".xlsx","_gecmis.xlsx")
+        try:
+            with olcum.asama(f"{ara}/getiri_gecmisi"): sonuc=getiri_gecmisi(ara_depo.oku(ara,sayfa))
+            ara_depo.yaz(xlsx[:-5],sonuc)
+            if ara_depo.EXCEL: indikator_motor.excele(sonuc,xlsx)
+            print(f"✅ {xlsx} yazıldı")
+        except Exception as e:
+            print(f"❌ {xlsx} yazılamadı: {e}")
+        return
+    try:
+        with olcum.asama(f"{ara}/getiri"): tablo=getiri_tablosu(ara_depo.oku(ara,sayfa))
+        cikti.yaz(xlsx,{"Sheet1":tablo})
+        print(f"✅ {xlsx} yazıldı")
+    except:
+        print(f"❌ {xlsx} yazılamadı")
+
+if __name__=="__main__": main()
@@ -0,0 +1,118 @@
+import os, sys, json, time, atexit, bisect, threading, contextlib
+from datetime import datetime
+from urllib.parse import urlsplit
+try: import resource
+except ImportError: resource=None
+
+# Çalışma ölçümü: aşama süreleri, HTTP gecikme/durum/bayt dağılımları, gün başına satır sayıları, toplanan süreler
+# (ayrıştırma vb.) ve tepe bellek tek raporda toplanır, süreç biterken OLCUM_DIZIN/<betik>.json'a yazılır.
+# Rapordaki durum: "hata" bir aşama patladıysa, "kismi" boş dönen gün ya da başarısız istek varsa, değilse "ok".
+# OLCUM_PROFIL=<aşama adı> o aşamayı cProfile ile (OLCUM_PROFIL_ARAC=pyinstrument ise pyinstrument ile) profiller.
+ACIK=os.environ.get("OLCUM","1").strip().lower() not in ("0","false","no","hayir")
+DIZIN=os.environ.get("OLCUM_DIZIN","olcum")
+PROFIL=os.environ.get("OLCUM_PROFIL","")
+PROFIL_ARAC=os.environ.get("OLCUM_PROFIL_ARAC","cprofile")
+GECIKME_MS=[50,100,250,500,1000,2500,5000,10000]
+BAYT=[1<<10,1<<14,1<<17,1<<20,1<<23]
+BETIK=os.path.splitext(os.path.basename(sys.argv[0] if sys.argv and sys.argv[0] else ""))[0] or "etkilesimli"
+
+_kilit=threading.Lock(); _bas=time.time()
+_asamalar,_http,_gunler,_sureler,_sayaclar=[],{},{},{},{}
+
+def tepe_rss_mb():
+    if resource is None: return None
+    r=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(r/2**20 if sys.platform=="darwin" else r/1024,1)
+
+def _profil_bas(ad):
+    if not PROFIL or ad!=PROFIL: return None
+    if PROFIL_ARAC=="pyinstrument":
+        try:
+            from pyinstrument import Profiler
+            p=Profiler(); p.start(); return p
+        except ImportError: print("⚠️ pyinstrument yok, cProfile kullanılıyor")
+    import cProfile
+    p=cProfile.Profile()
+    try: p.enable()
+    except ValueError: return None  # başka bir profilleyici açık
+    return p
+
+def _profil_bitir(p,ad):
+    if p is None: return
+    os.makedirs(DIZIN,exist_ok=True); yol=os.path.join(DIZIN,f"{BETIK}.{ad.replace('/','_')}")
+    if hasattr(p,"dump_stats"): p.disable(); yol+=".prof"; p.dump_stats(yol)
+    else:
+        p.stop(); yol+=".html"
+        with open(yol,"w",encoding="utf-8") as f: f.write(p.output_html())
+    print(f"ℹ️ {ad} profili: {yol}")
+
+@contextlib.contextmanager
+def asama(ad,**bilgi):
+    # süre, sonuç ve tepe RSS kaydı; dönen sözlüğe satır sayısı gibi bilgiler eklenebilir, durum "atlandi" yapılabilir
+    kayit={"ad":ad,"thread":threading.current_thread().name,"baslangic_sn":round(time.time()-_bas,3),**bilgi}
+    p=_profil_bas(ad); t=time.perf_counter()
+    try:
+        yield kayit
+        kayit.setdefault("durum","ok")
+    except BaseException as e:
+        kayit["durum"]="hata"; kayit["hata"]=f"{type(e).__name__}: {e}"[:500]; raise
+    finally:
+        kayit["sure_sn"]=round(time.perf_counter()-t,4); kayit["tepe_rss_mb"]=tepe_rss_mb(); _profil_bitir(p,ad)
+        with _kilit: _asamalar.append(kayit)
+
+def sure_ekle(ad,sn):
+    with _kilit:
+        s=_sureler.setdefault(ad,{"adet":0,"toplam_sn":0.0,"en_uzun_sn":0.0})
+        s["adet"]+=1; s["toplam_sn"]+=sn; s["en_uzun_sn"]=max(s["en_uzun_sn"],sn)
+
+@contextlib.contextmanager
+def sure(ad):
+    # sık tekrarlanan kısa işlerin (gün başına ayrıştırma gibi) toplam süresi
+    t=time.perf_counter()
+    try: yield
+    finally: sure_ekle(ad,time.perf_counter()-t)
+
+def http(url,durum,sn=None,bayt=None):
+    # durum: HTTP kodu ya da istisna adı
+    host=urlsplit(url).netloc
+    with _kilit:
+        h=_http.setdefault(host,{"istek":0,"durum":{},"gecikme":[0]*(len(GECIKME_MS)+1),"ms":[],"bayt":0,"bayt_dagilimi":[0]*(len(BAYT)+1)})
+        h["istek"]+=1; h["durum"][str(durum)]=h["durum"].get(str(durum),0)+1
+        if sn is not None: ms=sn*1000; h["ms"].append(ms); h["gecikme"][bisect.bisect_left(GECIKME_MS,ms)]+=1
+        if bayt is not None: h["bayt"]+=bayt; h["bayt_dagilimi"][bisect.bisect_left(BAYT,bayt)]+=1
+
+def gun(kaynak,tarih,satir):
+    with _kilit: _gunler.setdefault(kaynak,{})[tarih]=satir
+
+def sayac(ad,n=1):
+    with _kilit: _sayaclar[ad]=_sayaclar.get(ad,0)+n
+
+def _yuzdelik(v,q):
+    v=sorted(v); return round(v[min(len(v)-1,int(q*len(v)))],1) if v else None
+
+def rapor():
+    with _kilit:
+        http={}
+        for host,h in _http.items():
+            etiket=lambda sinirlar,birim: [f"<={s}{birim}" for s in sinirlar]+[f">{sinirlar[-1]}{birim}"]
+            http[host]={"istek":h["istek"],"durum":dict(h["durum"]),"bayt":h["bayt"],
+                        "gecikme_ms":{"p50":_yuzdelik(h["ms"],.5),"p95":_yuzdelik(h["ms"],.95),"en_uzun":_yuzdelik(h["ms"],1),
+                                      "dagilim":dict(zip(etiket(GECIKME_MS,"ms"),h["gecikme"]))},
+                        "bayt_dagilimi":dict(zip(etiket(BAYT,"B"),h["bayt_dagilimi"]))}
+        gunler={k:{"gun":len(g),"satir":sum(g.values()),"bos":sorted(t for t,n in g.items() if not n),"gunluk":dict(g)} for k,g in _gunler.items()}
+        basarisiz=sum(n for h in _http.values() for d,n in h["durum"].items() if not (d.isdigit() and int(d)<400))
+        durum=("hata" if any(a["durum"]=="hata" for a in _asamalar) else
+               "kismi" if basarisiz or any(g["bos"] for g in gunler.values()) else "ok")
+        return {"betik":BETIK,"arguman":sys.argv[1:],"baslangic":datetime.fromtimestamp(_bas).isoformat(timespec="seconds"),
+                "sure_sn":round(time.time()-_bas,3),"tepe_rss_mb":tepe_rss_mb(),"durum":durum,
+                "asamalar":list(_asamalar),"sureler":{k:{**s,"toplam_sn":round(s["toplam_sn"],4),"en_uzun_sn":round(s["en_uzun_sn"],4)} for k,s in _sureler.items()},
+                "http":http,"gunler":gunler,"sayaclar":dict(_sayaclar)}
+
+def yaz(yol=None):
+    if not (_asamalar or _http or _gunler): return None
+    yol=yol or os.path.join(DIZIN,f"{BETIK}.json"); os.makedirs(os.path.dirname(yol) or ".",exist_ok=True)
+    with open(yol,"w",encoding="utf-8") as f: json.dump(rapor(),f,ensure_ascii=False,indent=1)
+    return yol
+
+# süreç havuzu işçileri (spawn ile __mp_main__) kendi raporunu yazmaz
+if ACIK and __import__("multiprocessing").parent_process() is None: atexit.register(yaz)
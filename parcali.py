@@ -0,0 +1,77 @@
+import os, gc, math, multiprocessing
+import numpy as np
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+import olcum
+
+# Sütun (sembol) bağımsız hesapları süreç havuzunda sütun bloklarına böler. Girdi matrisleri bir kez paylaşılan
+# belleğe konur, işçiler kendi bloğunu kopyalamadan görür; sayısal sonuçlar da işçinin açtığı paylaşılan bellekle
+# döner, ana süreç bunları yerine kopyalar. DataFrame'ler süreçler arasında taşınmaz (pickle edilmez).
+# Her sütun ayrı hesaplandığı için sonuç tek süreçteki hesapla birebir aynıdır.
+ISCI=int(os.environ.get("PARCA_ISCI",os.cpu_count() or 1))  # süreç sayısı; 1 ise bölünmez
+BLOK=int(os.environ.get("PARCA_BLOK","0"))  # blok başına sütun; 0 ise sütunlar ISCI bloğa eşit bölünür
+ESIK=int(os.environ.get("PARCA_ESIK","2000000"))  # bundan az hücreli (tarih x sembol) girdide süreç açılmaz
+
+def _paylas(v):
+    # dizi sütun bloklarına bitişik olsun diye devrik (N x T) saklanır
+    m=shared_memory.SharedMemory(create=True,size=max(v.nbytes,1))
+    np.ndarray(v.shape[::-1],v.dtype,m.buf)[:]=v.T
+    return m,(m.name,v.shape,v.dtype.str)
+
+def _kapat(m):
+    gc.collect()
+    try: m.close()
+    except BufferError: pass  # işçide hâlâ görünüm varsa eşleme süreç bitince kalkar
+
+def _bol(x,a,b):
+    # son ekseni sembol olan diziler (ve onların sözlükleri) bloğa kesilir
+    if isinstance(x,dict): return {k:_bol(v,a,b) for k,v in x.items()}
+    return x[...,a:b] if isinstance(x,np.ndarray) else x
+
+def _is(fn,tanimlar,a,b,ek,bolunecek):
+    # işçi: paylaşılan girdilerden [a,b) sütunları; bolunecek ana süreçte bloğa kesilmiş gelir
+    bellek=[shared_memory.SharedMemory(name=ad) for ad,_,_ in tanimlar]
+    try:
+        diziler=[np.ndarray(sekil[::-1],tur,m.buf)[a:b].T for m,(_,sekil,tur) in zip(bellek,tanimlar)]
+        sonuc=fn(*diziler,*ek,**bolunecek); del diziler
+        giden={}
+        for k,v in sonuc.items():
+            v=np.asarray(v)
+            if v.dtype.kind in "biuf" and v.nbytes:
+                m=shared_memory.SharedMemory(create=True,size=v.nbytes); np.ndarray(v.shape,v.dtype,m.buf)[:]=v
+                giden[k]=("bellek",m.name,v.shape,v.dtype.str); m.close()
+            else: giden[k]=("deger",v)
+        del sonuc
+        return giden
+    finally:
+        for m in bellek: _kapat(m)
+
+def _al(t):
+    if t[0]=="deger": return t[1]
+    m=shared_memory.SharedMemory(name=t[1])
+    try: return np.array(np.ndarray(t[2],t[3],m.buf))
+    finally: _kapat(m); m.unlink()
+
+def bloklar(N,isci=None,blok=None):
+    isci=ISCI if isci is None else isci; blok=blok or BLOK or math.ceil(N/max(isci,1))
+    return [(a,min(a+blok,N)) for a in range(0,N,max(blok,1))]
+
+def sutunlar(fn,diziler,*ek,isci=None,blok=None,**bolunecek):
+    # fn(*T x n dizi parçaları,*ek,**bolunecek'in bloğa kesilmişi) -> {ad: son ekseni n olan dizi};
+    # dönüş bloklar sırayla son eksende birleştirilmiş {ad: dizi}. fn modül düzeyinde tanımlı olmalı (spawn).
+    isci=ISCI if isci is None else isci; T,N=diziler[0].shape
+    parcalar=bloklar(N,isci,blok)
+    if isci<=1 or len(parcalar)<2 or T*N<ESIK: return {k:np.asarray(v) for k,v in fn(*diziler,*ek,**bolunecek).items()}
+    paylasilan=[_paylas(np.ascontiguousarray(v,dtype=float)) for v in diziler]
+    olcum.sayac("parcali/blok",len(parcalar))
+    try:
+        with ProcessPoolExecutor(min(isci,len(parcalar)),mp_context=multiprocessing.get_context("spawn")) as ex:
+            isler=[ex.submit(_is,fn,[t for _,t in paylasilan],a,b,ek,_bol(bolunecek,a,b)) for a,b in parcalar]
+        hatalar=[f.exception() for f in isler]
+        # başarılı işçilerin açtığı bellek hata olsa da alınıp bırakılır
+        alinan=[{k:_al(t) for k,t in f.result().items()} for f,h in zip(isler,hatalar) if h is None]
+    finally:
+        for m,_ in paylasilan: _kapat(m); m.unlink()
+    for h in hatalar:
+        if h is not None: raise h
+    return {k:np.concatenate([r[k] for r in alinan],axis=-1) for k in alinan[0]}
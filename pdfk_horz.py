@@ -1,74 +1,55 @@
-import pandas as pd, numpy as np, os
-from tarih_ayar import secili_tarihleri_bul
+import pandas as pd, numpy as np
+from tarih_ayar import takvim
+import ara_depo, olcum, cikti
 
 df_dates=pd.read_csv("data/dates.csv",encoding="utf-8")
 codes=df_dates.iloc[:,1].dropna().astype(str).str.strip().str.upper().tolist()
-tarih_list=df_dates.iloc[:,0].dropna().astype(str).str.strip().tolist()
-master_dates=secili_tarihleri_bul(tarih_list)
+master_gunler=takvim().pencere(); master_dates=takvim().metin(master_gunler)
 
-if not os.path.exists("pdfk_vert.xlsx"): raise FileNotFoundError("❌ pdfk_vert.xlsx bulunamadı. Önce vert script çalışmalı.")
-df_src=pd.read_excel("pdfk_vert.xlsx",engine="openpyxl")
+if not ara_depo.var("pdfk_vert","Sheet1"): raise FileNotFoundError("❌ pdfk_vert ara deposu bulunamadı. Önce vert script çalışmalı.")
+df_src=ara_depo.oku("pdfk_vert","Sheet1")
 df_src.columns=df_src.columns.str.strip()
 df_src["Hisse_Kodu"]=df_src["Hisse_Kodu"].astype(str).str.strip().str.upper()
 df_src["Tarih"]=pd.to_datetime(df_src["Tarih"].astype(str),format="%d.%m.%Y",errors="coerce")
 
 latest_values,pivot_tables={},{}
 
-def create_pivot(df,col,dtype="int"):
-    p=pd.pivot_table(df,index="Tarih",columns="Hisse_Kodu",values=col,aggfunc="first")
-    p=p.reindex(pd.to_datetime(master_dates,dayfirst=True))
-    for c in codes:
-        if c not in p.columns: p[c]=np.nan
-    p=p[codes].ffill().replace([np.inf,-np.inf],pd.NA)
-    if dtype=="int": p=p.round().astype("Int64")
+# Vertical’den gelen Pd/Fk kaldırıldı, sadece temel kolonlar pivotlanıyor
+KOLONLAR=[("Ozkaynak","int"),("Sermaye","int"),("Aktifler","int"),("Netborc","int"),("Yillik_Kar","int"),
+          ("Ozkarlilik","float2"),("Aktifkarlilik","float2")]
+
+# tüm kolonlar tek groupby ile (Tarih, Hisse) başına ilk dolu değer, sonra bir kez master tarihlere ve kodlara hizalanır
+hizali=df_src.groupby(["Tarih","Hisse_Kodu"])[[c for c,_ in KOLONLAR]].first().unstack("Hisse_Kodu").reindex(master_gunler)
+
+def create_pivot(col,dtype="int"):
+    p=hizali[col].reindex(columns=codes).rename_axis(None,axis=1).ffill().replace([np.inf,-np.inf],pd.NA)
+    if dtype=="int":
+        # sütun sütun astype("Int64") yerine tek yuvarlama, sonra maskeli tam sayı dizileri
+        v=np.round(p.to_numpy(dtype=float,na_value=np.nan)); bos=~np.isfinite(v); v[bos]=0; v=v.astype(np.int64)
+        p=pd.DataFrame({i:pd.arrays.IntegerArray(v[:,i],bos[:,i]) for i in range(v.shape[1])},index=p.index).set_axis(p.columns,axis=1)
     elif dtype=="float2": p=p.round(2).astype(float)
     elif dtype=="float5": p=p.round(5).astype(float)
-    last=p.tail(1)
-    latest_values[col]={"Tarih":last.index[0].strftime("%d.%m.%Y"),"Veriler":last.iloc[0].to_dict()}
-    out=p.reset_index().rename(columns={"index":"Tarih"})
-    out["Tarih"]=pd.to_datetime(out["Tarih"],errors="coerce")
-    out=out.sort_values("Tarih",ascending=False)
-    out["Tarih"]=out["Tarih"].dt.strftime("%d.%m.%Y")
-    pivot_tables[col]=out
-
-# Vertical’den gelen Pd/Fk kaldırıldı, sadece temel kolonlar pivotlanıyor
-for col,dtype in [
-    ("Ozkaynak","int"),("Sermaye","int"),("Aktifler","int"),("Netborc","int"),("Yillik_Kar","int"),
-    ("Ozkarlilik","float2"),("Aktifkarlilik","float2")
-]: create_pivot(df_src,col,dtype)
+    latest_values[col]={"Tarih":p.index[-1].strftime("%d.%m.%Y"),"Veriler":p.iloc[-1].to_dict()}
+    return p
 
-# 🔹 Pd/Fk hesaplamaları horizontal aşamada pivotlardan yapılacak
-sermaye_last = latest_values["Sermaye"]["Veriler"]  # her hisse için en güncel sermaye
-ozkaynak_pivot = pivot_tables["Ozkaynak"].set_index("Tarih")
-yillikkar_pivot = pivot_tables["Yillik_Kar"].set_index("Tarih")
+def tablo(p):
+    out=p.sort_index(ascending=False); out.index=out.index.strftime("%d.%m.%Y")
+    return out.rename_axis("Tarih").reset_index()
 
-# Pd_Carpan pivotu
-pd_carpan = ozkaynak_pivot.copy()
-for h in codes:
-    sermaye_val = sermaye_last.get(h, np.nan)
-    pd_carpan[h] = np.where(
-        (ozkaynak_pivot[h].notna()) & (ozkaynak_pivot[h] != 0),
-        (sermaye_val / ozkaynak_pivot[h]).round(5),
-        np.nan
-    )
-pd_carpan = pd_carpan.reset_index().copy()
-pd_carpan["Tarih"] = pd.to_datetime(pd_carpan["Tarih"], dayfirst=True, errors="coerce").dt.strftime("%d.%m.%Y")
-pivot_tables["Pd_Carpan"] = pd_carpan
-latest_values["Pd_Carpan"]={"Tarih":pd_carpan.iloc[0]["Tarih"],"Veriler":pd_carpan.iloc[0].to_dict()}
+with olcum.asama("pdfk_horz/pivot",kolon=len(KOLONLAR),gun=len(master_dates)):
+    hizali_pivotlar={col:create_pivot(col,dtype) for col,dtype in KOLONLAR}
+    pivot_tables.update({col:tablo(p) for col,p in hizali_pivotlar.items()})
 
-# Fk_Carpan pivotu
-fk_carpan = yillikkar_pivot.copy()
-for h in codes:
-    sermaye_val = sermaye_last.get(h, np.nan)
-    fk_carpan[h] = np.where(
-        (yillikkar_pivot[h].notna()) & (yillikkar_pivot[h] != 0),
-        (sermaye_val / yillikkar_pivot[h]).round(5),
-        np.nan
-    )
-fk_carpan = fk_carpan.reset_index().copy()
-fk_carpan["Tarih"] = pd.to_datetime(fk_carpan["Tarih"], dayfirst=True, errors="coerce").dt.strftime("%d.%m.%Y")
-pivot_tables["Fk_Carpan"] = fk_carpan
-latest_values["Fk_Carpan"]={"Tarih":fk_carpan.iloc[0]["Tarih"],"Veriler":fk_carpan.iloc[0].to_dict()}
+# 🔹 Pd/Fk horizontal aşamada pivotlardan: her hisse için en güncel sermaye / o günkü değer, tek matris işlemiyle
+sermaye_last=hizali_pivotlar["Sermaye"].iloc[-1].to_numpy(dtype=float,na_value=np.nan)
+def carpan(p):
+    v=p.to_numpy(dtype=float,na_value=np.nan)
+    with np.errstate(divide="ignore",invalid="ignore"): r=np.round(sermaye_last/v,5)
+    r[np.isnan(v)|(v==0)]=np.nan
+    return pd.DataFrame(r,index=p.index,columns=p.columns)
+for ad,kaynak in [("Pd_Carpan","Ozkaynak"),("Fk_Carpan","Yillik_Kar")]:
+    p=carpan(hizali_pivotlar[kaynak]); pivot_tables[ad]=tablo(p)
+    latest_values[ad]={"Tarih":latest_values[kaynak]["Tarih"],"Veriler":p.iloc[-1].to_dict()}
 
 def safe(x): 
     return "" if pd.isna(x) or (isinstance(x,float) and np.isinf(x)) else (
@@ -76,28 +57,30 @@ def safe(x):
     )
 
 artifact="pdfk_horz.xlsx"
-with pd.ExcelWriter(artifact,engine="openpyxl") as w:
-    [df.to_excel(w,sheet_name=name[:30],index=False) for name,df in pivot_tables.items()]
+sayfalar={name[:30]:df for name,df in pivot_tables.items()}
 
-    # 🔹 Son_Tarihli_Oranlar sheet pivotlardan son satır mantığıyla hazırlanıyor
-    rows=[]; last_date=latest_values["Sermaye"]["Tarih"]
-    for h in codes:
-        subset=df_src[(df_src["Hisse_Kodu"]==h)&(df_src["Tarih"]==pd.to_datetime(last_date,format="%d.%m.%Y",errors="coerce"))]
-        msci_val=subset["Msci"].iloc[0] if not subset.empty else ""
-        rows.append([last_date,h,
-            safe(latest_values["Pd_Carpan"]["Veriler"].get(h,"")),
-            safe(latest_values["Fk_Carpan"]["Veriler"].get(h,"")),
-            msci_val,
-            safe(latest_values["Sermaye"]["Veriler"].get(h,"")),
-            safe(latest_values["Ozkaynak"]["Veriler"].get(h,"")),
-            safe(latest_values["Aktifler"]["Veriler"].get(h,"")),
-            safe(latest_values["Netborc"]["Veriler"].get(h,"")),
-            safe(latest_values["Yillik_Kar"]["Veriler"].get(h,"")),
-            safe(latest_values["Aktifkarlilik"]["Veriler"].get(h,"")),
-            safe(latest_values["Ozkarlilik"]["Veriler"].get(h,""))])
-    pd.DataFrame(rows,columns=[
-        "Tarih","Hisse_Kodu","Pd_Carpan","Fk_Carpan","Msci",
-        "Sermaye","Ozkaynak","Aktifler","Netborc","Yillik_Kar",
-        "Aktifkarlilik","Ozkarlilik"]).to_excel(w,sheet_name="Son_Tarihli_Oranlar",index=False)
+# 🔹 Son_Tarihli_Oranlar sheet pivotlardan son satır mantığıyla hazırlanıyor
+rows=[]; last_date=latest_values["Sermaye"]["Tarih"]
+# son tarihin satırları bir kez seçilir; hisse başına ilk satırın Msci'si
+son=df_src[df_src["Tarih"]==pd.to_datetime(last_date,format="%d.%m.%Y",errors="coerce")].drop_duplicates("Hisse_Kodu")
+msci=dict(zip(son["Hisse_Kodu"],son["Msci"]))
+for h in codes:
+    msci_val=msci.get(h,"")
+    rows.append([last_date,h,
+        safe(latest_values["Pd_Carpan"]["Veriler"].get(h,"")),
+        safe(latest_values["Fk_Carpan"]["Veriler"].get(h,"")),
+        msci_val,
+        safe(latest_values["Sermaye"]["Veriler"].get(h,"")),
+        safe(latest_values["Ozkaynak"]["Veriler"].get(h,"")),
+        safe(latest_values["Aktifler"]["Veriler"].get(h,"")),
+        safe(latest_values["Netborc"]["Veriler"].get(h,"")),
+        safe(latest_values["Yillik_Kar"]["Veriler"].get(h,"")),
+        safe(latest_values["Aktifkarlilik"]["Veriler"].get(h,"")),
+        safe(latest_values["Ozkarlilik"]["Veriler"].get(h,""))])
+sayfalar["Son_Tarihli_Oranlar"]=pd.DataFrame(rows,columns=[
+    "Tarih","Hisse_Kodu","Pd_Carpan","Fk_Carpan","Msci",
+    "Sermaye","Ozkaynak","Aktifler","Netborc","Yillik_Kar",
+    "Aktifkarlilik","Ozkarlilik"])
+cikti.yaz(artifact,sayfalar)
 
 print("✅ Artifact oluşturuldu:",artifact)
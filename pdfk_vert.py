@@ -1,43 +1,88 @@
-import requests, pandas as pd, numpy as np
+import pandas as pd, numpy as np
 from io import BytesIO
-from datetime import datetime
-import os
-from tarih_ayar import secili_tarihleri_bul
+import os, time, argparse, multiprocessing, openpyxl
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from openpyxl.cell.cell import ERROR_CODES
+from tarih_ayar import takvim
+import cekici, ara_depo, olcum, cikti
+from uzun_tablo import UzunTablo, KATEGORI
 
 BASE_URL = os.environ.get("PDFK")
+OTURUM = cekici.oturum(headers=None)
+ISLEMCI = int(os.environ.get("PDFK_ISLEMCI", os.cpu_count() or 1))  # ayrıştırma süreç sayısı
+KOLONLAR = ["Tarih","Hisse_Kodu","Msci","Ozkaynak","Sermaye","Aktifler","Netborc","Yillik_Kar"]
+TURLER = {"Msci":KATEGORI,**{k:"f8" for k in KOLONLAR[3:]}}
+# pd.read_excel'in boş saydığı hücreler: boş, hata hücresi ve varsayılan NA metinleri
+NA_METIN = {"", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+            "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"}
+BOS = NA_METIN | set(ERROR_CODES)
 
-def parse_excel(url, tarih, hedef):
-    r = requests.get(url, timeout=15); r.raise_for_status()
-    df = pd.read_excel(BytesIO(r.content), header=None); rows = []
-    for j in range(len(df)):
-        kod = str(df.iat[j,1]).strip().upper()
-        if not kod or kod == "NAN" or kod not in hedef: continue
-        rows.append({
-            "Tarih": tarih, "Hisse_Kodu": kod,
-            "Msci": "MSCI" if pd.notna(df.iat[j,6]) else "",
-            "Ozkaynak": df.iat[j,7], "Sermaye": df.iat[j,8],
-            "Aktifler": df.iat[j,9], "Netborc": df.iat[j,14],
-            "Yillik_Kar": df.iat[j,17]
-        })
-    return pd.DataFrame(rows)
+def bos(x): return x is None or (isinstance(x,str) and x in BOS) or (isinstance(x,float) and np.isnan(x))
+
+def excel_hali(df):
+    # ara depodaki sayısal tablo -> eskiden yazılan pdfk_vert.xlsx biçimi (tutarlar tam sayı metni, boş Msci "")
+    df = df.copy(); df["Msci"] = df["Msci"].fillna("")
+    for col in ["Ozkaynak","Sermaye","Aktifler","Netborc","Yillik_Kar"]:
+        df[col] = df[col].apply(lambda x: "" if pd.isna(x) else str(int(x)))
+    return df
+
+def indir(url):
+    r = OTURUM.get(url, timeout=15); r.raise_for_status(); return r.content
+
+def parse_excel(icerik, tarih, hedef):
+    # ilk sayfa read-only akışla okunur, sadece B..R sütunları çözülür; hedefteki bütün kodlar bulununca durulur
+    # (aynı kodun sonraki satırları zaten drop_duplicates ile atılıyordu). Sonuç kolon listeleri olarak döner.
+    wb = openpyxl.load_workbook(BytesIO(icerik), read_only=True, data_only=True, keep_links=False)
+    out = {k: [] for k in KOLONLAR}; kalan = set(hedef)
+    try:
+        ws = wb.worksheets[0]
+        ws.reset_dimensions()  # dosyadaki <dimension> eskiyse read-only akış satır kaçırır (pandas da böyle yapar)
+        for c in ws.iter_rows(min_col=2, max_col=18, values_only=True):
+            if bos(c[0]): continue
+            kod = str(int(c[0]) if isinstance(c[0], float) and c[0].is_integer() else c[0]).strip().upper()
+            if not kod or kod not in hedef: continue
+            for k, v in zip(KOLONLAR, (tarih, kod, "" if bos(c[5]) else "MSCI", c[6], c[7], c[8], c[13], c[16])):
+                out[k].append(None if k not in ("Tarih","Hisse_Kodu","Msci") and bos(v) else v)
+            kalan.discard(kod)
+            if not kalan: break
+    finally: wb.close()
+    return out
+
+def ayristir(icerik, tarih, hedef):
+    # süreç havuzunda çalışır; süre ana sürecin ölçüm raporuna eklenmek üzere sonuçla döner
+    t = time.perf_counter(); out = parse_excel(icerik, tarih, hedef)
+    return out, time.perf_counter() - t
 
 def main():
+    ap = argparse.ArgumentParser(); ap.add_argument("--excel", action="store_true", help="indirmeden, ara depodan pdfk_vert.xlsx üret")
+    if ap.parse_args().excel:
+        cikti.yaz("pdfk_vert.xlsx", {"Sheet1": excel_hali(ara_depo.oku("pdfk_vert", "Sheet1"))})
+        print("✅ Artifact oluşturuldu: pdfk_vert.xlsx"); return
     df_dates = pd.read_csv("data/dates.csv", encoding="utf-8")
-    tarih_list = df_dates.iloc[:,0].dropna().astype(str).str.strip().tolist()
     codes = df_dates.iloc[:,1].dropna().astype(str).str.strip().str.upper().tolist()
 
-    secili = secili_tarihleri_bul(tarih_list)
+    gunler = takvim().pencere(); secili = takvim().metin(gunler)
 
-    dfs = []
-    for d in secili:
-        url = f"{BASE_URL}/ZRY Göstergeler-{datetime.strptime(d,'%d.%m.%Y').strftime('%Y_%m_%d')}.xlsx"
-        try:
-            df = parse_excel(url, d, set(codes))
-            if not df.empty: dfs.append(df)
-        except Exception as e: print(f"Excel okunamadı ({d}): hata: {e}")
-    if not dfs: raise ValueError("❌ Hiç veri bulunamadı, pdfk_vert.xlsx oluşturulamadı.")
+    # indirmeler thread havuzunda, biten dosya hemen süreç havuzunda ayrıştırılır; sonuçlar tarih sırasıyla kolonlara eklenir
+    hedef = frozenset(codes); sonuc = {}
+    with olcum.asama("pdfk_vert/indirme", gun=len(secili)), ThreadPoolExecutor(max(cekici.ISCI,1)) as indirici, \
+         ProcessPoolExecutor(max(ISLEMCI,1), mp_context=multiprocessing.get_context("spawn")) as ayristirici:
+        indirmeler = {indirici.submit(indir, f"{BASE_URL}/ZRY Göstergeler-{g.strftime('%Y_%m_%d')}.xlsx"): d for d,g in zip(secili, gunler)}
+        for f in as_completed(indirmeler):
+            d = indirmeler[f]
+            try: sonuc[d] = ayristirici.submit(ayristir, f.result(), d, hedef)
+            except Exception as e: sonuc[d] = e
+        tampon = UzunTablo("Hisse_Kodu", TURLER)
+        for d in secili:
+            try:
+                if isinstance(sonuc[d], Exception): raise sonuc[d]
+                parca, sure = sonuc[d].result(); olcum.sure_ekle("pdfk_vert/ayristirma", sure)
+                olcum.gun("pdfk", d, len(parca["Tarih"]))
+                if parca["Tarih"]: tampon.ekle_sutunlar(parca, d)
+            except Exception as e: olcum.gun("pdfk", d, 0); print(f"Excel okunamadı ({d}): hata: {e}")
+    if not len(tampon): raise ValueError("❌ Hiç veri bulunamadı, pdfk_vert.xlsx oluşturulamadı.")
 
-    df_final = pd.concat(dfs, ignore_index=True)
+    df_final = tampon.frame(kategori=False)
     df_final["Hisse_Kodu"] = df_final["Hisse_Kodu"].str.strip().str.upper()
     df_final = df_final[df_final["Hisse_Kodu"].isin(set(codes))].drop_duplicates(subset=["Tarih","Hisse_Kodu"])
 
@@ -49,16 +94,18 @@ def main():
     df_final["Ozkarlilik"] = np.where(df_final["Ozkaynak"] != 0, (df_final["Yillik_Kar"]/df_final["Ozkaynak"])*100, np.nan).round(2)
     df_final["Aktifkarlilik"] = np.where(df_final["Aktifler"] != 0, (df_final["Yillik_Kar"]/df_final["Aktifler"])*100, np.nan).round(2)
 
-    # Sayısal kolonları stringe çevir (Excel çıktısı için)
-    for col in ["Ozkaynak","Sermaye","Aktifler","Netborc","Yillik_Kar"]:
-        df_final[col] = df_final[col].apply(lambda x: "" if pd.isna(x) else str(int(x)))
-
     # Tarih formatı
     df_final["Tarih"] = pd.to_datetime(df_final["Tarih"], format="%d.%m.%Y", errors="coerce")
     df_final = df_final.sort_values(by=["Tarih","Hisse_Kodu"], ascending=[False,True]).reset_index(drop=True)
     df_final["Tarih"] = df_final["Tarih"].dt.strftime("%d.%m.%Y")
 
-    df_final.to_excel("pdfk_vert.xlsx", index=False, engine="openpyxl")
-    print("✅ Artifact oluşturuldu: pdfk_vert.xlsx")
+    # Ara depoya sayısal haliyle (Excel'e yazılan tam sayı değerleri) yazılır; horz buradan okur
+    sayisal = df_final.copy(); sayisal["Msci"] = sayisal["Msci"].replace("", None)
+    for col in ["Ozkaynak","Sermaye","Aktifler","Netborc","Yillik_Kar"]: sayisal[col] = np.trunc(sayisal[col])
+    with olcum.asama("pdfk_vert/parquet"): ara_depo.yaz("pdfk_vert", {"Sheet1": sayisal})
+    if ara_depo.EXCEL:
+        cikti.yaz("pdfk_vert.xlsx", {"Sheet1": excel_hali(sayisal)})
+        print("✅ Artifact oluşturuldu: pdfk_vert.xlsx")
+    else: print("✅ pdfk_vert ara deposu yazıldı (ARA_EXCEL=0, pdfk_vert.xlsx yazılmadı; python pdfk_vert.py --excel ile üretilebilir)")
 
 if __name__ == "__main__": main()
@@ -0,0 +1,194 @@
+import os, sys, io, json, time, shutil, platform, argparse, tempfile, threading, subprocess
+import http.server, socketserver
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs, unquote
+import numpy as np, pandas as pd, pytz, openpyxl
+
+# Ağa ve secret'lara çıkmadan uçtan uca ölçüm: N sembol x D gün sentetik BIST evreni üretilir, yerel bir sahte
+# sunucu main/main_indis (HTML tablo), pdfk_vert (ZRY Göstergeler xlsx) ve sektorpazar (xlsx + HTML) kaynaklarını
+# gerçek biçimleriyle sunar. Her aşama ayrı süreçte, CI'daki gibi çalıştırılır; süre, tepe RSS ve saniyedeki satır
+# JSON'a yazılır. Örnek: python performans.py --olcek 100x500,600x500 --cikti olcum.json --karsilastir eski.json
+KOK=os.path.dirname(os.path.abspath(__file__))
+OLCEKLER=["100x500","600x500","3000x500","100x2500","600x2500","3000x2500"]
+ZINCIRLER={
+    "hisse":["main.py","indicate.py","main_profit.py"],
+    "endeks":["main_indis.py","indicate_indis.py","main_indis_profit.py"],
+    "pdfk":["pdfk_vert.py","pdfk_horz.py"],
+    "sektorpazar":["sektorpazar.py"],
+}
+
+def tr(x,ondalik=2):
+    # 1234.5 -> "1.234,50"
+    return f"{x:,.{ondalik}f}".replace(",","X").replace(".",",").replace("X",".")
+
+def kod(i,bas="H"):
+    s=""
+    for _ in range(4): i,r=divmod(i,26); s=chr(65+r)+s
+    return bas+s
+
+class Evren:
+    # deterministik sentetik piyasa: kapanışlar rastgele yürüyüş, semboller farklı günlerde işleme başlar
+    def __init__(self,N,D,tohum=0):
+        rng=np.random.default_rng(tohum)
+        bugun=datetime.now(pytz.timezone("Europe/Istanbul")).date()
+        self.gunler=pd.bdate_range(end=pd.Timestamp(bugun),periods=D)
+        self.sira={(t.day,t.month,t.year):i for i,t in enumerate(self.gunler)}
+        self.hisseler=[kod(i) for i in range(N)]; self.endeksler=[kod(i,"X") for i in range(max(5,N//25))]
+        self.kapanis=(10+90*rng.random(N)*np.exp(np.cumsum(rng.normal(0,0.02,(D,N)),axis=0))).astype(np.float32)
+        self.endeks=(1000*np.exp(np.cumsum(rng.normal(0,0.01,(D,len(self.endeksler))),axis=0))).astype(np.float32)
+        self.baslangic=rng.integers(0,D//3+1,N); self.baslangic[:N*3//4]=0
+        self.xlsx={}; self.kilit=threading.Lock()
+
+    def dates_csv(self,yol):
+        n=max(len(self.gunler),len(self.hisseler),len(self.endeksler))
+        sutun=lambda v: list(v)+[None]*(n-len(v))
+        pd.DataFrame({"Tarih":sutun(self.gunler[::-1].strftime("%d.%m.%Y")),"Hisse":sutun(self.hisseler),
+                      "Endeks":sutun(self.endeksler)}).to_csv(yol,index=False)
+
+    def hisse_html(self,t):
+        # fiyat_hacim_tek_gun: ilk tablo, satır başına >=9 hücre; 0 kod, 1 kapanış, 4 yüksek, 5 düşük, 7 hacim
+        rng=np.random.default_rng(t); eksik=rng.random(len(self.hisseler))<0.02; c=self.kapanis[t]
+        out=["<html><body><table><tr>"+"".join(f"<th>{b}</th>" for b in ["Kod","Kapanış","Fark","%","Yüksek","Düşük","AOF","Hacim(Lot)","Hacim(TL)"])+"</tr>"]
+        for j,h in enumerate(self.hisseler):
+            if t<self.baslangic[j] or eksik[j]: continue
+            p=float(c[j]); v=int(rng.integers(1000,10**7))
+            out.append(f"<tr><td>{h}</td><td>{tr(p)}</td><td>0,00</td><td>0,00</td><td>{tr(p*1.02)}</td><td>{tr(p*0.98)}</td><td>{tr(p)}</td><td>{tr(v,0)}</td><td>{tr(v*p,0)}</td></tr>")
+        return "\n".join(out+["</table></body></html>"])
+
+    def endeks_html(self,t):
+        # kapanis_tek_gun: başlıklar Menkul Adı/Son/Yüksek/Düşük
+        out=["<html><body><table><tr><th>Menkul Adı</th><th>Son</th><th>Yüksek</th><th>Düşük</th></tr>"]
+        for j,e in enumerate(self.endeksler):
+            p=float(self.endeks[t,j]); out.append(f"<tr><td>{e}</td><td>{tr(p)}</td><td>{tr(p*1.01)}</td><td>{tr(p*0.99)}</td></tr>")
+        return "\n".join(out+["</table></body></html>"])
+
+    def zry_xlsx(self,t):
+        # ZRY Göstergeler: 1 kod, 6 MSCI, 7 özkaynak, 8 sermaye, 9 aktifler, 14 net borç, 17 yıllık kâr (milyon TL);
+        # temel veriler çeyrekte bir değiştiği için dosya çeyrek başına bir kez üretilir
+        g=self.gunler[t]; anahtar=(g.year,(g.month-1)//3)
+        with self.kilit:
+            if anahtar not in self.xlsx:
+                rng=np.random.default_rng(anahtar[0]*4+anahtar[1]); wb=openpyxl.Workbook(write_only=True); ws=wb.create_sheet()
+                ws.append([None,"Kod",None,None,None,None,"MSCI","Özkaynak","Sermaye","Aktifler"]+[None]*4+["Net Borç",None,None,"Yıllık Kâr"])
+                for h in self.hisseler:
+                    ozk,ser,akt,nb,kar=(round(float(x),4) for x in rng.normal(5000,3000,5))
+                    ws.append([None,h,None,None,None,None,"x" if rng.random()<0.3 else None,ozk,ser,akt,None,None,None,None,nb,None,None,kar])
+                b=io.BytesIO(); wb.save(b); self.xlsx[anahtar]=b.getvalue()
+            return self.xlsx[anahtar]
+
+    def sektorpazar(self):
+        # url1: "BIST ..." başlığı, altında 1'den numaralı semboller; url2: pazar başlıkları ve numaralı semboller; url3: HTML tablo
+        sektor=pd.read_csv(os.path.join(KOK,"data","sektor.csv")); pazar=pd.read_csv(os.path.join(KOK,"data","pazar.csv"))
+        satirlar=[["Sıra","Kod"]]
+        for b,(bas,son) in zip(["BIST 30","BIST 50","BIST 100"]+sektor["Endeks Kolonu"].str.strip().tolist(),
+                               [(0,30),(0,50),(0,100)]+[(i*len(self.hisseler)//len(sektor),(i+1)*len(self.hisseler)//len(sektor)) for i in range(len(sektor))]):
+            satirlar.append([None,b]); satirlar+=[[str(k+1),h] for k,h in enumerate(self.hisseler[bas:son])]
+        endeks=xlsx_bayt(satirlar)
+        satirlar=[["Sıra","Kod"]]
+        for i,p in enumerate(pazar["Pattern"].str.strip()):
+            satirlar.append([p,None]); satirlar+=[[str(k+1),h] for k,h in enumerate(self.hisseler[i::len(pazar)])]
+        pazarlar=xlsx_bayt(satirlar)
+        fd="<html><body><table>"+"".join(f"<tr><td>{i+1}</td><td>{h}</td><td>{tr(1e6*(i+1))}</td><td>{tr(10+i%80)}</td></tr>" for i,h in enumerate(self.hisseler))+"</table></body></html>"
+        return endeks,pazarlar,fd.encode()
+
+def xlsx_bayt(satirlar):
+    b=io.BytesIO(); pd.DataFrame(satirlar).to_excel(b,header=False,index=False); return b.getvalue()
+
+def sunucu(evren):
+    # /hisse?gun=&ay=&yil=&tip=Hisse, /endeks?x=1&gun=..., /pdfk/ZRY Göstergeler-YYYY_MM_DD.xlsx, /sp/{endeks,pazar,fd}
+    sp=dict(zip(["endeks","pazar","fd"],evren.sektorpazar()))
+    class H(http.server.BaseHTTPRequestHandler):
+        def log_message(self,*a): pass
+        def gonder(self,b,tip="text/html; charset=utf-8"):
+            if b is None: self.send_response(404); self.end_headers(); return
+            self.send_response(200); self.send_header("Content-Type",tip); self.send_header("Content-Length",str(len(b))); self.end_headers(); self.wfile.write(b)
+        def do_GET(self):
+            u=urlsplit(self.path); yol=unquote(u.path); q={k:v[0] for k,v in parse_qs(u.query).items()}
+            if yol in ("/hisse","/endeks"):
+                t=evren.sira.get((int(q.get("gun",0)),int(q.get("ay",0)),int(q.get("yil",0))))
+                if t is None: return self.gonder(b"<html><body></body></html>")
+                return self.gonder((evren.hisse_html(t) if yol=="/hisse" else evren.endeks_html(t)).encode())
+            if yol.startswith("/pdfk/"):
+                try: t=evren.sira[tuple(int(x) for x in reversed(yol.rsplit("-",1)[1][:-5].split("_")))]
+                except (KeyError,ValueError,IndexError): return self.gonder(None)
+                # her 97 günden biri yok: indirme hatası yolu da ölçülür
+                return self.gonder(None if t%97==96 else evren.zry_xlsx(t),"application/octet-stream")
+            if yol.startswith("/sp/"): return self.gonder(sp.get(yol[4:]),"application/octet-stream")
+            self.gonder(None)
+    class S(socketserver.ThreadingMixIn,http.server.HTTPServer): daemon_threads=True; allow_reuse_address=True
+    s=S(("127.0.0.1",0),H); threading.Thread(target=s.serve_forever,daemon=True).start()
+    return s
+
+def asama_calistir(betik,dizin,env):
+    # ayrı süreç; tepe RSS o sürecin rusage'ından (wait4), Linux'ta KB
+    bas=time.perf_counter()
+    with open(os.path.join(dizin,f".{betik}.log"),"w+",encoding="utf-8") as log:
+        p=subprocess.Popen([sys.executable,os.path.join(KOK,betik)],cwd=dizin,env=env,stdout=log,stderr=subprocess.STDOUT)
+        _,durum,ru=os.wait4(p.pid,0); p.returncode=os.waitstatus_to_exitcode(durum)
+        sure=time.perf_counter()-bas; log.seek(0); cikti=log.read()
+    rss=ru.ru_maxrss/1024 if sys.platform!="darwin" else ru.ru_maxrss/2**20
+    return sure,rss,p.returncode,cikti
+
+def olc(olcek,zincirler,sakla=False):
+    N,D=(int(x) for x in olcek.split("x")); evren=Evren(N,D); s=sunucu(evren); adres=f"http://127.0.0.1:{s.server_address[1]}"
+    dizin=tempfile.mkdtemp(prefix=f"performans_{olcek}_"); os.makedirs(os.path.join(dizin,"data"))
+    for f in ("indicators.yaml","sektor.csv","pazar.csv"): shutil.copy(os.path.join(KOK,"data",f),os.path.join(dizin,"data",f))
+    evren.dates_csv(os.path.join(dizin,"data","dates.csv"))
+    env={k:v for k,v in os.environ.items() if not k.startswith(("HTTP_KAYIT","ARA_","INDIKATOR_DURUM","GUN_DEPOSU","CALISTIR_","OLCUM_DIZIN"))}
+    env.update(PYTHONPATH=KOK,GUN_SAYISI=str(D),CEKICI_BEKLEME="0",CEKICI_HIZ="0",PYTHONIOENCODING="utf-8",
+               MAIN=json.dumps({"DATA_SOURCE_URL":f"{adres}/hisse"}),MAININDIS=json.dumps({"DATA_SOURCE_URL":f"{adres}/endeks?x=1"}),
+               PDFK=f"{adres}/pdfk",SEKTORPAZAR=json.dumps({"url1":f"{adres}/sp/endeks","url2":f"{adres}/sp/pazar","url3":f"{adres}/sp/fd"}))
+    satir={"hisse":N*D,"endeks":len(evren.endeksler)*D,"pdfk":N*D,"sektorpazar":N}
+    sonuclar=[]
+    try:
+        for z in zincirler:
+            for betik in ZINCIRLER[z]:
+                sure,rss,kod_,cikti=asama_calistir(betik,dizin,env)
+                ok=kod_==0 and "❌" not in cikti
+                r={"olcek":olcek,"semboller":N,"gunler":D,"zincir":z,"asama":betik,"sure_sn":round(sure,3),"tepe_rss_mb":round(rss,1),
+                   "satir":satir[z],"satir_sn":round(satir[z]/sure,1) if sure else None,"durum":"ok" if ok else "hata"}
+                if not ok: r["cikti"]=cikti[-2000:]
+                try:
+                    # betiğin kendi ölçüm raporundaki aşama süreleri
+                    with open(os.path.join(dizin,"olcum",betik.replace(".py",".json")),encoding="utf-8") as f: r["asamalar"]={a["ad"]:a["sure_sn"] for a in json.load(f)["asamalar"]}
+                except (OSError,ValueError,KeyError): pass
+                sonuclar.append(r)
+                print(f"{'✅' if ok else '❌'} {olcek:>10} {betik:<22} {sure:8.2f}s {rss:8.1f}MB {r['satir_sn'] or 0:12.0f} satır/s",flush=True)
+    finally:
+        s.shutdown(); s.server_close()
+        if not sakla: shutil.rmtree(dizin,ignore_errors=True)
+        else: print(f"ℹ️ çalışma dizini: {dizin}")
+    return sonuclar
+
+def surum():
+    try: return subprocess.run(["git","rev-parse","--short","HEAD"],cwd=KOK,capture_output=True,text=True,timeout=10).stdout.strip() or None
+    except (OSError,subprocess.SubprocessError): return None
+
+def karsilastir(eski,yeni):
+    # aynı ölçek/aşama için süre ve tepe RSS oranı (yeni/eski)
+    onceki={(r["olcek"],r["asama"]):r for r in eski["sonuclar"]}
+    print(f"\n{eski.get('surum')} -> {yeni.get('surum')}")
+    for r in yeni["sonuclar"]:
+        o=onceki.get((r["olcek"],r["asama"]))
+        if not o: continue
+        print(f"{r['olcek']:>10} {r['asama']:<22} {o['sure_sn']:8.2f}s -> {r['sure_sn']:8.2f}s (x{r['sure_sn']/o['sure_sn'] if o['sure_sn'] else float('nan'):.2f})"
+              f"  {o['tepe_rss_mb']:7.1f}MB -> {r['tepe_rss_mb']:7.1f}MB")
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser()
+    ap.add_argument("--olcek",default=",".join(OLCEKLER),help="NxD listesi, virgülle")
+    ap.add_argument("--zincir",default=",".join(ZINCIRLER),help="/".join(ZINCIRLER))
+    ap.add_argument("--cikti",default="performans.json")
+    ap.add_argument("--karsilastir",help="önceki bir çalıştırmanın JSON'u")
+    ap.add_argument("--sakla",action="store_true",help="çalışma dizinlerini silme")
+    args=ap.parse_args()
+    zincirler=args.zincir.split(",")
+    if set(zincirler)-set(ZINCIRLER): ap.error(f"bilinmeyen zincir: {sorted(set(zincirler)-set(ZINCIRLER))}")
+    rapor={"surum":surum(),"tarih":datetime.now().isoformat(timespec="seconds"),
+           "makine":{"python":platform.python_version(),"pandas":pd.__version__,"numpy":np.__version__,"platform":platform.platform(),"cpu":os.cpu_count()},
+           "sonuclar":[]}
+    for o in args.olcek.split(","): rapor["sonuclar"]+=olc(o.strip(),zincirler,args.sakla)
+    with open(args.cikti,"w",encoding="utf-8") as f: json.dump(rapor,f,ensure_ascii=False,indent=1)
+    print(f"✅ {args.cikti} yazıldı")
+    if args.karsilastir:
+        with open(args.karsilastir,encoding="utf-8") as f: karsilastir(json.load(f),rapor)
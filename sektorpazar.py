@@ -1,19 +1,23 @@
-import pandas as pd, requests, os, json
+import pandas as pd, os, json
 from io import BytesIO
 from bs4 import BeautifulSoup
-from datetime import datetime
+import cekici, olcum, cikti
+from tarih_ayar import takvim
 
 urls=json.loads(os.environ.get("SEKTORPAZAR"))
 url_indices,url_markets,url_fd=urls["url1"],urls["url2"],urls["url3"]
+OTURUM=cekici.oturum(headers=None)
 
 df_dates=pd.read_csv("data/dates.csv")
 hisse_list=df_dates["Hisse"].dropna().str.strip().unique()
-today=datetime.now().date()
-tarih_list=pd.to_datetime(df_dates.iloc[:,0],dayfirst=True,errors="coerce").dropna().dt.date
-secili_tarih=max([d for d in tarih_list if d<=today])
+# İstanbul saatine göre bugün ya da önceki son işlem günü
+secili_tarih=takvim().asof()
+if secili_tarih is None: raise ValueError("❌ dates.csv'de bugüne kadar işlem günü yok")
 tarih_str=secili_tarih.strftime("%d.%m.%Y")
 
-df_raw=pd.read_excel(BytesIO(requests.get(url_indices,timeout=30).content),header=None)
+with olcum.asama("sektorpazar/indirme"): r_indices,r_markets,r_fd=cekici.paralel(lambda u: OTURUM.get(u,timeout=30),[url_indices,url_markets,url_fd],isci=3)
+
+df_raw=pd.read_excel(BytesIO(r_indices.content),header=None)
 endeks_dict={}; cur=None
 for i in range(len(df_raw)-1):
     vals=[str(df_raw.iat[i,j]).strip() if pd.notna(df_raw.iat[i,j]) else "" for j in range(min(5,df_raw.shape[1]))]
@@ -23,7 +27,7 @@ for i in range(len(df_raw)-1):
     if vals and vals[0].isdigit() and cur: endeks_dict[cur].append(vals[1] if len(vals)>1 else "")
 df_endeks=pd.DataFrame({k:pd.Series(v) for k,v in endeks_dict.items()})
 
-df_m=pd.read_excel(BytesIO(requests.get(url_markets,timeout=30).content),header=None)
+df_m=pd.read_excel(BytesIO(r_markets.content),header=None)
 pazar_dict={}; cur=None
 for i in range(len(df_m)):
     a=str(df_m.iat[i,0]).strip() if pd.notna(df_m.iat[i,0]) else ""
@@ -32,7 +36,7 @@ for i in range(len(df_m)):
     if a.isdigit() and cur: pazar_dict[cur].append(b)
 df_pazar=pd.DataFrame({k:pd.Series(v) for k,v in pazar_dict.items()})
 
-soup=BeautifulSoup(requests.get(url_fd,timeout=30).text,"html.parser")
+soup=BeautifulSoup(r_fd.text,"html.parser")
 rows=[[td.get_text(strip=True) for td in tr.find_all("td")] for tr in soup.find("table").find_all("tr")]
 data=[]
 for r in rows:
@@ -45,25 +49,26 @@ df_fd=pd.DataFrame(data,columns=["Borsa Kodu","Fiili Dolaşımdaki Pay Tutarı(T
 df_sektor=pd.read_csv("data/sektor.csv")
 df_pazar_map=pd.read_csv("data/pazar.csv")
 
-res=[]
-for kod in hisse_list:
-    if kod in set(df_endeks["BIST 30"].dropna().astype(str).str.strip()): endeks="XU030"
-    elif kod in set(df_endeks["BIST 50"].dropna().astype(str).str.strip()): endeks="XU050"
-    elif kod in set(df_endeks["BIST 100"].dropna().astype(str).str.strip()): endeks="XU100"
-    else: endeks=""
-    sektor=""
-    for _,r in df_sektor.iterrows():
-        if r["Endeks Kolonu"].strip() in df_endeks.columns and kod in set(df_endeks[r["Endeks Kolonu"].strip()].dropna().astype(str).str.strip()):
-            sektor=r["Sektor Kodu"].strip(); break
-    pazar=""
-    for _,r in df_pazar_map.iterrows():
-        if r["Pattern"].strip() in df_pazar.columns and kod in set(df_pazar[r["Pattern"].strip()].dropna().astype(str).str.strip()):
-            pazar=r["Pazar Kodu"].strip(); break
-    fd=df_fd[df_fd["Borsa Kodu"]==kod]
-    oran=fd.iloc[0]["Fiili Dolaşımdaki Pay Oranı(%)"] if not fd.empty else ""
-    lot=fd.iloc[0]["Fiili Dolaşımdaki Pay Tutarı(TL)"] if not fd.empty else ""
-    res.append([tarih_str,kod,pazar,endeks,sektor,oran,lot])
+# Sembol -> sınıf indeksleri bir kez kurulur; listede önce gelen eşleşme kazanır
+def ters_indeks(kaynak,sira):
+    idx={}
+    for kolon,kod in sira:
+        if kolon in kaynak.columns:
+            for h in kaynak[kolon].dropna().astype(str).str.strip(): idx.setdefault(h,kod)
+    return idx
+endeks_idx=ters_indeks(df_endeks,[("BIST 30","XU030"),("BIST 50","XU050"),("BIST 100","XU100")])
+sektor_idx=ters_indeks(df_endeks,[(r["Endeks Kolonu"].strip(),r["Sektor Kodu"].strip()) for _,r in df_sektor.iterrows()])
+pazar_idx=ters_indeks(df_pazar,[(r["Pattern"].strip(),r["Pazar Kodu"].strip()) for _,r in df_pazar_map.iterrows()])
+fd_idx=df_fd.drop_duplicates("Borsa Kodu").set_index("Borsa Kodu")
+
+res=pd.DataFrame({"Hisse":hisse_list})
+res.insert(0,"Tarih",tarih_str)
+res["Pazar"]=res["Hisse"].map(pazar_idx).fillna("")
+res["Endeks"]=res["Hisse"].map(endeks_idx).fillna("")
+res["Sektör"]=res["Hisse"].map(sektor_idx).fillna("")
+res["Dolaşım Oranı"]=res["Hisse"].map(fd_idx["Fiili Dolaşımdaki Pay Oranı(%)"]).fillna("")
+res["Dolaşım Lotu"]=res["Hisse"].map(fd_idx["Fiili Dolaşımdaki Pay Tutarı(TL)"]).fillna("")
 
-artifact=pd.DataFrame(res,columns=["Tarih","Hisse","Pazar","Endeks","Sektör","Dolaşım Oranı","Dolaşım Lotu"])
-artifact.to_excel("sektorpazar.xlsx",index=False,engine="openpyxl")
+artifact=res[["Tarih","Hisse","Pazar","Endeks","Sektör","Dolaşım Oranı","Dolaşım Lotu"]]
+cikti.yaz("sektorpazar.xlsx",{"Sheet1":artifact})
 print("✅ sektorpazar.xlsx oluşturuldu.")
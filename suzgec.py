@@ -0,0 +1,273 @@
+import os, re, ast, json, time, shutil, hashlib, argparse
+from collections import namedtuple
+from functools import lru_cache
+import numpy as np, pandas as pd
+from tarih_ayar import BICIM
+import ara_depo, cikti, main_profit, olcum
+
+# Hatta üretilen fiyat, gösterge, getiri ve F/K-PD/DD tabloları üzerinde tarama. Bütün sayfalar bir kez
+# artan tarih x sıralı sembol ızgarasına hizalanıp DIZIN/<evren>/ altına .npy olarak yazılır, sonraki açılışlar
+# memory-map ile okur; kaynak dosyalar (boyut/zaman) ya da kod değişince yeniden kurulur. İfadeler bütün evrende
+# numpy ile hesaplanır: "RSI < 30 and Kapanış > EMA_50 and Yıllık% > 0 and Fk_Carpan < 10". Boşluk ya da işaret
+# içeren adlar olduğu gibi yazılabilir ("6 Aylık%", "Max Kar/Zarar", tarama sayfaları "EMA_t[20]"), karışırsa
+# `ad` ile. NaN içeren karşılaştırma belirsizdir: not/or/and ile de doğruya dönmez (üç değerli mantık). Sonuçlar ifade + seçenek + veri imzası özetiyle saklanır.
+DIZIN=os.environ.get("SUZGEC_DIZIN",".depo/suzgec")
+KOK=os.path.dirname(os.path.abspath(__file__))
+EVRENLER={
+    "hisse":{"ara":"fiyat","sayfalar":("Kapanış","Yüksek","Düşük","Hacim(Lot)"),
+             "indikator_xlsx":"indicators.xlsx","pdfk_xlsx":"pdfk_horz.xlsx"},
+    "endeks":{"ara":"indis_fiyat","sayfalar":("Kapanis","Yuksek","Dusuk"),
+              "indikator_xlsx":"indis_indicators.xlsx","pdfk_xlsx":None},
+}
+ATLA={"Son_Tarihli_Oranlar"}  # tarih x sembol olmayan sayfalar
+
+def _kitap_yollari(x): return cikti.yollar(x,["xlsx","csv","parquet"]) if x else []  # cikti.oku'nun okuyabildiği her biçim
+
+def _dosyalar(e):
+    y=[ara_depo.yol(e["ara"],s) for s in e["sayfalar"]]
+    for x in (e["indikator_xlsx"],e["pdfk_xlsx"]): y+=_kitap_yollari(x)
+    d=[]
+    for p in y:
+        if os.path.isdir(p): d+=sorted(os.path.join(p,f) for f in os.listdir(p))
+        elif os.path.exists(p): d.append(p)
+    return d
+
+def imza(e):
+    # kaynak dosyaların yolu/boyutu/zamanı ve hesap kodu
+    h=hashlib.sha1()
+    for p in _dosyalar(e): st=os.stat(p); h.update(f"{p}\0{st.st_mtime_ns}\0{st.st_size}\0".encode())
+    for p in ("suzgec.py","main_profit.py"): h.update(open(os.path.join(KOK,p),"rb").read())
+    return h.hexdigest()
+
+def _tablo(xlsx,s):
+    df=cikti.oku(xlsx,s)
+    if "Tarih" in df.columns: df=df.set_index("Tarih")
+    if not isinstance(df.index,pd.DatetimeIndex): df.index=pd.to_datetime(df.index.astype(str),format=BICIM)
+    return df
+
+def _kitap(xlsx):
+    # {değişken: tarih x sembol}; tarama sayfaları (Uzunluk sütunlu) uzunluk başına "<sayfa>[n]"
+    for s in cikti.sayfa_adlari(xlsx):
+        if s in ATLA: continue
+        df=_tablo(xlsx,s)
+        if "Uzunluk" in df.columns:
+            for n,g in df.groupby("Uzunluk",sort=True): yield f"{s}[{int(n)}]",g.drop(columns="Uzunluk")
+        else: yield s,df
+
+def _oku(e):
+    with olcum.asama("suzgec/oku"):
+        fiyat={s:ara_depo.oku(e["ara"],s) for i,s in enumerate(e["sayfalar"]) if not i or ara_depo.var(e["ara"],s)}  # kapanış şart
+        kapanis=fiyat[e["sayfalar"][0]].sort_index()
+        tarihler,semboller=kapanis.index,kapanis.columns.sort_values()
+        kaynaklar=list(fiyat.items())
+        kaynaklar+=[(main_profit.GECMIS_SAYFALAR[k],df) for k,df in main_profit.getiri_gecmisi(kapanis).items()]
+        for x in (e["indikator_xlsx"],e["pdfk_xlsx"]):
+            if any(map(os.path.exists,_kitap_yollari(x))): kaynaklar+=list(_kitap(x))
+        m={}
+        for ad,df in kaynaklar:
+            if ad in m: print(f"⚠️ {ad} birden fazla kaynakta, ilki kullanıldı"); continue
+            df=df.reindex(index=tarihler,columns=semboller)
+            m[ad]=df.apply(pd.to_numeric,errors="coerce").to_numpy(dtype=np.float64) if (df.dtypes==object).any() else df.to_numpy(dtype=np.float64)
+    return tarihler,semboller,m
+
+def _kaydet(d,meta,m):
+    if os.path.isdir(d): shutil.rmtree(d)
+    os.makedirs(d)
+    for i,v in enumerate(m.values()): np.save(os.path.join(d,f"d{i}.npy"),np.ascontiguousarray(v))
+    with open(os.path.join(d,"meta.json"),"w",encoding="utf-8") as f: json.dump(dict(meta,degiskenler=list(m)),f,ensure_ascii=False)
+
+_acik={}
+
+def yukle(evren="hisse"):
+    # aynı süreçte ve kaynaklar değişmedikçe tek Suzgec
+    e=EVRENLER[evren]; im=imza(e); d=os.path.join(DIZIN,evren)
+    if _acik.get(evren) and _acik[evren].imza==im: return _acik[evren]
+    try:
+        with open(os.path.join(d,"meta.json"),encoding="utf-8") as f: meta=json.load(f)
+        if meta["imza"]!=im: raise ValueError
+        m={ad:np.load(os.path.join(d,f"d{i}.npy"),mmap_mode="r") for i,ad in enumerate(meta["degiskenler"])}
+        tarihler,semboller=pd.DatetimeIndex(np.array(meta["tarihler"],dtype="datetime64[D]"),name="Tarih"),pd.Index(meta["semboller"])
+    except (OSError,ValueError,KeyError):
+        tarihler,semboller,m=_oku(e)
+        _kaydet(d,{"imza":im,"tarihler":tarihler.strftime("%Y-%m-%d").tolist(),"semboller":list(semboller)},m)
+    _acik[evren]=Suzgec(evren,im,tarihler,semboller,m,d); return _acik[evren]
+
+def yuzdelik(x):
+    # her tarihte kesitsel yüzdelik sıra: değerinden küçük ya da eşit sembollerin payı (0, 1]; NaN -> NaN.
+    # satır içi sıralanır, eşit değer grubunun son konumu sağdan birikimli minimumla bulunur
+    x=np.asarray(x,dtype=np.float64); N=x.shape[-1]; o=np.argsort(x,axis=-1); s=np.take_along_axis(x,o,axis=-1)
+    son=np.ones(s.shape,bool); son[...,:-1]=s[...,1:]!=s[...,:-1]
+    u=np.minimum.accumulate(np.where(son,np.arange(N),N)[...,::-1],axis=-1)[...,::-1]
+    with np.errstate(invalid="ignore",divide="ignore"): v=(u+1)/(~np.isnan(x)).sum(axis=-1,keepdims=True)
+    r=np.empty(x.shape); np.put_along_axis(r,o,v,axis=-1); r[np.isnan(x)]=np.nan; return r
+
+KARSILASTIR={ast.Lt:np.less,ast.LtE:np.less_equal,ast.Gt:np.greater,ast.GtE:np.greater_equal,ast.Eq:np.equal,ast.NotEq:np.not_equal}
+ARITMETIK={ast.Add:np.add,ast.Sub:np.subtract,ast.Mult:np.multiply,ast.Div:np.true_divide,ast.Pow:np.power,ast.Mod:np.mod}
+FONKSIYONLAR={"abs":np.abs,"log":np.log,"min":np.minimum,"max":np.maximum,"sira":yuzdelik}
+
+@lru_cache(maxsize=1024)
+def derle(ifade,adlar):
+    # adlar: bilinen değişkenler (tuple); dönüş (ast, {yer tutucu: değişken}) — adlar sözcük sınırında, uzundan kısaya
+    yer={}
+    def tut(ad):
+        if ad not in yer: yer[ad]=f"_v{len(yer)}"
+        return yer[ad]
+    def tirnak(m):
+        if m.group(1) not in adlar: raise KeyError(f"bilinmeyen değişken: {m.group(1)}")
+        return tut(m.group(1))
+    parcalar=re.split(r"(`[^`]*`)",ifade)
+    desen=re.compile(r"(?<![\w\[])("+"|".join(map(re.escape,sorted(adlar,key=len,reverse=True)))+r")(?![\w\[])") if adlar else None
+    metin="".join(re.sub(r"`([^`]*)`",tirnak,p) if p.startswith("`") else desen.sub(lambda m: tut(m.group(1)),p) if desen else p for p in parcalar)
+    try: agac=ast.parse(metin.strip(),mode="eval")
+    except SyntaxError as h: raise ValueError(f"ifade ayrıştırılamadı: {ifade}") from h
+    for d in ast.walk(agac):
+        if isinstance(d,ast.Name) and d.id not in FONKSIYONLAR and d.id not in yer.values(): raise KeyError(f"bilinmeyen değişken: {d.id}")
+    return agac,{v:k for k,v in yer.items()}
+
+# mantıksal sonuç: deger doğru olan, gecerli belirli (NaN'a dayanmayan) hücreler; deger her zaman gecerli içinde
+Kosul=namedtuple("Kosul","deger gecerli")
+
+def _mantik(v):
+    if not isinstance(v,Kosul): raise ValueError("mantıksal işlemde sayısal değer (karşılaştırma eksik)")
+    return v
+
+def _ve(k):
+    # biri kesin yanlışsa yanlış, hepsi belirliyse belirli
+    d=np.logical_and.reduce([x.deger for x in k]); return Kosul(d,np.logical_and.reduce([x.gecerli for x in k])|np.logical_or.reduce([x.gecerli&~x.deger for x in k]))
+
+def _veya(k):
+    d=np.logical_or.reduce([x.deger for x in k]); return Kosul(d,np.logical_and.reduce([x.gecerli for x in k])|d)
+
+def _karsilastir(op,a,b):
+    g=~(np.isnan(a)|np.isnan(b)); return Kosul(op(a,b)&g,g)
+
+def hesapla(dugum,deger):
+    # deger(ad) -> dizi; karşılaştırma ve and/or/not, &,|,~ Kosul döner
+    h=lambda d: hesapla(d,deger)
+    if isinstance(dugum,ast.Expression): return h(dugum.body)
+    if isinstance(dugum,ast.Constant) and isinstance(dugum.value,(int,float)) and not isinstance(dugum.value,bool): return float(dugum.value)
+    if isinstance(dugum,ast.Name) and dugum.id not in FONKSIYONLAR: return deger(dugum.id)
+    if isinstance(dugum,ast.BoolOp):
+        k=[_mantik(h(d)) for d in dugum.values]
+        return _ve(k) if isinstance(dugum.op,ast.And) else _veya(k)
+    if isinstance(dugum,ast.UnaryOp):
+        if isinstance(dugum.op,(ast.Not,ast.Invert)): k=_mantik(h(dugum.operand)); return Kosul(~k.deger&k.gecerli,k.gecerli)
+        if isinstance(dugum.op,ast.USub): return np.negative(h(dugum.operand))
+        if isinstance(dugum.op,ast.UAdd): return h(dugum.operand)
+    if isinstance(dugum,ast.BinOp):
+        if isinstance(dugum.op,(ast.BitAnd,ast.BitOr)):
+            k=[_mantik(h(dugum.left)),_mantik(h(dugum.right))]
+            return _ve(k) if isinstance(dugum.op,ast.BitAnd) else _veya(k)
+        if type(dugum.op) in ARITMETIK:
+            a,b=h(dugum.left),h(dugum.right)
+            if isinstance(a,Kosul) or isinstance(b,Kosul): raise ValueError("karşılaştırma sonucu aritmetikte kullanılamaz")
+            return ARITMETIK[type(dugum.op)](a,b)
+    if isinstance(dugum,ast.Compare):
+        # zincir: a < b < c -> (a < b) and (b < c)
+        sol=h(dugum.left); k=[]
+        for op,sag in zip(dugum.ops,dugum.comparators):
+            if type(op) not in KARSILASTIR: break
+            sag=h(sag)
+            if isinstance(sol,Kosul) or isinstance(sag,Kosul): raise ValueError("karşılaştırma sonucu yeniden karşılaştırılamaz")
+            k.append(_karsilastir(KARSILASTIR[type(op)],sol,sag)); sol=sag
+        else: return _ve(k)
+    if isinstance(dugum,ast.Call) and isinstance(dugum.func,ast.Name) and dugum.func.id in FONKSIYONLAR and not dugum.keywords:
+        a=[h(d) for d in dugum.args]
+        if any(isinstance(x,Kosul) for x in a): raise ValueError(f"{dugum.func.id} sayısal değer bekler")
+        return FONKSIYONLAR[dugum.func.id](*a)
+    raise ValueError(f"desteklenmeyen ifade: {ast.unparse(dugum)}")
+
+class Suzgec:
+    def __init__(self,evren,imza_,tarihler,semboller,matrisler,dizin):
+        self.evren,self.imza,self.tarihler,self.semboller,self.m=evren,imza_,tarihler,semboller,matrisler
+        self.adlar=tuple(matrisler); self.dizin=os.path.join(dizin,"sonuc"); self._sonuc={}
+        self._fiyat=EVRENLER[evren]["sayfalar"][0]
+
+    def degerlendir(self,ifade,satirlar=slice(None)):
+        # ifade -> (satır x sembol) dizi ve kullanılan değişkenler; boş ifade fiyatı olan her sembol
+        if not ifade.strip(): ifade=f"`{self._fiyat}` == `{self._fiyat}`"
+        agac,yer=derle(ifade,self.adlar)
+        with np.errstate(invalid="ignore",divide="ignore",over="ignore"):
+            v=hesapla(agac,lambda a: self.m[yer[a]][satirlar])
+        if isinstance(v,Kosul): v=v.deger  # sadece kesin doğrular geçer
+        T=len(self.tarihler[satirlar]); return np.broadcast_to(np.asarray(v),(T,len(self.semboller))),list(yer.values())
+
+    def satir(self,tarih=None):
+        # tarih (varsayılan son) ya da öncesindeki son işlem günü
+        if tarih is None: return len(self.tarihler)-1
+        i=int(self.tarihler.searchsorted(pd.to_datetime(tarih,dayfirst=True),side="right"))-1
+        if i<0: raise ValueError(f"{tarih} verinin başından önce")
+        return i
+
+    def sorgula(self,ifade,sirala=None,ilk=None,artan=False,tum=False,tarih=None):
+        # tum=False: tek tarih (varsayılan son), satır başına sembol + kullanılan değişkenler;
+        # tum=True: her tarih, uzun tablo (Tarih, Sembol). sirala verilirse geçen semboller her tarihte
+        # sirala ifadesine göre sıralanır (skoru NaN olanlar atılır), ilk ile her tarihin ilk N'i
+        anahtar=hashlib.sha1(json.dumps([self.imza," ".join(ifade.split()),sirala and " ".join(sirala.split()),ilk,artan,tum,
+                                         None if tum else str(self.tarihler[self.satir(tarih)].date())],ensure_ascii=False).encode()).hexdigest()
+        if anahtar in self._sonuc: olcum.sayac("suzgec/bellek"); return self._sonuc[anahtar]
+        yol=os.path.join(self.dizin,f"{anahtar}.parquet")
+        if os.path.exists(yol):
+            olcum.sayac("suzgec/disk"); self._sonuc[anahtar]=pd.read_parquet(yol,engine="pyarrow"); return self._sonuc[anahtar]
+        with olcum.asama("suzgec/hesap",tum=tum):
+            satirlar=slice(None) if tum else slice(self.satir(tarih),self.satir(tarih)+1)
+            maske,kullanilan=self.degerlendir(ifade,satirlar)
+            if maske.dtype!=bool: raise ValueError("tarama ifadesi karşılaştırma olmalı")
+            skor=sira=None
+            if sirala:
+                skor,_=self.degerlendir(sirala,satirlar); skor=np.asarray(skor,dtype=np.float64)
+                ti,si,sira=self._sira(skor,maske&~np.isnan(skor),ilk,artan)
+            else: ti,si=np.nonzero(maske)
+            tarihler=self.tarihler[satirlar]
+            if tum:
+                df=pd.DataFrame({"Tarih":tarihler[ti],"Sembol":pd.Categorical.from_codes(si,self.semboller)})
+            else:
+                df=pd.DataFrame({a:np.asarray(self.m[a][satirlar][0])[si] for a in kullanilan},index=pd.Index(self.semboller[si],name="Sembol"))
+                df.attrs["Tarih"]=str(tarihler[0].date())
+            if skor is not None: df["Skor"]=skor[ti,si]; df["Sıra"]=sira
+        os.makedirs(self.dizin,exist_ok=True); tmp=f"{yol}.{os.getpid()}.tmp"
+        df.to_parquet(tmp,engine="pyarrow"); os.replace(tmp,yol)
+        self._sonuc[anahtar]=df; return df
+
+    @staticmethod
+    def _sira(skor,maske,ilk=None,artan=False):
+        # her satırda geçen semboller skora göre (eşitlikte sembol sırasıyla), ilk verilirse ilk N'i:
+        # (satır, sembol, sıra) dizileri, satır ve sıraya göre dizili
+        T,N=skor.shape; a=np.where(maske,skor if artan else -skor,np.nan)  # NaN en sona dizilir
+        if ilk and ilk<N:
+            # ilk N'in sınır değeri argpartition ile; sınırla eşit olanlar da aday, adaylar (değer, sembol) sıralanır
+            sinir=np.take_along_axis(np.partition(a,ilk-1,axis=1),np.full((T,1),ilk-1),axis=1)
+            ti,si=np.nonzero(a<=np.where(np.isnan(sinir),np.inf,sinir))
+            o=np.lexsort((si,a[ti,si],ti)); ti,si=ti[o],si[o]
+            j=np.arange(len(ti))-np.searchsorted(ti,ti); sec=j<ilk
+            return ti[sec],si[sec],j[sec]+1
+        o=np.argsort(a,axis=1,kind="stable")
+        ti,j=np.nonzero(np.arange(N)<maske.sum(axis=1)[:,None])
+        return ti,o[ti,j],j+1
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser(description="örnek: python suzgec.py \"RSI < 30 and Kapanış > EMA_50 and Yıllık% > 0 and Fk_Carpan < 10\" --sirala \"Yıllık%\" --ilk 20")
+    ap.add_argument("ifade",nargs="?",default="",help="mantıksal ifade (boşsa bütün semboller)")
+    ap.add_argument("--evren",choices=list(EVRENLER),default="hisse")
+    ap.add_argument("--tum",action="store_true",help="son tarih yerine her tarih")
+    ap.add_argument("--tarih",help="gg.aa.yyyy; tek tarih taramasında son tarih yerine")
+    ap.add_argument("--sirala",help="her tarihte geçen sembolleri bu ifadeye göre sırala (varsayılan büyükten küçüğe)")
+    ap.add_argument("--artan",action="store_true")
+    ap.add_argument("--ilk",type=int,help="her tarihte ilk N sembol")
+    ap.add_argument("--cikti",help="sonucu CIKTI biçim(ler)inde yaz (ör. tarama.xlsx)")
+    ap.add_argument("--degiskenler",action="store_true",help="kullanılabilir değişkenleri listele")
+    args=ap.parse_args()
+    if args.ilk is not None and args.ilk<1: ap.error("--ilk en az 1")
+    t=time.perf_counter(); s=yukle(args.evren); print(f"ℹ️ {len(s.tarihler)} tarih x {len(s.semboller)} sembol, {len(s.adlar)} değişken ({time.perf_counter()-t:.2f}s)")
+    if args.degiskenler: print("\n".join(s.adlar)); raise SystemExit
+    t=time.perf_counter()
+    try: df=s.sorgula(args.ifade,args.sirala,args.ilk,args.artan,args.tum,args.tarih)
+    except (KeyError,ValueError) as h: print(f"❌ {h.args[0] if h.args else h}"); raise SystemExit(1)
+    sn=time.perf_counter()-t
+    if args.tum:
+        sayim=df.groupby("Tarih",observed=True).size().reindex(s.tarihler,fill_value=0)
+        print(f"✅ {len(df)} eşleşme, {int((sayim>0).sum())}/{len(sayim)} tarihte ({sn:.3f}s)"); print(sayim.iloc[::-1].head(10).to_string())
+    else:
+        print(f"✅ {df.attrs.get('Tarih') or s.tarihler[s.satir(args.tarih)].date()}: {len(df)} sembol ({sn:.3f}s)")
+        with pd.option_context("display.max_rows",50,"display.width",200): print(df.to_string(max_rows=50) if len(df) else "")
+    if args.cikti: print(f"✅ {', '.join(cikti.yaz(args.cikti,{'Tarama':df},index=not args.tum))} oluşturuldu")
@@ -0,0 +1,115 @@
+import sys
+from html.parser import HTMLParser
+try: from lxml import etree
+except ImportError: etree=None
+
+# Sayfadaki ilk <table>'ı hücre listelerine çevirir; tablo kapanınca ayrıştırma durur.
+# Dönüş: (ilk satırın th/td metinleri, sonraki satırların td metinleri) ya da tablo yoksa None.
+# Hücre metni BeautifulSoup get_text(strip=True) ile aynıdır; script/style/template içeriği gibi o da atlanır.
+PARCA=1<<16
+ATLA={"script","style","template"}
+
+def _olaylar(html):
+    p=etree.HTMLPullParser(events=("start","end"))
+    for i in range(0,len(html),PARCA):
+        p.feed(html[i:i+PARCA]); yield from p.read_events()
+    # kapanmamış tablo/satırların son olayları close'ta gelir
+    p.close(); yield from p.read_events()
+
+def _metin(el):
+    # itertext gibi, ATLA elemanlarının (ve yorumların) içi hariç; kuyruk metni üst elemana ait olduğundan kalır
+    if el.tag in ATLA or not isinstance(el.tag,str): return
+    if el.text: yield el.text
+    for c in el:
+        yield from _metin(c)
+        if c.tail: yield c.tail
+
+def _lxml(html):
+    # bs4 find_all gibi iç içe tablolar da dahil: her tr bir satır, hücre açık bütün satırlara (dış tr dahil) eklenir.
+    # lxml olayları her zaman dengeli geldiği için açık satır/hücreler yığında tutulur
+    derinlik=0; satirlar=[]; satir_yigin=[]; hucre_yigin=[]
+    for ev,el in _olaylar(html):
+        tag=el.tag
+        if tag=="table":
+            derinlik+=1 if ev=="start" else -1
+            if derinlik==0: return satirlar
+        elif not derinlik: continue
+        elif tag=="tr":
+            if ev=="start": satir=[]; satirlar.append(satir); satir_yigin.append(satir)
+            elif satir_yigin: satir_yigin.pop()
+        elif tag in ("td","th"):
+            if ev=="start":
+                h=[tag,""]; hucre_yigin.append(h)
+                for s in satir_yigin: s.append(h)
+            elif hucre_yigin: hucre_yigin.pop()[1]="".join(t.strip() for t in _metin(el))
+    return None
+
+class _Bitti(Exception): pass
+
+class _Ayristirici(HTMLParser):
+    # açık satırlar yığında; hücre açık bütün satırlara eklenir ve metni açık bütün hücrelere gider (iç içe tablo)
+    def __init__(self):
+        super().__init__(convert_charrefs=True); self.derinlik=0; self.bulundu=False; self.satirlar=[]; self.yigin=[]; self.acik=[]; self.atla=0
+    def handle_starttag(self,tag,attrs):
+        if tag in ATLA: self.atla+=1
+        elif tag=="table": self.derinlik+=1; self.bulundu=True
+        elif not self.derinlik: return
+        elif tag=="tr": s=[]; self.satirlar.append(s); self.yigin.append(s)
+        elif tag in ("td","th") and self.yigin:
+            h=[tag,[],len(self.yigin)]; self.acik.append(h)
+            for s in self.yigin: s.append(h)
+    def handle_endtag(self,tag):
+        if tag in ATLA: self.atla=max(self.atla-1,0); return
+        if not self.derinlik: return
+        if tag=="table":
+            self.derinlik-=1
+            if not self.derinlik: raise _Bitti
+        elif tag=="tr" and self.yigin:
+            # satır kapanınca içinde açık kalmış hücreler de kapanır
+            self.acik=[h for h in self.acik if h[2]<len(self.yigin)]; self.yigin.pop()
+        elif tag in ("td","th"):
+            for i in range(len(self.acik)-1,-1,-1):
+                if self.acik[i][0]==tag: del self.acik[i:]; break
+    def handle_data(self,data):
+        if self.acik and not self.atla:
+            s=data.strip()
+            if s:
+                for h in self.acik: h[1].append(s)
+
+def _saf(html):
+    a=_Ayristirici()
+    try: a.feed(html); a.close()
+    except _Bitti: pass
+    if not a.bulundu: return None
+    return [[(h[0],"".join(h[1])) for h in s] for s in a.satirlar]
+
+def _satirlar(html):
+    if etree is not None:
+        try: return _lxml(html)
+        except (etree.Error,ValueError): pass
+    return _saf(html)
+
+def _bol(s):
+    if s is None: return None
+    if not s: return [],[]
+    return [m for _,m in s[0]],[[m for t,m in r if t=="td"] for r in s[1:]]
+
+def ilk_tablo(html): return _bol(_satirlar(html))
+
+def _bs4(html):
+    from bs4 import BeautifulSoup
+    t=BeautifulSoup(html,"html.parser").find("table")
+    if not t: return None
+    trs=t.find_all("tr")
+    if not trs: return [],[]
+    return [h.get_text(strip=True) for h in trs[0].find_all(["th","td"])],[[td.get_text(strip=True) for td in tr.find_all("td")] for tr in trs[1:]]
+
+if __name__=="__main__":
+    # eşlik kontrolü: python tablo_ayikla.py sayfa1.html sayfa2.html ...
+    hata=0
+    for yol in sys.argv[1:]:
+        html=open(yol,encoding="utf-8",errors="replace").read(); ref=_bs4(html)
+        for ad,fn in ([("lxml",_lxml)] if etree is not None else [])+[("saf",_saf)]:
+            ok=_bol(fn(html))==ref; hata+=not ok
+            print(("✅" if ok else "❌"),yol,ad)
+    sys.exit(1 if hata else 0)
@@ -1,18 +1,95 @@
-import pandas as pd
+import pandas as pd, numpy as np, os
 from datetime import datetime
 import pytz
 
-DEFAULT_GUN_SAYISI = 500
+DEFAULT_GUN_SAYISI = int(os.environ.get("GUN_SAYISI", "500"))  # işlenen en fazla gün
+TAKVIM_CSV = "data/dates.csv"
+BICIM = "%d.%m.%Y"
+
+def bugun():
+    return datetime.now(pytz.timezone("Europe/Istanbul")).date()
+
+def donem_sonlari(tarihler, siklik):
+    # her dönemin (W: hafta Pzt-Paz, M: ay, Q: çeyrek) hafta içi son günü; tarihler artan sıralı DatetimeIndex
+    t = tarihler[tarihler.dayofweek < 5]
+    if not len(t): return t
+    kod = t.to_period(siklik).asi8
+    return t[np.r_[kod[1:] != kod[:-1], True]]
+
+class IslemTakvimi:
+    # dates.csv'deki işlem günleri bir kez ayrıştırılır, artan sıralı tekil datetime64[D] dizisinde tutulur;
+    # pencere, as-of ve dönem sonu sorguları bu dizide ikili arama ile yapılır. Gün kodu dizideki sıradır.
+    def __init__(self, tarihler, bugun_=None):
+        if isinstance(tarihler, (pd.DatetimeIndex, np.ndarray)) and np.issubdtype(np.asarray(tarihler).dtype, np.datetime64):
+            t = pd.DatetimeIndex(tarihler)
+        else:
+            t = pd.DatetimeIndex(pd.to_datetime([s for x in tarihler if (s := str(x).strip())], dayfirst=True, errors="coerce"))
+        self.gunler = np.unique(t.dropna().to_numpy().astype("datetime64[D]"))
+        self.bugun = np.datetime64(bugun_ or bugun(), "D")
+        self._metin = None; self._sira = None
+
+    def __len__(self): return len(self.gunler)
+
+    def _gun(self, t): return np.asarray(pd.to_datetime(t, dayfirst=True) if isinstance(t, str) else t, dtype="datetime64[D]")
+
+    def konum(self, t, sag=True):
+        # sag=True: t'ye eşit ya da önceki son işlem gününün sırası (yoksa -1); sag=False: t'den önceki
+        return np.searchsorted(self.gunler, self._gun(t), side="right" if sag else "left") - 1
+
+    def asof(self, t=None):
+        # t'ye (varsayılan bugün) eşit ya da önceki son işlem günü; yoksa None
+        i = int(self.konum(self.bugun if t is None else t))
+        return pd.Timestamp(self.gunler[i]) if i >= 0 else None
+
+    def aralik(self, bas, son):
+        # [bas, son] kapalı aralığındaki işlem günleri
+        return pd.DatetimeIndex(self.gunler[np.searchsorted(self.gunler, self._gun(bas), "left"):np.searchsorted(self.gunler, self._gun(son), "right")])
+
+    def pencere(self, n=DEFAULT_GUN_SAYISI, son=None):
+        # son (varsayılan bugün) ve öncesindeki en fazla n işlem günü, artan sıralı
+        i = int(self.konum(self.bugun if son is None else son)) + 1
+        return pd.DatetimeIndex(self.gunler[max(0, i - n):i])
+
+    def tum(self): return pd.DatetimeIndex(self.gunler)
+
+    def kodlar(self, t):
+        # tarihlerin gün kodu (takvim sırası); takvimde olmayan gün -1
+        g = self._gun(t); i = np.searchsorted(self.gunler, g)
+        return np.where((i < len(self.gunler)) & (self.gunler[np.minimum(i, len(self.gunler) - 1)] == g), i, -1)
+
+    def donem_sonlari(self, siklik, n=DEFAULT_GUN_SAYISI):
+        return donem_sonlari(self.pencere(n), siklik)
+
+    def hafta_sonlari(self, n=DEFAULT_GUN_SAYISI): return self.donem_sonlari("W", n)
+    def ay_sonlari(self, n=DEFAULT_GUN_SAYISI): return self.donem_sonlari("M", n)
+
+    def metin(self, tarihler=None):
+        # gg.aa.yyyy metinleri; takvim günleri için bir kez biçimlenip saklanır
+        if self._metin is None: self._metin = np.array(pd.DatetimeIndex(self.gunler).strftime(BICIM), dtype=object)
+        if tarihler is None: return self._metin.tolist()
+        k = self.kodlar(tarihler)
+        if (k < 0).any(): return pd.DatetimeIndex(tarihler).strftime(BICIM).tolist()
+        return self._metin[k].tolist()
+
+    def zaman(self, metinler):
+        # gg.aa.yyyy metinlerini yeniden ayrıştırmadan DatetimeIndex'e çevirir
+        if self._sira is None: self._sira = {s: i for i, s in enumerate(self.metin())}
+        k = [self._sira.get(s, -1) for s in metinler]
+        if -1 in k: return pd.DatetimeIndex(pd.to_datetime(list(metinler), format=BICIM))
+        return pd.DatetimeIndex(self.gunler[np.asarray(k, dtype=np.int64)])
+
+    def secili(self, n=DEFAULT_GUN_SAYISI):
+        # gün deposu ve kaynaklar metin anahtar kullanır
+        return self.metin(self.pencere(n))
+
+_onbellek = {}
+
+def takvim(yol=TAKVIM_CSV):
+    # dosya ve gün değişmedikçe aynı süreçte tek takvim
+    st = os.stat(yol); anahtar = (os.path.abspath(yol), st.st_mtime_ns, st.st_size, bugun())
+    if anahtar not in _onbellek:
+        _onbellek.clear(); _onbellek[anahtar] = IslemTakvimi(pd.read_csv(yol, encoding="utf-8")["Tarih"].dropna().tolist(), anahtar[3])
+    return _onbellek[anahtar]
 
 def secili_tarihleri_bul(csv_tarihleri, hedef=DEFAULT_GUN_SAYISI):
-    today = datetime.now(pytz.timezone("Europe/Istanbul")).date()
-    tarihler = sorted(pd.to_datetime([str(x).strip() for x in csv_tarihleri if str(x).strip()],
-                                     dayfirst=True, errors="coerce"))
-    liste = [t.date() for t in tarihler if t.date() <= today]
-    if not liste: 
-        return []
-    ilk = today if today in liste else max(liste)
-    idx = liste.index(ilk)
-    start = max(0, idx - hedef + 1)
-    secili = liste[start:idx+1]
-    return [d.strftime("%d.%m.%Y") for d in secili]
+    return IslemTakvimi(csv_tarihleri).secili(hedef)
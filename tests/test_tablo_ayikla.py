@@ -0,0 +1,39 @@
+import pytest
+import tablo_ayikla as T
+
+pytest.importorskip("bs4")
+
+ORNEKLER={
+    "basit":"<html><body><table><tr><th>Kod</th><th>Fiyat</th></tr><tr><td>AKBNK</td><td>12,5</td></tr></table></body></html>",
+    "td_baslik":"<table><tr><td>Kod</td><th>Fiyat</th></tr><tr><th>x</th><td>1</td></tr></table>",
+    "bosluk_varlik":"<table><tr><th> A &amp; B </th></tr><tr><td>\n  1 <b> 2 </b>\n</td><td></td></tr></table>",
+    "ic_ice":"<table><tr><th>A</th><th>B</th></tr><tr><td>x<table><tr><td>n1</td><td>n2</td></tr></table></td><td>y</td></tr>"
+             "<tr><td>z</td><td>w</td></tr></table><table><tr><td>sonraki</td></tr></table>",
+    "ic_ice_baslik":"<table><tr><th>A<table><tr><th>i</th></tr></table></th></tr><tr><td>1</td></tr></table>",
+    "kapanmamis_tablo":"<table><tr><th>A</th></tr><tr><td>1</td></tr><tr><td>2</td>",
+    "kapanmamis_son_hucre":"<table><tr><th>A</th></tr><tr><td>1</td></tr><tr><td>2</td></tr>",
+    "acik_hucre_sonda":"<table><tr><th>A</th><th>B</th></tr><tr><td>1</td><td>2</td></tr><tr><td>3</td><td>4",
+    "script_style":"<table><tr><th>A<script>var x=\"<td>\";</script></th><th><style>.a{}</style>B</th></tr>"
+                   "<tr><td>1<template>t</template>2</td><td><!--c-->3<script>y</script>4</td></tr></table>",
+    "tablo_yok":"<p>yok</p>",
+    "bos_tablo":"<table></table>",
+    "satirsiz":"<table><caption>c</caption></table>",
+    "iki_tablo":"<div><table><tr><th>1</th></tr></table><table><tr><th>2</th></tr></table></div>",
+    "buyuk":"<table><tr><th>K</th><th>V</th></tr>"+"".join(f"<tr><td>S{i:05d}</td><td>{i/7:.4f}</td></tr>" for i in range(5000))+"</table>",
+}
+
+AYRISTIRICILAR=[pytest.param(T._saf,id="saf"),
+                pytest.param(T._lxml,id="lxml",marks=pytest.mark.skipif(T.etree is None,reason="lxml yok"))]
+
+@pytest.mark.parametrize("fn",AYRISTIRICILAR)
+@pytest.mark.parametrize("ad",list(ORNEKLER))
+def test_bs4_ile_ayni(fn,ad):
+    html=ORNEKLER[ad]
+    assert T._bol(fn(html))==T._bs4(html)
+
+def test_buyuk_sayfa_parcalara_bolunur():
+    assert len(ORNEKLER["buyuk"])>T.PARCA
+
+def test_ilk_tablo():
+    assert T.ilk_tablo(ORNEKLER["basit"])==(["Kod","Fiyat"],[["AKBNK","12,5"]])
+    assert T.ilk_tablo(ORNEKLER["tablo_yok"]) is None
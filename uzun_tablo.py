@@ -0,0 +1,137 @@
+import hashlib, json
+from datetime import datetime
+import numpy as np, pandas as pd
+from tarih_ayar import BICIM
+
+# Uzun biçimli (gün, sembol, değerler) satır deposu. Semboller ve metin kolonlar kategori koduna (int32),
+# tarihler 1970'ten gün sayısına (int32) çevrilir; değerler kolon başına tipli dizilerde PARCA satırlık
+# adımlarla büyür. Satır başına Python sözlüğü tutulmaz, DataFrame ve pivotlar dizilerin kendisinden kurulur.
+PARCA=1<<15
+KATEGORI="kategori"
+
+_gunler={}
+
+def gun_no(t):
+    # gg.aa.yyyy (ya da gün önce gelen başka biçim) metni veya tarih -> 1970'ten gün sayısı
+    if not isinstance(t,str): return int(np.datetime64(pd.Timestamp(t).date(),"D").astype(np.int64))
+    g=_gunler.get(t)
+    if g is None:
+        try: d=datetime.strptime(t,BICIM).date()
+        except ValueError: d=pd.to_datetime(t,dayfirst=True).date()
+        g=_gunler[t]=int(np.datetime64(d,"D").astype(np.int64))
+    return g
+
+def _sayilar(degerler,tur):
+    # None/NaN -> NaN; sayıya çevrilemeyen metinler pd.to_numeric(errors="coerce") gibi NaN olur
+    try: a=np.asarray(degerler,dtype=np.float64)
+    except (TypeError,ValueError): a=pd.to_numeric(pd.Series(degerler,dtype=object),errors="coerce").to_numpy(dtype=np.float64,na_value=np.nan)
+    return a if tur==np.float64 else a.astype(tur)
+
+def _tamsayilar(degerler):
+    # (değer, boş maskesi); büyük tamsayılar float'a uğramadan saklanır
+    bos=np.fromiter((v is None or (isinstance(v,float) and v!=v) for v in degerler),bool,len(degerler))
+    try: return np.asarray([0 if b else v for v,b in zip(degerler,bos)],dtype=np.int64),bos
+    except (TypeError,ValueError,OverflowError):
+        a=_sayilar(degerler,np.float64); bos=np.isnan(a); return np.where(bos,0,a).astype(np.int64),bos
+
+class UzunTablo:
+    def __init__(self,anahtar,kolonlar,tarih="Tarih"):
+        # kolonlar: {ad: numpy tipi ya da KATEGORI}; tamsayı kolonlar boş değerler için ayrıca maske taşır
+        self.anahtar,self.tarih=anahtar,tarih
+        self.turler={k:t if t==KATEGORI else np.dtype(t) for k,t in kolonlar.items()}
+        self.n=0; self._kap=0
+        self._gun=np.empty(0,np.int32); self._kod=np.empty(0,np.int32)
+        self._deger={k:np.empty(0,np.int32 if t==KATEGORI else t) for k,t in self.turler.items()}
+        self._bos={k:np.empty(0,bool) for k,t in self.turler.items() if t!=KATEGORI and t.kind in "iu"}
+        self._kat={k:({},[]) for k in [anahtar]+[k for k,t in self.turler.items() if t==KATEGORI]}
+
+    def __len__(self): return self.n
+
+    def _buyut(self,m):
+        if self.n+m<=self._kap: return
+        kap=-(-max(self.n+m,self._kap+self._kap//2)//PARCA)*PARCA
+        def tasi(a): b=np.empty(kap,a.dtype); b[:self.n]=a[:self.n]; return b
+        self._gun,self._kod=tasi(self._gun),tasi(self._kod)
+        self._deger={k:tasi(a) for k,a in self._deger.items()}; self._bos={k:tasi(a) for k,a in self._bos.items()}
+        self._kap=kap
+
+    def _kodla(self,ad,degerler):
+        sozluk,adlar=self._kat[ad]; k=np.empty(len(degerler),np.int32)
+        for i,v in enumerate(degerler):
+            if v is None or v!=v: k[i]=-1; continue
+            c=sozluk.get(v)
+            if c is None: c=sozluk[v]=len(adlar); adlar.append(v)
+            k[i]=c
+        return k
+
+    def ekle_sutunlar(self,sutunlar,tarih=None):
+        # {kolon: liste}; tarih verilirse bütün satırlar o gün. Anahtarı boş satırlar atılır.
+        kod=self._kodla(self.anahtar,sutunlar[self.anahtar]); sec=kod>=0; m=int(sec.sum())
+        if not m: return
+        self._buyut(m); a,b=self.n,self.n+m
+        self._kod[a:b]=kod[sec]
+        self._gun[a:b]=gun_no(tarih) if tarih is not None else np.fromiter(map(gun_no,sutunlar[self.tarih]),np.int64,len(kod))[sec]
+        for k,t in self.turler.items():
+            v=sutunlar.get(k)
+            if v is None: v=[None]*len(kod)
+            if t==KATEGORI: self._deger[k][a:b]=self._kodla(k,v)[sec]
+            elif k in self._bos: d,bos=_tamsayilar(v); self._deger[k][a:b]=d[sec]; self._bos[k][a:b]=bos[sec]
+            else: self._deger[k][a:b]=_sayilar(v,t)[sec]
+        self.n=b
+
+    def ekle(self,satirlar,tarih=None):
+        # satır sözlükleri (ör. bir günün kaynağı) sadece ekleme sırasında kolonlara açılır
+        ad=[self.anahtar,*self.turler]+([self.tarih] if tarih is None else [])
+        self.ekle_sutunlar({k:[r.get(k) for r in satirlar] for k in ad},tarih)
+
+    @property
+    def gunler(self): return self._gun[:self.n]
+
+    @property
+    def kodlar(self): return self._kod[:self.n]
+
+    def kategoriler(self,ad=None): return self._kat[ad or self.anahtar][1]
+
+    def sayisal(self,ad):
+        # float64 görünüm (tamsayı kolonda boşlar NaN); her çağrı yeni dizi döner, yerinde değiştirilebilir
+        v=self._deger[ad][:self.n]
+        if ad in self._bos: v=v.astype(np.float64); v[self._bos[ad][:self.n]]=np.nan; return v
+        return v.astype(np.float64)
+
+    def _seri(self,ad,kategori):
+        kod=self._kod[:self.n] if ad==self.anahtar else self._deger[ad][:self.n]; adlar=self._kat[ad][1]
+        if kategori: return pd.Categorical.from_codes(kod,categories=pd.Index(adlar,dtype=object))
+        return np.array(adlar+[None],dtype=object)[kod]
+
+    def frame(self,kategori=True):
+        # sayısal kolonlar kopyalanmadan; kategori=False ise semboller ve metin kolonlar nesne dizisi olarak
+        d={self.tarih:self._gun[:self.n].astype("datetime64[D]").astype("datetime64[ns]"),self.anahtar:self._seri(self.anahtar,kategori)}
+        for k,t in self.turler.items():
+            if t==KATEGORI: d[k]=self._seri(k,kategori)
+            elif k in self._bos: d[k]=pd.arrays.IntegerArray(self._deger[k][:self.n],self._bos[k][:self.n])
+            else: d[k]=self._deger[k][:self.n]
+        return pd.DataFrame(d,copy=False)
+
+    def konumlar(self,tarihler):
+        # tarihler (artan DatetimeIndex) x sıralı semboller ızgarasında her (gün, sembol) için son satır:
+        # (satır sırası, tarih konumu, sembol konumu, semboller); pencere dışındaki günler atılır
+        g=np.asarray(pd.DatetimeIndex(tarihler).to_numpy().astype("datetime64[D]").astype(np.int64))
+        ti=np.searchsorted(g,self.gunler); ti[ti>=len(g)]=0
+        pencere=np.flatnonzero(g[ti]==self.gunler) if len(g) else np.empty(0,np.int64)
+        kod=self.kodlar[pencere]; kullanilan=np.unique(kod)
+        adlar=np.array(self.kategoriler(),dtype=object)[kullanilan]; sira=np.argsort(adlar,kind="stable")
+        harita=np.full(len(self.kategoriler()),-1,np.int64); harita[kullanilan[sira]]=np.arange(len(sira))
+        ti,si=ti[pencere],harita[kod]
+        _,ilk=np.unique((ti*max(len(sira),1)+si)[::-1],return_index=True); son=len(ti)-1-ilk
+        return pencere[son],ti[son],si[son],adlar[sira]
+
+    def ozet(self):
+        # içerik özeti (aşama anahtarları için)
+        h=hashlib.sha1(json.dumps([self.anahtar,self.tarih,{k:str(t) for k,t in self.turler.items()},
+                                   {k:v[1] for k,v in self._kat.items()}],ensure_ascii=False,default=str).encode())
+        for a in [self._gun,self._kod,*self._deger.values(),*self._bos.values()]: h.update(a[:self.n].tobytes())
+        return h.digest()
+
+    @classmethod
+    def sozluklerden(cls,satirlar,anahtar,kolonlar,tarih="Tarih"):
+        t=cls(anahtar,{k:np.float64 for k in kolonlar},tarih); t.ekle(satirlar); return t